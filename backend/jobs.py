@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 워커 프로세스를 미리 띄우기 위한 빈 작업
+def _noop():
+    return None
+
+class QueueFullError(Exception):
+    """대기 중인 작업 수가 max_pending에 도달했을 때 발생"""
+
+class JobQueue:
+    """업로드된 분석 작업을 제한된 크기의 프로세스 풀에서 실행하고 상태/결과를 보관
+
+    - max_workers: 동시에 분석을 수행하는 워커 프로세스 수
+    - max_pending: 대기 + 실행 중인 작업의 최대 개수 (초과 시 QueueFullError)
+    - result_ttl: 완료된 작업 결과를 보관하는 시간(초)
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, result_ttl=3600, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._jobs = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer,
+                                             initargs=self.initargs)
+        # 첫 요청이 아닌 서버 시작 시점에 워커가 생성되고 initializer(모델 예열)가 실행되도록 함
+        for _ in range(self.max_workers):
+            self._executor.submit(_noop)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _new_job(self, kind):
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "cached": False,
+        }
+        return job_id
+
+    # on_result: 작업이 성공하면 결과를 받아 호출 (결과 캐시 저장 등)
+    # 워커 풀에 제출하지 못하면(재시작 후에도 풀이 깨짐, 종료 후 호출 등) 작업을 등록하지 않고 예외를 그대로 전달
+    def submit(self, kind, fn, *args, on_result=None):
+        with self._lock:
+            self._purge_expired()
+            active = sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+            if active >= self.max_pending:
+                raise QueueFullError(f"대기 중인 작업이 너무 많습니다 ({active}/{self.max_pending}).")
+            job_id = self._new_job(kind)
+
+        try:
+            try:
+                future = self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # 워커가 비정상 종료(OOM 등)되면 풀을 새로 만들어 재시도
+                self.shutdown()
+                self.start()
+                future = self._executor.submit(fn, *args)
+        except Exception:
+            # 제출하지 못한 작업은 대기 작업 수(max_pending)를 차지하지 않도록 삭제
+            with self._lock:
+                del self._jobs[job_id]
+            raise
+
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, f, on_result))
+        return job_id
+
+    # 캐시에서 찾은 결과를 워커를 거치지 않고 완료된 작업으로 등록
+    def add_cached(self, kind, result):
+        with self._lock:
+            self._purge_expired()
+            job_id = self._new_job(kind)
+            job = self._jobs[job_id]
+            job.update(status="done", finished_at=time.time(), result=result, cached=True)
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            future = self._futures.get(job_id)
+            if job["status"] == "queued" and future is not None and future.running():
+                job["status"] = "running"
+            return dict(job)
+
+    # on_result는 상태를 done으로 바꾸기 전에 호출하므로, 결과에 덧붙인 내용은 조회 시 항상 함께 보임
+    def _finish(self, job_id, future, on_result=None):
+        succeeded = not future.cancelled() and future.exception() is None
+        if on_result is not None and succeeded:
+            try:
+                on_result(future.result())
+            except Exception as e:
+                print(f"❌ 작업 결과 후처리 실패: {e}")
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            self._futures.pop(job_id, None)
+            if job is None:
+                return
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job["status"] = "cancelled"
+            elif future.exception() is not None:
+                job["status"] = "failed"
+                job["error"] = str(future.exception())
+            else:
+                job["status"] = "done"
+                job["result"] = future.result()
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and now - job["finished_at"] > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
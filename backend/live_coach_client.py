@@ -0,0 +1,74 @@
+# 실시간 코칭 WebSocket 테스트 클라이언트: 녹음 파일을 실제 속도로 스트리밍하며 지표 지연 시간 측정
+# 실행: (서버 실행 후) python backend/live_coach_client.py [ws://localhost:8000/ws/live-coach] [파일 ...]
+#   파일을 지정하지 않으면 data/*.m4a를 차례로 전송
+# 지연 시간
+#   - 지표 지연: 지금까지 보낸 음성 길이 - 서버가 지표에 반영한 음성 길이(time)
+#   - 전사 지연: 지금까지 보낸 음성 길이 - 전사가 확정된 음성 길이(sttTime)
+import asyncio
+import glob
+import json
+import sys
+import time
+
+import numpy as np
+import websockets
+from faster_whisper import decode_audio
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+# 1보다 크면 실제보다 빠르게 전송 (서버 처리 한계 확인용)
+SPEED = 1.0
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+async def stream_file(url, path):
+    samples = decode_audio(path, sampling_rate=SAMPLE_RATE)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    chunk = SAMPLE_RATE * CHUNK_MS // 1000
+    sent = {"samples": 0, "end_at": None}
+    metric_lags, stt_lags = [], []
+    final = None
+
+    async with websockets.connect(url, max_size=None) as websocket:
+        async def send_audio():
+            start = time.time()
+            for i in range(0, len(pcm), chunk):
+                await websocket.send(pcm[i:i + chunk].tobytes())
+                sent["samples"] = min(i + chunk, len(pcm))
+                # 실제 발화 속도에 맞춰 전송
+                delay = start + sent["samples"] / SAMPLE_RATE / SPEED - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            sent["end_at"] = time.time()
+            await websocket.send("end")
+
+        sender = asyncio.create_task(send_audio())
+        async for message in websocket:
+            metrics = json.loads(message)
+            sent_sec = sent["samples"] / SAMPLE_RATE
+            if metrics["final"]:
+                final = metrics
+                break
+            metric_lags.append(sent_sec - metrics["time"])
+            stt_lags.append(sent_sec - metrics["sttTime"])
+            stats = metrics["stats"]
+            print(f"  {metrics['time']:6.1f}s | {stats['speed']:4d} WPM | 간투사 {stats['fillerCount']:3d} | "
+                  f"무음 {stats['pauseRatio']:.2f} | pitch {stats['pitch'] or 0:6.1f} | 전사 지연 {stt_lags[-1]:4.1f}s")
+        await sender
+
+    flush_sec = time.time() - sent["end_at"]
+    duration = len(samples) / SAMPLE_RATE
+    print(f"🎧 {path}: {duration:.1f}초")
+    print(f"   지표 지연 p50 {percentile(metric_lags, 50):.2f}초 / p95 {percentile(metric_lags, 95):.2f}초")
+    print(f"   전사 지연 p50 {percentile(stt_lags, 50):.2f}초 / p95 {percentile(stt_lags, 95):.2f}초 / "
+          f"최대 {max(stt_lags, default=0.0):.2f}초")
+    print(f"   종료 후 최종 결과까지 {flush_sec:.2f}초, 버린 음성 {final['droppedSec']}초")
+    print(f"   최종: {final['stats']}")
+    return flush_sec
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "ws://localhost:8000/ws/live-coach"
+    paths = sys.argv[2:] or sorted(glob.glob("data/*.m4a"))
+    for path in paths:
+        asyncio.run(stream_file(url, path))
@@ -1,25 +1,303 @@
 import sys
 import os
-from fastapi import FastAPI, File, UploadFile
+import uuid
+import asyncio
+import functools
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, File, UploadFile, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# 현재 파일(main.py)의 디렉토리 경로를 기준으로 상대 경로 설정
-base_dir = os.path.dirname(os.path.abspath(__file__))  # backend 디렉토리 경로
-model_dir = os.path.join(base_dir, '..', 'model')     # model 디렉토리 경로
+from backend import tasks
+from backend.jobs import JobQueue, QueueFullError
+from backend.result_cache import ResultCache
+from backend.stt_service import SttBatchService
+from core.practice_session import PracticeSession, compile_script
+from core.live_coach import LiveCoach, LIVE_STT_TIER, METRIC_INTERVAL_SEC
+from core.stt_tiers import STT_TIERS, get_tier
 
-# 모델 디렉토리를 sys.path에 추가
-sys.path.insert(0, model_dir)
+# 업로드 파일 임시 저장 경로
+UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "pitchpal_uploads")
+# 업로드를 임시 파일로 복사할 때 한 번에 읽는 크기
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-from fastapi import FastAPI
-from model.speech.speech_analysis import speech_evaluate  # 평가 함수 임포트
+# 워커 수 / 최대 대기 작업 수 (환경변수로 조정)
+MAX_WORKERS = int(os.getenv("PITCHPAL_WORKERS", "2"))
+MAX_PENDING = int(os.getenv("PITCHPAL_MAX_PENDING", "8"))
+
+# 분석 결과 캐시 (메모리 + 로컬 디스크 LRU)
+CACHE_DIR = os.getenv("PITCHPAL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pitchpal_cache"))
+CACHE_MAX_MB = int(os.getenv("PITCHPAL_CACHE_MAX_MB", "512"))
+
+# 여러 작업의 STT를 모아서 한 번에 처리하는 배치 서비스 설정
+STT_BATCHING = os.getenv("PITCHPAL_STT_BATCHING", "0") == "1"
+STT_BATCH_SIZE = int(os.getenv("PITCHPAL_STT_BATCH_SIZE", "8"))
+STT_MAX_WAIT_MS = int(os.getenv("PITCHPAL_STT_MAX_WAIT_MS", "200"))
+
+# 연습 세션(같은 대본 반복 연습) 최대 보관 개수, 넘으면 가장 오래된 세션부터 삭제
+PRACTICE_MAX_SESSIONS = int(os.getenv("PITCHPAL_PRACTICE_MAX_SESSIONS", "256"))
+
+# 동시에 진행할 수 있는 실시간 코칭 세션 수 (세션마다 전사 스레드 하나를 사용)
+LIVE_MAX_SESSIONS = int(os.getenv("PITCHPAL_LIVE_MAX_SESSIONS", "2"))
 
 app = FastAPI()
 
-@app.get("/speech_evaluate/")
-async def evaluate_audio():
-    # 'data/sample.wav' 파일을 사용하여 평가 수행
-    result = speech_evaluate("data/sample.wav")  # 평가 함수 실행
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+stt_service = None
+if STT_BATCHING:
+    stt_service = SttBatchService(
+        tasks.WHISPER_MODEL_SIZE, tasks.WHISPER_COMPUTE_TYPE,
+        batch_size=STT_BATCH_SIZE, max_jobs=MAX_WORKERS, max_wait_ms=STT_MAX_WAIT_MS,
+        slots=MAX_WORKERS * 4,
+    )
+
+result_cache = ResultCache(CACHE_DIR, max_disk_bytes=CACHE_MAX_MB * 1024 * 1024)
+
+job_queue = JobQueue(
+    max_workers=MAX_WORKERS, max_pending=MAX_PENDING, initializer=tasks.init_worker,
+    initargs=(stt_service.client() if stt_service is not None else None, MAX_WORKERS),
+)
+
+practice_sessions = OrderedDict()
+practice_lock = threading.Lock()
+
+live_executor = ThreadPoolExecutor(max_workers=LIVE_MAX_SESSIONS)
+live_slots = threading.Semaphore(LIVE_MAX_SESSIONS)
+
+@app.on_event("startup")
+def start_workers():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    if stt_service is not None:
+        stt_service.start()
+    job_queue.start()
+
+@app.on_event("shutdown")
+def stop_workers():
+    # 작업 워커는 종료되면서 자기 긴 녹음 전사 프로세스 풀도 닫음 (tasks.init_worker)
+    job_queue.shutdown()
+    live_executor.shutdown(wait=False)
+    if stt_service is not None:
+        stt_service.shutdown()
+
+# 업로드 내용을 UPLOAD_CHUNK_BYTES씩 파일에 복사하면서 SHA-256 계산 (영상 전체를 메모리에 올리지 않음)
+def copy_upload(source, path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+    except Exception:
+        tasks.remove_files(path)
+        raise
+    return digest.hexdigest()
+
+# 업로드 파일을 임시 경로에 저장하고 내용의 SHA-256을 함께 반환 (작업이 끝나면 워커에서 삭제)
+# 복사는 스레드 풀에서 실행해 큰 파일을 저장하는 동안에도 이벤트 루프가 다른 요청을 처리
+async def save_upload(upload):
+    suffix = os.path.splitext(upload.filename or "")[1]
+    path = os.path.join(UPLOAD_DIR, uuid.uuid4().hex + suffix)
+    return path, await run_in_threadpool(copy_upload, upload.file, path)
+
+# 요청의 STT 품질 단계 확인 (없으면 서버 기본 단계)
+def resolve_tier(tier):
+    if tier is None:
+        return tasks.STT_TIER
+    if tier not in STT_TIERS:
+        raise HTTPException(status_code=400, detail=f"tier는 {', '.join(STT_TIERS)} 중 하나여야 합니다.")
+    return tier
+
+# 같은 파일 + 같은 분석 파라미터의 결과가 캐시에 있으면 워커를 거치지 않고 바로 완료 처리
+def submit_job(kind, fn, content_hashes, *args, tier=None):
+    cache_key = ResultCache.make_key(kind, content_hashes, tasks.analysis_params(kind, tier))
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        tasks.remove_files(*args)
+        return {"job_id": job_queue.add_cached(kind, cached), "status": "done"}
+
+    try:
+        job_id = job_queue.submit(kind, fn, *args, on_result=lambda result: result_cache.put(cache_key, result))
+    except QueueFullError as e:
+        tasks.remove_files(*args)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception:
+        tasks.remove_files(*args)
+        raise
+    return {"job_id": job_id, "status": "queued"}
+
+# preview=true: STT를 건너뛰고 신호 분석(소리 기반 간투사, 무음, pitch/음량)만 빠르게 수행
+# tier: STT 품질 단계 (fast | balanced | accurate, 생략하면 PITCHPAL_STT_TIER)
+@app.post("/analyze-audio", status_code=202)
+async def analyze_audio(file: UploadFile = File(...), script: UploadFile = File(None), preview: bool = False,
+                        tier: str = None):
+    tier = resolve_tier(tier)
+    audio_path, audio_hash = await save_upload(file)
+    if preview:
+        return submit_job("audio_preview", tasks.run_audio_preview_job, [audio_hash], audio_path)
+    script_path, script_hash = await save_upload(script) if script is not None else (None, None)
+    return submit_job("audio", functools.partial(tasks.run_audio_job, tier=tier), [audio_hash, script_hash],
+                      audio_path, script_path, tier=tier)
+
+# 사용 가능한 STT 품질 단계와 설정
+# batched: STT 배치 서비스가 켜져 있으면 기본 단계 요청에 실제로 쓰는 설정 (VAD 항상 사용, 언어 자동 감지 대신 "ko")
+@app.get("/stt/tiers")
+def get_stt_tiers():
+    response = {"default": tasks.STT_TIER, "tiers": STT_TIERS}
+    if stt_service is not None:
+        response["batched"] = {"tier": tasks.STT_TIER, "settings": stt_service.tier_settings(STT_TIERS[tasks.STT_TIER])}
+    return response
+
+@app.post("/analyze-video", status_code=202)
+async def analyze_video(file: UploadFile = File(...)):
+    video_path, video_hash = await save_upload(file)
+    return submit_job("video", tasks.run_video_job, [video_hash], video_path)
+
+@app.post("/analyze-content", status_code=202)
+async def analyze_content(file: UploadFile = File(...)):
+    text_path, text_hash = await save_upload(file)
+    return submit_job("content", tasks.run_content_job, [text_hash], text_path)
+
+# 연습 세션 생성: 대본을 한 번 컴파일해 두고 이후 take는 정렬만 수행
+@app.post("/practice-sessions", status_code=201)
+async def create_practice_session(script: UploadFile = File(...)):
+    try:
+        text = (await script.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="대본은 UTF-8 텍스트 파일이어야 합니다.")
+
+    session_id = uuid.uuid4().hex
+    session = PracticeSession(compile_script(text))
+    with practice_lock:
+        practice_sessions[session_id] = session
+        while len(practice_sessions) > PRACTICE_MAX_SESSIONS:
+            practice_sessions.popitem(last=False)
+    return {"session_id": session_id, "sentences": session.script.sentences}
+
+def get_practice_session(session_id):
+    with practice_lock:
+        session = practice_sessions.get(session_id)
+        if session is not None:
+            practice_sessions.move_to_end(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 연습 세션입니다.")
+    return session
+
+# 연습 take 업로드: 분석이 끝나면 이전 take와 비교한 문장별 정확도 변화를 결과의 practice에 담음
+@app.post("/practice-sessions/{session_id}/takes", status_code=202)
+async def add_practice_take(session_id: str, file: UploadFile = File(...), tier: str = None):
+    tier = resolve_tier(tier)
+    session = get_practice_session(session_id)
+    audio_path, _ = await save_upload(file)
+
+    def record_take(result):
+        practice = result["practice"]
+        result["practice"] = session.record_take(practice["accuracy"], practice["sentenceAccuracy"])
+
+    try:
+        job_id = job_queue.submit("practice", functools.partial(tasks.run_practice_take, tier=tier),
+                                  audio_path, session.script.text, on_result=record_take)
+    except QueueFullError as e:
+        tasks.remove_files(audio_path)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception:
+        tasks.remove_files(audio_path)
+        raise
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/practice-sessions/{session_id}")
+def get_practice_history(session_id: str):
+    session = get_practice_session(session_id)
+    return {"session_id": session_id, "sentences": session.script.sentences, "takes": session.history()}
+
+# 실시간 코칭: 클라이언트가 16kHz mono 16bit PCM을 binary 메시지로 계속 보내면
+# METRIC_INTERVAL_SEC마다 속도, 간투사 수, 무음 비율, pitch를 JSON으로 보냄
+# 녹음이 끝나면 "end" 텍스트 메시지 → 남은 음성을 모두 전사한 최종 지표(final=true)를 보내고 종료
+@app.websocket("/ws/live-coach")
+async def live_coach(websocket: WebSocket):
+    await websocket.accept()
+    if not live_slots.acquire(blocking=False):
+        await websocket.close(code=1013, reason="실시간 코칭 세션이 모두 사용 중입니다.")
+        return
+
+    loop = asyncio.get_running_loop()
+    coach = LiveCoach()
+    stt_future = None
+    sender = None
+    try:
+        # Whisper는 thread_safe 모델이므로 lock 없이 여러 세션이 함께 사용
+        config = get_tier(LIVE_STT_TIER)
+        whisper = await loop.run_in_executor(
+            live_executor, tasks.registry.get, "whisper", config["model_size"], config["compute_type"])
+        model = whisper.model
+
+        # 세션당 전사는 한 번에 하나만 (밀린 음성은 다음 전사에서 한꺼번에 처리)
+        def start_stt():
+            nonlocal stt_future
+            if stt_future is not None and not stt_future.done():
+                return
+            if stt_future is not None and stt_future.exception() is not None:
+                print(f"❌ 실시간 전사 실패: {stt_future.exception()}")
+            if coach.stt_due():
+                stt_future = loop.run_in_executor(live_executor, coach.transcribe_pending, model)
+
+        async def send_metrics():
+            while True:
+                await asyncio.sleep(METRIC_INTERVAL_SEC)
+                start_stt()
+                snapshot = await loop.run_in_executor(None, coach.snapshot)
+                await websocket.send_json(tasks.build_live_response(snapshot))
+
+        sender = asyncio.create_task(send_metrics())
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                coach.feed_pcm16(message["bytes"])
+                start_stt()
+            elif message.get("text") == "end":
+                break
+
+        sender.cancel()
+        if stt_future is not None:
+            await asyncio.wait([stt_future])
+        await loop.run_in_executor(live_executor, coach.transcribe_pending, model, True)
+        snapshot = await loop.run_in_executor(None, coach.snapshot)
+        await websocket.send_json(tasks.build_live_response(snapshot, final=True))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if sender is not None:
+            sender.cancel()
+        live_slots.release()
+
+# 작업 상태/결과 조회 (status: queued | running | done | failed | cancelled)
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 작업입니다.")
+    return job
 
-    # 결과 반환 (여기선 평가 결과 텍스트로 반환)
-    return {"evaluation_result": result}
+# STT 배치 서비스 처리량 / 지연 시간(p50, p95) 조회
+@app.get("/stt/stats")
+def get_stt_stats():
+    if stt_service is None:
+        raise HTTPException(status_code=404, detail="STT 배치 서비스가 꺼져 있습니다 (PITCHPAL_STT_BATCHING=1).")
+    return stt_service.stats()
@@ -0,0 +1,108 @@
+import threading
+import time
+
+class ModelHandle:
+    """프로세스 내에서 공유되는 모델 객체
+
+    thread_safe=False인 모델(MediaPipe FaceMesh, Keras 등)은 `with handle as model:`
+    구간 동안 lock을 잡아 여러 스레드가 동시에 추론하지 않도록 한다.
+    """
+
+    def __init__(self, key, model, thread_safe=False, load_time=0.0):
+        self.key = key
+        self.model = model
+        self.thread_safe = thread_safe
+        self.load_time = load_time
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        if not self.thread_safe:
+            self._lock.acquire()
+        return self.model
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.thread_safe:
+            self._lock.release()
+        return False
+
+class ModelRegistry:
+    """(model, size, compute_type) 키별로 모델을 프로세스당 한 번만 로드하는 레지스트리"""
+
+    def __init__(self):
+        self._specs = {}
+        self._handles = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, warmup=None, thread_safe=False):
+        """loader(size, compute_type) -> model, warmup(model) -> None"""
+        self._specs[name] = (loader, warmup, thread_safe)
+
+    def get(self, name, size=None, compute_type=None):
+        key = (name, size, compute_type)
+        handle = self._handles.get(key)
+        if handle is not None:
+            return handle
+
+        # 키별 lock: 한 모델을 로드하는 동안 다른 모델 조회는 막지 않음
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                loader, warmup, thread_safe = self._specs[name]
+                start = time.time()
+                model = loader(size, compute_type)
+                if warmup is not None:
+                    warmup(model)
+                handle = ModelHandle(key, model, thread_safe, time.time() - start)
+                self._handles[key] = handle
+                print(f"✅ 모델 로드 완료: {key} ({handle.load_time:.2f}초)")
+        return handle
+
+    def warm_up(self, keys):
+        for key in keys:
+            self.get(*key)
+
+    def loaded_keys(self):
+        return list(self._handles)
+
+# ---------------------------------------------------------------------------
+# PitchPal 모델 등록 (무거운 라이브러리는 로더 안에서만 import)
+# ---------------------------------------------------------------------------
+
+def _load_whisper(size, compute_type):
+    from core.stt_pronunciation import load_whisper_model
+    return load_whisper_model(size, compute_type=compute_type)
+
+def _warmup_whisper(model):
+    import numpy as np
+    # 1초 무음으로 더미 추론 (generator를 소비해야 실제 추론이 수행됨)
+    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), language="ko")
+    list(segments)
+
+def _load_emotion(size, compute_type):
+    from real_time_video import load_emotion_models
+    return load_emotion_models()
+
+def _warmup_emotion(models):
+    import numpy as np
+    _, emotion_classifier = models
+    emotion_classifier.predict(np.zeros((1, 64, 64, 1), dtype=np.float32), verbose=0)
+
+def _load_face_mesh(variant, compute_type):
+    if variant == "head_pose":
+        from head_direction_detector import create_face_mesh
+    else:
+        from eye_blink_counter import create_face_mesh
+    return create_face_mesh()
+
+def _warmup_face_mesh(face_mesh):
+    import numpy as np
+    face_mesh.process(np.zeros((480, 640, 3), dtype=np.uint8))
+
+registry = ModelRegistry()
+registry.register("whisper", _load_whisper, _warmup_whisper, thread_safe=True)
+registry.register("emotion", _load_emotion, _warmup_emotion)
+registry.register("face_mesh", _load_face_mesh, _warmup_face_mesh)
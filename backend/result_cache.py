@@ -0,0 +1,95 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# 분석 파라미터를 정렬된 JSON으로 직렬화해 같은 설정이면 항상 같은 해시가 나오도록 함
+def canonical_hash(params):
+    data = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+# 분석 코드(모듈 상수 포함)가 바뀌면 캐시가 무효화되도록 소스 파일 내용을 해시
+def source_digest(patterns):
+    sha = hashlib.sha256()
+    for path in sorted(p for pattern in patterns for p in glob.glob(pattern)):
+        with open(path, "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+class ResultCache:
+    """업로드 내용(SHA-256) + 분석 파라미터 해시를 키로 하는 분석 결과 캐시
+
+    - 메모리 LRU (max_memory_items개)
+    - 로컬 디스크 LRU (JSON 파일, 전체 크기 max_disk_bytes 이하, 접근 시각(mtime) 기준으로 오래된 것부터 삭제)
+    """
+
+    def __init__(self, cache_dir, max_disk_bytes=512 * 1024 * 1024, max_memory_items=128):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(kind, content_hashes, params):
+        return canonical_hash({"kind": kind, "content": list(content_hashes), "params": params})
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # 디스크 LRU 순서 갱신
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+
+        # 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 함
+        path = self._path(key)
+        tmp_path = path + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
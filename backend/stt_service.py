@@ -0,0 +1,234 @@
+import multiprocessing as mp
+import queue
+import time
+import uuid
+
+SAMPLE_RATE = 16000
+LATENCY_WINDOW = 512  # p95 계산에 사용하는 최근 요청 수
+
+class SttClient:
+    """워커 프로세스에서 사용하는 STT 서비스 클라이언트
+
+    WhisperModel.transcribe와 같은 형태(segments, info)를 반환하므로
+    analyze_speech / transcribe_audio에 모델 대신 그대로 넘길 수 있다.
+    """
+
+    def __init__(self, request_queue, reply_queues, slot_queue, timeout=600):
+        self.request_queue = request_queue
+        self.reply_queues = reply_queues
+        self.slot_queue = slot_queue
+        self.timeout = timeout
+        self.slot = None
+
+    # 워커 initializer에서 호출: 이 프로세스 전용 응답 큐 하나를 배정받음
+    def attach(self):
+        try:
+            self.slot = self.slot_queue.get_nowait()
+        except queue.Empty:
+            self.slot = None
+        return self.slot is not None
+
+    def transcribe(self, audio, **kwargs):
+        if isinstance(audio, str):
+            from core.audio_clip import AudioClip
+            audio = AudioClip.from_file(audio).samples
+
+        request_id = uuid.uuid4().hex
+        self.request_queue.put((request_id, self.slot, audio, time.time(), kwargs))
+
+        # 이전에 시간 초과된 요청의 응답은 건너뜀
+        while True:
+            reply_id, result = self.reply_queues[self.slot].get(timeout=self.timeout)
+            if reply_id == request_id:
+                break
+        if isinstance(result, str):
+            raise RuntimeError(result)
+        return iter(result), None
+
+class SttBatchService:
+    """여러 작업의 음성을 짧은 시간(max_wait_ms) 동안 모아 한 번의 batched faster-whisper 추론으로 처리
+
+    - batch_size: 한 번의 디코딩에 함께 넣는 VAD 청크 수 (작업 구분 없이 섞임)
+    - max_jobs: 한 번에 모으는 최대 작업 수
+    - max_wait_ms: 첫 요청 이후 다른 작업을 기다리는 최대 시간
+    """
+
+    def __init__(self, model_size="small", compute_type="int8", batch_size=8, max_jobs=8,
+                 max_wait_ms=200, language="ko", slots=16):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.batch_size = batch_size
+        self.max_jobs = max_jobs
+        self.max_wait_ms = max_wait_ms
+        self.language = language
+
+        self.request_queue = mp.Queue()
+        self.reply_queues = [mp.Queue() for _ in range(slots)]
+        self.slot_queue = mp.Queue()
+        for slot in range(slots):
+            self.slot_queue.put(slot)
+
+        # 처리량/지연 시간 통계 (서비스 프로세스가 기록, API 프로세스가 조회)
+        self.completed = mp.Value('q', 0)
+        self.batches = mp.Value('q', 0)
+        self.audio_sec = mp.Value('d', 0.0)
+        self.latencies = mp.Array('d', LATENCY_WINDOW)
+        self._process = None
+        self._started_at = None
+
+    def client(self):
+        return SttClient(self.request_queue, self.reply_queues, self.slot_queue)
+
+    # 품질 단계 설정(STT_TIERS 항목)을 이 서비스로 처리할 때 실제로 쓰는 설정
+    def tier_settings(self, config):
+        return dict(config, **batched_options(config, self.language))
+
+    def start(self):
+        self._started_at = time.time()
+        self._process = mp.Process(
+            target=_serve,
+            args=(self.model_size, self.compute_type, self.batch_size, self.max_jobs,
+                  self.max_wait_ms / 1000, self.language, self.request_queue, self.reply_queues,
+                  (self.completed, self.batches, self.audio_sec, self.latencies)),
+            daemon=True,
+        )
+        self._process.start()
+
+    def shutdown(self):
+        if self._process is not None:
+            self.request_queue.put(None)
+            self._process.join(timeout=5)
+            self._process = None
+
+    def stats(self):
+        completed = self.completed.value
+        recent = sorted(self.latencies[:min(completed, LATENCY_WINDOW)])
+        uptime = time.time() - self._started_at if self._started_at else 0.0
+
+        def percentile(p):
+            return recent[min(len(recent) - 1, int(len(recent) * p))] if recent else None
+
+        return {
+            "requests": completed,
+            "batches": self.batches.value,
+            "avg_jobs_per_batch": completed / self.batches.value if self.batches.value else None,
+            "throughput_rps": completed / uptime if uptime else None,
+            "audio_sec_per_sec": self.audio_sec.value / uptime if uptime else None,
+            "p50_latency_sec": percentile(0.5),
+            "p95_latency_sec": percentile(0.95),
+        }
+
+# ---------------------------------------------------------------------------
+# 서비스 프로세스
+# ---------------------------------------------------------------------------
+
+# 작업 하나의 VAD 음성 구간을 30초 이하 창(window)으로 묶음 [(start, end), ...] (sample 단위)
+def _speech_windows(samples, max_sec=30):
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(samples, VadOptions(max_speech_duration_s=max_sec, min_silence_duration_ms=160))
+    windows = []
+    for ts in speech:
+        if windows and ts["end"] - windows[-1][0] <= max_sec * SAMPLE_RATE:
+            windows[-1][1] = ts["end"]
+        else:
+            windows.append([ts["start"], ts["end"]])
+    return windows
+
+# 배치 추론에서 실제로 적용되는 디코딩 옵션
+# 음성을 VAD 창으로 나눠 묶으므로 vad_filter는 항상 켜지고, 언어 자동 감지(None)는 서비스 기본 언어로 고정됨
+def batched_options(options, language):
+    options = dict(options or {})
+    options["vad_filter"] = True
+    options["language"] = options.get("language") or language
+    options["word_timestamps"] = True
+    return options
+
+# 여러 작업의 음성을 이어 붙이고 모든 VAD 창을 한 번의 batched 추론에 넣은 뒤 작업별로 되돌림
+# options: 요청의 디코딩 옵션 (batched_options로 바뀐 값 사용)
+def _run_batch(pipeline, audios, batch_size, language, options=None):
+    import numpy as np
+    from core.chunked_stt import Segment, Word
+
+    offsets, clip_timestamps, position = [], [], 0
+    for samples in audios:
+        for start, end in _speech_windows(samples):
+            clip_timestamps.append({"start": (position + start) / SAMPLE_RATE, "end": (position + end) / SAMPLE_RATE})
+        offsets.append(position)
+        position += len(samples)
+
+    results = [[] for _ in audios]
+    if not clip_timestamps:
+        return results
+
+    options = batched_options(options, language)
+    # VAD 창은 clip_timestamps로 직접 넘김
+    options.pop("vad_filter")
+    segments, _ = pipeline.transcribe(
+        np.concatenate(audios), clip_timestamps=clip_timestamps, batch_size=batch_size, **options
+    )
+
+    bounds = np.array(offsets[1:]) / SAMPLE_RATE
+    for segment in segments:
+        k = int(np.searchsorted(bounds, segment.start, side="right"))
+        offset_sec = offsets[k] / SAMPLE_RATE
+        words = [
+            Word(w.word, w.start - offset_sec, w.end - offset_sec, w.probability)
+            for w in segment.words or []
+        ]
+        results[k].append(Segment(segment.start - offset_sec, segment.end - offset_sec, segment.text, words))
+    return results
+
+def _serve(model_size, compute_type, batch_size, max_jobs, max_wait, language,
+           request_queue, reply_queues, stats):
+    from faster_whisper import BatchedInferencePipeline
+    from core.stt_pronunciation import load_whisper_model
+
+    completed, batches, audio_sec, latencies = stats
+    pipeline = BatchedInferencePipeline(load_whisper_model(model_size, compute_type=compute_type))
+    print(f"✅ STT 배치 서비스 시작: {model_size}/{compute_type}, batch_size={batch_size}")
+
+    stopping = False
+    while not stopping:
+        request = request_queue.get()
+        if request is None:
+            break
+
+        # 첫 요청 이후 max_wait 동안 다른 작업의 요청을 모음
+        batch = [request]
+        deadline = time.time() + max_wait
+        while len(batch) < max_jobs:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                request = request_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                stopping = True
+                break
+            batch.append(request)
+
+        # 디코딩 옵션이 같은 요청끼리만 한 번의 추론으로 묶음
+        groups = {}
+        for request in batch:
+            groups.setdefault(tuple(sorted(request[4].items())), []).append(request)
+
+        replies = []
+        for options, requests in groups.items():
+            audios = [samples for _, _, samples, _, _ in requests]
+            try:
+                results = _run_batch(pipeline, audios, batch_size, language, dict(options))
+            except Exception as e:
+                print(f"❌ STT 배치 처리 실패: {e}")
+                results = [f"STT 배치 처리 실패: {e}"] * len(requests)
+            replies.extend(zip(requests, results))
+
+        now = time.time()
+        for (request_id, slot, samples, submitted_at, _), result in replies:
+            reply_queues[slot].put((request_id, result))
+            latencies[completed.value % len(latencies)] = now - submitted_at
+            completed.value += 1
+            audio_sec.value += len(samples) / SAMPLE_RATE
+        batches.value += 1
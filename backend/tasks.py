@@ -0,0 +1,316 @@
+import multiprocessing.util
+import os
+import re
+import sys
+from collections import Counter
+
+# 워커 프로세스에서도 모델 코드를 import 할 수 있도록 경로 설정
+base_dir = os.path.dirname(os.path.abspath(__file__))  # backend 디렉토리 경로
+model_dir = os.path.join(base_dir, '..', 'model')     # model 디렉토리 경로
+
+for sub_dir in ("speech", "content", "video", "emotion"):
+    path = os.path.abspath(os.path.join(model_dir, sub_dir))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from backend.model_registry import registry
+from backend.result_cache import source_digest
+from core.stt_tiers import STT_TIERS, DEFAULT_STT_TIER, get_tier
+
+# 요청에 tier가 없을 때 사용할 STT 품질 단계 (워커 예열 / STT 배치 서비스도 이 단계의 모델 사용)
+STT_TIER = os.getenv("PITCHPAL_STT_TIER", DEFAULT_STT_TIER)
+WHISPER_MODEL_SIZE = get_tier(STT_TIER)["model_size"]
+WHISPER_COMPUTE_TYPE = get_tier(STT_TIER)["compute_type"]
+# 긴 녹음 청크 병렬 전사에 쓸 서버 전체 프로세스 수 (0이면 사용 안 함)
+# 작업 워커마다 이 수를 작업 워커 수로 나눈 만큼(최소 1)의 프로세스를 가지며, 프로세스마다 Whisper를 따로 로드
+LONG_AUDIO_WORKERS = int(os.getenv("PITCHPAL_LONG_AUDIO_WORKERS", "0"))
+BLINK_BUCKET_SEC = 10
+# 영상 분석에 적응형 프레임 샘플링 사용 (FaceMesh를 기본 10fps로만 실행, model/video/adaptive_sampler.py)
+VIDEO_ADAPTIVE = os.getenv("PITCHPAL_VIDEO_ADAPTIVE", "0") == "1"
+
+# 워커 시작 시 미리 로드해 둘 모델 (model, size, compute_type)
+WARMUP_MODELS = [
+    ("whisper", WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE),
+    ("face_mesh", "head_pose", None),
+    ("emotion", "mini_XCEPTION", None),
+]
+
+# 결과 캐시 키에 포함할 분석 코드 (간투사 목록, silence_thresh, EAR_THRESHOLD 등 모듈 상수 포함)
+ANALYZER_SOURCES = {
+    "audio": ["speech/core/*.py", "speech/utils/*.py"],
+    "audio_preview": ["speech/core/*.py"],
+    "video": ["video/*.py", "emotion/real_time_video.py"],
+    "content": ["content/core/*.py"],
+}
+_analysis_params = {}
+
+# 분석 결과에 영향을 주는 파라미터 (결과 캐시 키 생성용)
+# tier: 음성 분석의 STT 품질 단계 (None이면 STT_TIER)
+def analysis_params(kind, tier=None):
+    tier = tier or STT_TIER
+    key = (kind, tier if kind == "audio" else None)
+    if key not in _analysis_params:
+        patterns = [os.path.join(model_dir, pattern) for pattern in ANALYZER_SOURCES[kind]]
+        params = {"code": source_digest(patterns + [os.path.abspath(__file__)])}
+        if kind == "audio":
+            params.update(STT_TIERS[tier])
+            params.update({
+                "stt_tier": tier,
+                "long_audio": LONG_AUDIO_WORKERS > 0,
+                "stt_batching": os.getenv("PITCHPAL_STT_BATCHING", "0") == "1" and tier == STT_TIER,
+            })
+        elif kind == "video":
+            params["adaptive"] = VIDEO_ADAPTIVE
+        _analysis_params[key] = params
+    return _analysis_params[key]
+
+# STT 배치 서비스 클라이언트 (배치 서비스를 쓰지 않으면 None)
+stt_client = None
+# 이 작업 워커의 긴 녹음 전사 프로세스 수 / 프로세스별 CPU 스레드 수
+long_audio_workers = LONG_AUDIO_WORKERS
+long_audio_threads = None
+
+# 작업 워커가 끝날 때 긴 녹음 전사 프로세스 풀도 함께 종료 (풀을 만든 적이 없으면 아무것도 하지 않음)
+def shutdown_long_audio_pools():
+    chunked_stt = sys.modules.get("core.chunked_stt")
+    if chunked_stt is not None:
+        chunked_stt.shutdown_pools()
+
+# 워커 프로세스 initializer: 모델 로드 + 더미 추론으로 예열
+# job_workers: 작업 워커 수 (긴 녹음 전사 프로세스와 CPU 코어를 워커끼리 나눔)
+def init_worker(client=None, job_workers=1):
+    global stt_client, long_audio_workers, long_audio_threads
+    if client is not None and client.attach():
+        stt_client = client
+
+    if LONG_AUDIO_WORKERS > 0:
+        long_audio_workers = max(1, LONG_AUDIO_WORKERS // job_workers)
+        long_audio_threads = max(1, (os.cpu_count() or 1) // (long_audio_workers * job_workers))
+        multiprocessing.util.Finalize(None, shutdown_long_audio_pools, exitpriority=10)
+
+    warmup = WARMUP_MODELS
+    if stt_client is not None:
+        # STT는 배치 서비스가 담당하므로 워커에서는 Whisper를 로드하지 않음
+        warmup = [key for key in WARMUP_MODELS if key[0] != "whisper"]
+    try:
+        registry.warm_up(warmup)
+    except Exception as e:
+        # 예열에 실패해도 작업 시점에 다시 로드를 시도함
+        print(f"❌ 모델 예열 실패: {e}")
+
+# 작업이 끝난 업로드 파일 정리
+def remove_files(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+# ---------------------------------------------------------------------------
+# 워커에서 실행되는 작업들 (무거운 라이브러리는 워커 안에서만 import)
+# ---------------------------------------------------------------------------
+
+# script: 미리 컴파일한 대본 (연습 세션), 넘기면 script_path 대신 사용
+# tier: STT 품질 단계, STT 배치 서비스는 STT_TIER 모델만 가지고 있으므로 다른 단계는 워커에서 직접 전사
+def _analyze_audio(audio_path, script_path=None, script=None, tier=None):
+    from core.speech_analysis import analyze_speech
+
+    tier = tier or STT_TIER
+    config = get_tier(tier)
+    long_audio_options = None
+    if LONG_AUDIO_WORKERS > 0:
+        long_audio_options = {
+            "model_size": config["model_size"],
+            "compute_type": config["compute_type"],
+            "workers": long_audio_workers,
+            "cpu_threads": long_audio_threads,
+            "tier": tier,
+        }
+    if stt_client is not None and tier == STT_TIER:
+        return analyze_speech(audio_path, script_path, stt_client, output_html_path=None,
+                              long_audio_options=long_audio_options, script=script, tier=tier)
+    whisper = registry.get("whisper", config["model_size"], config["compute_type"])
+    with whisper as model:
+        return analyze_speech(audio_path, script_path, model, output_html_path=None,
+                              long_audio_options=long_audio_options, script=script, tier=tier)
+
+def run_audio_job(audio_path, script_path=None, tier=None):
+    try:
+        result = _analyze_audio(audio_path, script_path, tier=tier)
+    finally:
+        remove_files(audio_path, script_path)
+
+    if result is None:
+        raise RuntimeError("음성 분석에 실패했습니다.")
+    return build_voice_response(result)
+
+# STT 없이 신호 분석만 하는 빠른 미리보기 (소리 기반 간투사, 무음, pitch/음량)
+def run_audio_preview_job(audio_path):
+    from core.speech_analysis import preview_speech
+
+    try:
+        result = preview_speech(audio_path)
+    finally:
+        remove_files(audio_path)
+
+    if result is None:
+        raise RuntimeError("음성 분석에 실패했습니다.")
+    return build_voice_preview_response(result)
+
+# 연습 세션의 take 하나 분석 (대본은 워커마다 내용 해시 기준으로 한 번만 컴파일)
+# 이전 take와의 비교는 세션을 가진 API 프로세스에서 수행
+def run_practice_take(audio_path, script_text, tier=None):
+    from core.practice_session import compile_script
+
+    try:
+        result = _analyze_audio(audio_path, script=compile_script(script_text), tier=tier)
+    finally:
+        remove_files(audio_path)
+
+    if result is None:
+        raise RuntimeError("음성 분석에 실패했습니다.")
+    response = build_voice_response(result)
+    response["practice"] = {
+        "accuracy": result["pronunciation_accuracy"],
+        "sentenceAccuracy": result["sentence_accuracy"],
+    }
+    return response
+
+# 디코딩 / FaceMesh 한 번으로 눈 깜빡임, 고개 방향, 표정을 함께 분석 (video_pipeline)
+def run_video_job(video_path):
+    from video_pipeline import analyze_video
+
+    try:
+        with registry.get("face_mesh", "head_pose") as face_mesh, \
+                registry.get("emotion", "mini_XCEPTION") as (_, emotion_classifier):
+            result = analyze_video(video_path, face_mesh, emotion_classifier, adaptive=VIDEO_ADAPTIVE)
+    finally:
+        remove_files(video_path)
+
+    if result is None:
+        raise RuntimeError("영상 파일을 열 수 없습니다.")
+    return build_video_response(result["blinks"], result["head_pose"], result["emotion"])
+
+def run_content_job(text_path):
+    from core.spell_checker import run_spellcheck_and_analysis
+
+    html_path = text_path + ".html"
+    try:
+        result = run_spellcheck_and_analysis(text_path, html_path)
+    finally:
+        remove_files(text_path, html_path)
+    return build_content_response(result)
+
+# ---------------------------------------------------------------------------
+# 프론트엔드(Analysis_*.jsx)가 읽는 형식으로 변환
+# ---------------------------------------------------------------------------
+
+def build_voice_response(result):
+    accuracy = result["pronunciation_accuracy"]
+    # 단어 타임라인이 없을 때의 텍스트 기반 간투사(글자 위치)도 단어별 횟수에는 포함
+    filler_counts = Counter(
+        word for word, _, _ in result["filler_occurrences"] + result["text_filler_occurrences"]
+    )
+    series = result["series"]
+
+    return {
+        "stats": {
+            "speed": round(result["precise_wpm"]),
+            "accuracy": round(accuracy * 100, 1) if accuracy is not None else None,
+            "fillerCount": result["filler_count"],
+            "pauseAvg": round(result["pause_avg"], 2),
+        },
+        "speedData": series["speed"],
+        "pitchAndVolumeData": series["pitch_volume"],
+        "fillerData": [{"word": word, "count": count} for word, count in filler_counts.most_common()],
+        "pauseData": result["pause_histogram"],
+        "fillerEvents": series["fillers"],
+        "pauseEvents": series["pauses"],
+        "tips": [result["feedback"]],
+        "transcript": result["stt_text"],
+    }
+
+# 미리보기에는 단어 정보가 없으므로 말하기 속도 / 발음 정확도는 비워 둠
+def build_voice_preview_response(result):
+    filler_counts = Counter(word for word, _, _ in result["filler_occurrences"])
+    pause_durations = [pause["duration"] for pause in result["pauses"]]
+    series = result["series"]
+
+    return {
+        "preview": True,
+        "stats": {
+            "speed": None,
+            "accuracy": None,
+            "fillerCount": result["filler_count"],
+            "pauseAvg": round(sum(pause_durations) / len(pause_durations), 2) if pause_durations else 0.0,
+        },
+        "speedData": [],
+        "pitchAndVolumeData": series["pitch_volume"],
+        "fillerData": [{"word": word, "count": count} for word, count in filler_counts.most_common()],
+        "pauseData": result["pause_histogram"],
+        "fillerEvents": series["fillers"],
+        "pauseEvents": series["pauses"],
+        "tips": [],
+        "transcript": None,
+    }
+
+# 실시간 코칭 지표 (LiveCoach.snapshot)
+def build_live_response(snapshot, final=False):
+    return {
+        "final": final,
+        "time": round(snapshot["time"], 2),
+        "sttTime": round(snapshot["stt_time"], 2),
+        "stats": {
+            "speed": round(snapshot["wpm"]),
+            "avgSpeed": round(snapshot["avg_wpm"]),
+            "fillerCount": snapshot["filler_count"],
+            "pauseRatio": round(snapshot["pause_ratio"], 3),
+            "pitch": round(snapshot["pitch"], 1) if snapshot["pitch"] is not None else None,
+        },
+        "fillerData": [{"word": word, "count": count} for word, count in snapshot["fillers"].items()],
+        "transcript": snapshot["transcript"],
+        "droppedSec": round(snapshot["dropped_sec"], 2),
+    }
+
+def build_video_response(blinks, head_pose, emotion):
+    angle_data = [{"angle": pose, "freq": count} for pose, count in head_pose["head_pose_counts"].items()]
+
+    # 구간(BLINK_BUCKET_SEC초)별 눈 깜빡임 횟수
+    bucket_count = int(blinks["duration_sec"] // BLINK_BUCKET_SEC) + 1
+    buckets = [0] * bucket_count
+    for timestamp in blinks["blink_timestamps"]:
+        buckets[min(int(timestamp // BLINK_BUCKET_SEC), bucket_count - 1)] += 1
+    blink_data = [{"time": i * BLINK_BUCKET_SEC, "blinks": n} for i, n in enumerate(buckets)]
+
+    expression_data = [{"expr": expr, "value": n} for expr, n in emotion["emotion_counts"].items()]
+
+    tips = []
+    summary = blinks["summary"]
+    if summary["눈 깜빡임 해석"]:
+        tips.append(f"눈 깜빡임 {summary['눈 깜빡임 빈도 (회/분)']}회/분: {summary['눈 깜빡임 해석']}")
+    if head_pose["looking_down_warning"]:
+        tips.append("고개를 숙이고 있는 시간이 많습니다. 청중을 바라보며 발표해 보세요.")
+    if emotion["message"]:
+        tips.append(emotion["message"])
+
+    return {
+        "angleData": angle_data,
+        "blinkData": blink_data,
+        "expressionData": expression_data,
+        "tips": tips,
+    }
+
+def build_content_response(result):
+    original_text = result["original_text"]
+    corrections = result["corrections"]
+    sentences = [s for s in re.split(r'[.?!\n]+', original_text) if s.strip()]
+
+    return {
+        "stats": {
+            "wordCount": len(original_text.split()),
+            "errorCount": len(corrections),
+            "avgErrors": round(len(corrections) / max(len(sentences), 1), 2),
+        },
+        "errors": corrections,
+        "originalText": original_text,
+        "correctedText": result["corrected_text"],
+        "feedback": result["feedback"],
+    }
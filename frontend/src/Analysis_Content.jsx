@@ -2,6 +2,7 @@
 
 import React, { useState, useRef } from 'react';
 import axios from 'axios';
+import { waitForJob } from './jobs';
 import './Analysis_Content.css';
 import { CloudUpload, FileText, Hash, ListChecks } from 'lucide-react';
 
@@ -22,7 +23,7 @@ export default function AnalysisContent() {
     const response = await axios.post('http://localhost:8000/analyze-content', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
-    return response.data;
+    return waitForJob(response.data.job_id);
   };
 
   const handleFileSelect = async (e) => {
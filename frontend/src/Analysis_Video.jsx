@@ -1,5 +1,6 @@
 import React, { useState, useRef } from 'react';
 import axios from 'axios';
+import { waitForJob } from './jobs';
 import './Analysis_Video.css';
 import { Video, Camera, Eye, Smile, Target } from 'lucide-react';
 import {
@@ -27,7 +28,7 @@ export default function AnalysisVideo() {
       headers: { 'Content-Type': 'multipart/form-data' }
     });
 
-    return response.data;
+    return waitForJob(response.data.job_id);
   };
 
   const handleFileSelect = async (e) => {
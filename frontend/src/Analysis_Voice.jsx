@@ -2,6 +2,7 @@
 
 import React, { useState, useRef } from 'react';
 import axios from 'axios';  // ✅ axios 추가
+import { waitForJob } from './jobs';
 import './Analysis_Voice.css';
 import {
   Mic2, Clock, CheckCircle, Slash, PauseCircle, Activity, Volume2
@@ -40,7 +41,7 @@ export default function AnalysisVoice() {
       headers: { 'Content-Type': 'multipart/form-data' }
     });
 
-    return response.data;
+    return waitForJob(response.data.job_id);
   };
 
   const handleFileSelect = async (e) => {
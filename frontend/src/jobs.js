@@ -0,0 +1,13 @@
+import axios from 'axios';
+
+// 분석 작업(job)이 끝날 때까지 상태를 조회하고 결과를 반환
+export const waitForJob = async (jobId, interval = 1000) => {
+  while (true) {
+    const { data } = await axios.get(`http://localhost:8000/jobs/${jobId}`);
+    if (data.status === 'done') return data.result;
+    if (data.status === 'failed' || data.status === 'cancelled') {
+      throw new Error(data.error || '분석 작업이 취소되었습니다.');
+    }
+    await new Promise((resolve) => setTimeout(resolve, interval));
+  }
+};
@@ -42,3 +42,4 @@ def perform_analysis(corrected_text, html_path="model/content/results/corrected_
         """)
 
     print(f"내용 피드백 결과 HTML 저장 완료: {html_path}")
+    return feedback_text
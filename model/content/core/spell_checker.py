@@ -43,6 +43,30 @@ def highlight_differences(original, corrected):
 
     return ' '.join(highlighted)
 
+def extract_corrections(original, corrected):
+    """원본과 교정본의 차이를 프론트엔드(errors 목록) 형식으로 추출"""
+    original_words = original.split()
+    corrected_words = corrected.split()
+
+    matcher = difflib.SequenceMatcher(None, original_words, corrected_words)
+    corrections = []
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'replace':
+            corrections.append({
+                "original": ' '.join(original_words[i1:i2]),
+                "suggestion": ' '.join(corrected_words[j1:j2]),
+                "type": "수정"
+            })
+        elif tag == 'delete':
+            corrections.append({
+                "original": ' '.join(original_words[i1:i2]),
+                "suggestion": "",
+                "type": "삭제"
+            })
+
+    return corrections
+
 def save_html(output_path, original, corrected, highlighted_text):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
@@ -98,14 +122,20 @@ def save_html(output_path, original, corrected, highlighted_text):
 
     print(f"맞춤법 교정 결과 HTML 저장 완료: {output_path}")
 
-def run_spellcheck_and_analysis(input_path):
-    """main.py에서 호출: 텍스트 교정 후 content_analysis로 전달"""
+def run_spellcheck_and_analysis(input_path, output_path="model/content/results/corrected_result.html"):
+    """main.py / backend에서 호출: 텍스트 교정 후 content_analysis로 전달하고 결과를 반환"""
     original_text = read_text_file(input_path)
 
     corrected_text = gpt_spell_check(original_text)
     highlighted = highlight_differences(original_text, corrected_text)
 
-    output_path = "model/content/results/corrected_result.html"
     save_html(output_path, original_text, corrected_text, highlighted)
 
-    content_analysis.perform_analysis(corrected_text)
+    feedback_text = content_analysis.perform_analysis(corrected_text, output_path)
+
+    return {
+        "original_text": original_text,
+        "corrected_text": corrected_text,
+        "corrections": extract_corrections(original_text, corrected_text),
+        "feedback": feedback_text,
+    }
@@ -3,18 +3,31 @@ from keras.models import load_model
 import cv2
 import numpy as np
 from collections import Counter
+import os
+import sys
 
-# 경로 설정
-detection_model_path = 'model/Emotion-recognition-master/haarcascade_files/haarcascade_frontalface_default.xml'
-emotion_model_path = 'model/Emotion-recognition-master/models/_mini_XCEPTION.102-0.66.hdf5'
-video_path = 'model/Emotion-recognition-master/test.mp4'  # 샘플 영상 경로
+# 경로 설정 (모듈 위치 기준)
+base_dir = os.path.dirname(os.path.abspath(__file__))
+detection_model_path = os.path.join(base_dir, 'haarcascade_files', 'haarcascade_frontalface_default.xml')
+emotion_model_path = os.path.join(base_dir, 'models', '_mini_XCEPTION.102-0.66.hdf5')
+video_path = 'data/test.mp4'  # 샘플 영상 경로
+
+# 프레임 디코딩 모듈 (model/video) 경로 추가
+video_dir = os.path.join(base_dir, '..', 'video')
+if video_dir not in sys.path:
+    sys.path.insert(0, video_dir)
+
+from frame_source import FrameSource
 
-# 모델 로드 및 초기화
-face_detection = cv2.CascadeClassifier(detection_model_path)
-emotion_classifier = load_model(emotion_model_path, compile=False)
 EMOTIONS = ["angry", "disgust", "scared", "happy", "sad", "surprised", "neutral"]
 NEGATIVE_EMOTIONS = {"angry", "disgust", "scared", "sad", "surprised"}
 
+# 모델 로드 및 초기화
+def load_emotion_models():
+    face_detection = cv2.CascadeClassifier(detection_model_path)
+    emotion_classifier = load_model(emotion_model_path, compile=False)
+    return face_detection, emotion_classifier
+
 # 감정별 주의 문구 딕셔너리
 WARNING_MESSAGES = {
     "angry": "화난 표정을 짓는 순간이 많아 보입니다. 보다 평온하고 중립적인 표정을 지을 수 있도록 연습하는 것이 좋을 것 같습니다.",
@@ -24,54 +37,80 @@ WARNING_MESSAGES = {
     "surprised": "놀란 표정을 짓는 순간이 많아 보입니다. 보다 평온하고 중립적인 표정을 지을 수 있도록 연습하는 것이 좋을 것 같습니다."
 }
 
-# 비디오 캡처 객체 생성
-cap = cv2.VideoCapture(video_path)
-
-emotion_list = []
-
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret or frame is None:
-        break
-
-    # 원본 해상도 유지
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-    faces = face_detection.detectMultiScale(
-        gray,
-        scaleFactor=1.05,
-        minNeighbors=3,
-        minSize=(30, 30),
-        flags=cv2.CASCADE_SCALE_IMAGE
-    )
-
-    if len(faces) > 0:
-        # 가장 큰 얼굴 하나만 처리
-        faces = sorted(faces, reverse=True, key=lambda x: x[2] * x[3])
-        (fX, fY, fW, fH) = faces[0]
-
-        roi = gray[fY:fY + fH, fX:fX + fW]
-        try:
-            roi = cv2.resize(roi, (64, 64))
-        except:
-            continue
-
-        roi = roi.astype("float") / 255.0
-        roi = img_to_array(roi)
-        roi = np.expand_dims(roi, axis=0)
-
-        preds = emotion_classifier.predict(roi, verbose=0)[0]
-        label = EMOTIONS[np.argmax(preds)]
-        emotion_list.append(label)
-
-cap.release()
-
-# 최종 결과 출력
-if emotion_list:
-    most_common_emotion = Counter(emotion_list).most_common(1)[0][0]
-    print(f"영상에서 가장 빈도 높은 감정: {most_common_emotion}")
-    if most_common_emotion in WARNING_MESSAGES:
-        print(WARNING_MESSAGES[most_common_emotion])
-    else: print("발표에 적절하고 안정감있는 표정을 잘 유지하고 있습니다.")
-else:
-    print("영상에서 얼굴을 감지하지 못했습니다.")
+# 흑백 프레임에서 얼굴 영역(x, y, w, h)을 잘라 모델 입력(64x64x1, 0~1)으로 변환, 자를 수 없으면 None
+def face_roi(gray, box):
+    (fX, fY, fW, fH) = box
+    roi = gray[fY:fY + fH, fX:fX + fW]
+    try:
+        roi = cv2.resize(roi, (64, 64))
+    except:
+        return None
+
+    roi = roi.astype("float") / 255.0
+    return img_to_array(roi)
+
+# 얼굴 영역 여러 개를 한 번의 predict로 분류해 감정 라벨 목록 반환
+def classify_rois(emotion_classifier, rois):
+    if not rois:
+        return []
+    preds = emotion_classifier.predict(np.stack(rois), verbose=0)
+    return [EMOTIONS[i] for i in np.argmax(preds, axis=1)]
+
+# 프레임별 감정 라벨 → 감정별 횟수, 가장 많은 감정, 주의 문구
+def summarize_emotions(emotion_list):
+    most_common_emotion = None
+    message = None
+    if emotion_list:
+        most_common_emotion = Counter(emotion_list).most_common(1)[0][0]
+        print(f"영상에서 가장 빈도 높은 감정: {most_common_emotion}")
+        if most_common_emotion in WARNING_MESSAGES:
+            message = WARNING_MESSAGES[most_common_emotion]
+        else:
+            message = "발표에 적절하고 안정감있는 표정을 잘 유지하고 있습니다."
+        print(message)
+    else:
+        print("영상에서 얼굴을 감지하지 못했습니다.")
+
+    return {
+        "emotion_counts": dict(Counter(emotion_list)),
+        "most_common_emotion": most_common_emotion,
+        "message": message,
+    }
+
+# 영상 전체의 프레임별 감정 분류
+# frame_options: FRAME_SOURCE_CONFIGS["emotion"] 대신 쓸 해상도 / fps 설정
+def analyze_emotion(video_path, face_detection=None, emotion_classifier=None, frame_options=None):
+    if face_detection is None or emotion_classifier is None:
+        face_detection, emotion_classifier = load_emotion_models()
+
+    # 축소 / fps 조절된 흑백 프레임을 바로 디코딩
+    source = FrameSource.for_analyzer(video_path, "emotion", **(frame_options or {}))
+
+    emotion_list = []
+
+    try:
+        for _, gray in source:
+            faces = face_detection.detectMultiScale(
+                gray,
+                scaleFactor=1.05,
+                minNeighbors=3,
+                minSize=(30, 30),
+                flags=cv2.CASCADE_SCALE_IMAGE
+            )
+
+            if len(faces) > 0:
+                # 가장 큰 얼굴 하나만 처리
+                faces = sorted(faces, reverse=True, key=lambda x: x[2] * x[3])
+
+                roi = face_roi(gray, faces[0])
+                if roi is None:
+                    continue
+                emotion_list.extend(classify_rois(emotion_classifier, [roi]))
+    finally:
+        source.close()
+
+    # 최종 결과 출력
+    return summarize_emotions(emotion_list)
+
+if __name__ == "__main__":
+    analyze_emotion(video_path)
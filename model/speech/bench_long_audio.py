@@ -0,0 +1,34 @@
+# 긴 녹음 전사 속도 비교: 단일 transcribe 호출 vs 무음 경계 청크 병렬 전사
+# 실행: python model/speech/bench_long_audio.py [model_size] [workers]
+import glob
+import os
+import sys
+import time
+import numpy as np
+from core.audio_clip import AudioClip
+from core.chunked_stt import transcribe_long_audio
+from core.stt_pronunciation import load_whisper_model, transcribe_audio
+
+if __name__ == "__main__":
+    model_size = sys.argv[1] if len(sys.argv) > 1 else "small"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    # data/pitch*.m4a를 이어 붙여 하나의 긴 녹음으로 사용
+    paths = sorted(glob.glob("data/pitch*.m4a"))
+    clip = AudioClip(np.concatenate([AudioClip.from_file(p).samples for p in paths]))
+    print(f"🎧 입력: {len(paths)}개 파일, {clip.duration / 60:.1f}분")
+
+    model = load_whisper_model(model_size)
+    start = time.time()
+    _, single_timeline = transcribe_audio(clip.samples, model)
+    single_sec = time.time() - start
+
+    # 워커의 모델 로드 시간은 제외하기 위해 한 번 예열 후 측정
+    transcribe_long_audio(AudioClip(clip.samples[:clip.sr * 5]), model_size, workers=workers)
+    start = time.time()
+    _, chunked_timeline = transcribe_long_audio(clip, model_size, workers=workers)
+    chunked_sec = time.time() - start
+
+    print(f"단일 호출   : {single_sec:.1f}초 (RTF {single_sec / clip.duration:.3f}, 단어 {len(single_timeline)}개)")
+    print(f"청크 병렬({workers}) : {chunked_sec:.1f}초 (RTF {chunked_sec / clip.duration:.3f}, 단어 {len(chunked_timeline)}개)")
+    print(f"속도 향상   : {single_sec / chunked_sec:.2f}배")
@@ -0,0 +1,106 @@
+# STT 엔진 / 모델 크기 / 연산 정밀도 조합별 성능 비교
+# 실행: python model/speech/bench_stt_engines.py [엔진:크기:연산 ...]  (예: faster-whisper:small:int8)
+#   생략하면 BENCH_GRID 전체, 조합마다 새 프로세스에서 실행해 콜드 로드 시간과 최대 메모리(peak RSS)를 따로 측정
+# 출력: data/pitch*.m4a 전체의 실시간 배율(RTF), peak RSS, 로드 시간, 대본이 있는 녹음의 WER / CER (markdown 표)
+#       + CER이 MAX_CER 이하인 조합 중 가장 빠른 조합
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from bench_stt_tiers import load_corpus
+from core.stt_engines import create_engine
+from core.stt_tiers import transcribe_options
+from core.word_timeline import WordTimeline
+from utils.alignment import error_rates
+
+BENCH_GRID = [
+    ("faster-whisper", "tiny", "int8"),
+    ("faster-whisper", "base", "int8"),
+    ("faster-whisper", "small", "int8"),
+    ("faster-whisper", "small", "float32"),
+    ("faster-whisper", "medium", "int8"),
+    ("openai-whisper", "tiny", "float32"),
+    ("openai-whisper", "base", "float32"),
+    ("openai-whisper", "small", "float32"),
+]
+
+# 허용하는 최대 글자 오류율
+MAX_CER = 0.15
+
+# 모든 엔진에 같은 디코딩 설정 사용 (openai-whisper는 VAD가 없으므로 끔)
+BENCH_OPTIONS = dict(transcribe_options("balanced"), vad_filter=False)
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# 조합 하나 측정 (자식 프로세스에서 실행, 마지막 줄에 JSON 출력)
+def run_single(engine_name, size, compute_type):
+    corpus = load_corpus()
+    base_rss = peak_rss_mb()
+    engine = create_engine(engine_name, size, compute_type)
+    # 첫 추론의 초기화 비용은 RTF에서 제외
+    list(engine.transcribe(corpus[0][1].samples[:corpus[0][1].sr * 5], **BENCH_OPTIONS)[0])
+
+    audio_sec = stt_sec = 0.0
+    rates = []
+    for path, clip, reference in corpus:
+        start = time.time()
+        segments, _ = engine.transcribe(clip.samples, **BENCH_OPTIONS)
+        timeline = WordTimeline.from_segments(segments)
+        stt_sec += time.time() - start
+        audio_sec += clip.duration
+        if reference is not None:
+            rates.append(error_rates(reference, timeline.text))
+        print(f"  [{engine_name}:{size}:{compute_type}] {path}: {time.time() - start:.1f}초", file=sys.stderr)
+
+    return {
+        "engine": engine_name,
+        "size": size,
+        "compute_type": compute_type,
+        "load_sec": engine.load_time,
+        "rtf": stt_sec / audio_sec,
+        "peak_rss_mb": peak_rss_mb(),
+        "model_rss_mb": peak_rss_mb() - base_rss,
+        "wer": sum(r["wer"] for r in rates) / len(rates) if rates else None,
+        "cer": sum(r["cer"] for r in rates) / len(rates) if rates else None,
+    }
+
+def run_isolated(engine_name, size, compute_type):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--single", engine_name, size, compute_type],
+        stdout=subprocess.PIPE, stderr=None, text=True,
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"engine": engine_name, "size": size, "compute_type": compute_type, "error": "실행 실패 (엔진 미설치 등)"}
+    return json.loads(lines[-1])
+
+def format_rate(value):
+    return f"{value * 100:.1f}%" if value is not None else "-"
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--single":
+        print(json.dumps(run_single(*sys.argv[2:])))
+        sys.exit(0)
+
+    grid = [tuple(arg.split(":")) for arg in sys.argv[1:]] or BENCH_GRID
+    results = [run_isolated(*config) for config in grid]
+
+    print("| 엔진 | 모델 | 연산 | 로드(초) | RTF | peak RSS(MB) | 모델 RSS(MB) | WER | CER |")
+    print("|---|---|---|---|---|---|---|---|---|")
+    for r in results:
+        if "error" in r:
+            print(f"| {r['engine']} | {r['size']} | {r['compute_type']} | {r['error']} | | | | | |")
+            continue
+        print(f"| {r['engine']} | {r['size']} | {r['compute_type']} | {r['load_sec']:.1f} | {r['rtf']:.3f} | "
+              f"{r['peak_rss_mb']:.0f} | {r['model_rss_mb']:.0f} | {format_rate(r['wer'])} | {format_rate(r['cer'])} |")
+
+    passing = [r for r in results if "error" not in r and r["cer"] is not None and r["cer"] <= MAX_CER]
+    if passing:
+        best = min(passing, key=lambda r: r["rtf"])
+        print(f"\n✅ CER {MAX_CER * 100:.0f}% 이하 중 가장 빠른 조합: "
+              f"{best['engine']}:{best['size']}:{best['compute_type']} (RTF {best['rtf']:.3f})")
+    else:
+        print(f"\n⚠️ CER {MAX_CER * 100:.0f}% 이하인 조합이 없습니다.")
@@ -0,0 +1,80 @@
+# STT 품질 단계(fast / balanced / accurate)별 실시간 배율(RTF)과 글자 오류율(CER) 측정
+# 실행: python model/speech/bench_stt_tiers.py [tier ...]  (생략하면 모든 단계)
+# data/ 의 녹음(pitch*.m4a, test1.m4a, *.wav)을 전사하고, 대본이 있는 녹음은 CER과 발음 정확도(대본-STT 정렬 비율)도
+# 함께 계산해 markdown 표로 출력
+import glob
+import sys
+import time
+from core.audio_clip import AudioClip
+from core.stt_pronunciation import load_whisper_model, transcribe_audio
+from core.stt_tiers import STT_TIERS
+from utils.alignment import align_texts, error_rates
+
+# 녹음별 대본 (pitch8.m4a는 pitch_sample.m4a와 같은 녹음)
+REFERENCE_SCRIPTS = {
+    "data/test1.m4a": "data/test1.txt",
+    "data/pitch8.m4a": "data/pitch_sample_script.txt",
+}
+
+def load_corpus():
+    paths = sorted(set(glob.glob("data/pitch*.m4a")) - {"data/pitch_sample.m4a"}) + ["data/test1.m4a"]
+    paths += sorted(glob.glob("data/*.wav"))
+    corpus = []
+    for path in paths:
+        reference = None
+        if path in REFERENCE_SCRIPTS:
+            with open(REFERENCE_SCRIPTS[path], "r", encoding="utf-8") as f:
+                reference = f.read()
+        corpus.append((path, AudioClip.from_file(path), reference))
+    return corpus
+
+def bench_tier(tier, corpus):
+    start = time.time()
+    model = load_whisper_model(tier=tier)
+    load_sec = time.time() - start
+    # 첫 추론의 초기화 비용은 제외
+    transcribe_audio(corpus[0][1].samples[:corpus[0][1].sr * 5], model, tier)
+
+    rows = []
+    for path, clip, reference in corpus:
+        start = time.time()
+        stt_text, _ = transcribe_audio(clip.samples, model, tier)
+        stt_sec = time.time() - start
+        accuracy = align_texts(reference, stt_text).ratio if reference is not None else None
+        cer = error_rates(reference, stt_text)["cer"] if reference is not None else None
+        rows.append((path, clip.duration, stt_sec, accuracy, cer))
+        print(f"  [{tier}] {path}: {stt_sec:.1f}초 (RTF {stt_sec / clip.duration:.3f})", file=sys.stderr)
+    return load_sec, rows
+
+if __name__ == "__main__":
+    tiers = sys.argv[1:] or list(STT_TIERS)
+    corpus = load_corpus()
+
+    summary, details = [], []
+    for tier in tiers:
+        load_sec, rows = bench_tier(tier, corpus)
+        audio_sec = sum(row[1] for row in rows)
+        stt_sec = sum(row[2] for row in rows)
+        accuracies = [row[3] for row in rows if row[3] is not None]
+        cers = [row[4] for row in rows if row[4] is not None]
+        summary.append((tier, load_sec, audio_sec, stt_sec,
+                        sum(accuracies) / len(accuracies) if accuracies else None,
+                        sum(cers) / len(cers) if cers else None))
+        details.extend((tier,) + row for row in rows)
+
+    def percent(value):
+        return f"{value * 100:.1f}%" if value is not None else "-"
+
+    print("| 단계 | 모델 | 연산 | beam | VAD | 로드(초) | 음성(초) | STT(초) | RTF | CER | 정확도 |")
+    print("|---|---|---|---|---|---|---|---|---|---|---|")
+    for tier, load_sec, audio_sec, stt_sec, accuracy, cer in summary:
+        config = STT_TIERS[tier]
+        print(f"| {tier} | {config['model_size']} | {config['compute_type']} | {config['beam_size']} | "
+              f"{'on' if config['vad_filter'] else 'off'} | {load_sec:.1f} | {audio_sec:.0f} | {stt_sec:.1f} | "
+              f"{stt_sec / audio_sec:.3f} | {percent(cer)} | {percent(accuracy)} |")
+
+    print()
+    print("| 단계 | 녹음 | 길이(초) | RTF | CER | 정확도 |")
+    print("|---|---|---|---|---|---|")
+    for tier, path, duration, stt_sec, accuracy, cer in details:
+        print(f"| {tier} | {path} | {duration:.0f} | {stt_sec / duration:.3f} | {percent(cer)} | {percent(accuracy)} |")
@@ -0,0 +1,96 @@
+import numpy as np
+
+# STT 결과와 합칠 때 소리 기반으로 감지한 간투사에 붙이는 이름
+ACOUSTIC_FILLER = "머뭇거림"
+
+# 간투사로 볼 지속 발성 길이 범위 (초)
+MIN_FILLER_SEC = 0.25
+MAX_FILLER_SEC = 2.0
+# pitch가 평평하다고 보는 기준: PITCH_WINDOW 프레임 동안 pitch 표준편차(반음) 이하
+PITCH_WINDOW = 5
+MAX_PITCH_STD_SEMITONES = 1.0
+# 스펙트럼 변화(flux)가 발화 프레임 중 하위 FLUX_QUANTILE 이하인 프레임만 후보
+FLUX_QUANTILE = 0.35
+# 앞이나 뒤에 MIN_PAUSE_SEC 이상의 무음이 PAUSE_GAP_SEC 이내에 있어야 함 (멈춤 사이의 발성)
+MIN_PAUSE_SEC = 0.1
+PAUSE_GAP_SEC = 0.2
+
+# True가 연속된 구간 (starts, ends) (ends는 포함하지 않음)
+def _runs(mask):
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return edges[0::2], edges[1::2]
+
+# window 프레임 이동 표준편차 (누적합으로 계산, 중앙 정렬)
+def _rolling_std(x, window):
+    padded = np.pad(x.astype(np.float64), (window // 2, window - 1 - window // 2), mode="edge")
+    c1 = np.concatenate(([0.0], np.cumsum(padded)))
+    c2 = np.concatenate(([0.0], np.cumsum(padded * padded)))
+    mean = (c1[window:] - c1[:-window]) / window
+    var = (c2[window:] - c2[:-window]) / window - mean * mean
+    return np.sqrt(np.maximum(var, 0.0))
+
+# 소리 기반 간투사(머뭇거림) 감지: [(ACOUSTIC_FILLER, start, end), ...] (초)
+# 발화 중이면서 pitch가 평평하고 스펙트럼 변화가 작은 프레임이 일정 시간 이어지고,
+# 그 앞이나 뒤에 짧은 무음이 있는 구간 ("음~", "어~" 같은 지속 발성)
+def detect_acoustic_fillers(features):
+    n = len(features)
+    if n == 0:
+        return []
+    frame_sec = features.hop_length / features.sr
+    voiced = features.voiced & (features.pitch > 0)
+    if not voiced.any():
+        return []
+
+    semitones = 12 * np.log2(np.maximum(features.pitch, 1.0))
+    flat_pitch = _rolling_std(semitones, PITCH_WINDOW) <= MAX_PITCH_STD_SEMITONES
+    steady = features.flux <= np.quantile(features.flux[voiced], FLUX_QUANTILE)
+
+    candidate = voiced & flat_pitch & steady
+    # 한 프레임짜리 끊김은 메움
+    candidate[1:-1] |= candidate[:-2] & candidate[2:]
+
+    starts, ends = _runs(candidate)
+    lengths = (ends - starts) * frame_sec
+    keep = (lengths >= MIN_FILLER_SEC) & (lengths <= MAX_FILLER_SEC)
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return []
+
+    # 멈춤(무음) 구간과 붙어 있는지 확인
+    pause_starts, pause_ends = _runs(~features.voiced)
+    long_pause = (pause_ends - pause_starts) * frame_sec >= MIN_PAUSE_SEC
+    pause_starts, pause_ends = pause_starts[long_pause], pause_ends[long_pause]
+    if len(pause_starts) == 0:
+        return []
+    gap = int(round(PAUSE_GAP_SEC / frame_sec))
+
+    before = np.searchsorted(pause_ends, starts, side="right") - 1
+    has_before = (before >= 0) & (pause_ends[np.maximum(before, 0)] >= starts - gap)
+    after = np.searchsorted(pause_starts, ends, side="left")
+    has_after = (after < len(pause_starts)) & (pause_starts[np.minimum(after, len(pause_starts) - 1)] <= ends + gap)
+
+    keep = has_before | has_after
+    return [
+        (ACOUSTIC_FILLER, float(start * frame_sec), float(end * frame_sec))
+        for start, end in zip(starts[keep], ends[keep])
+    ]
+
+# STT 간투사와 소리 기반 간투사 합치기 (시작 시각 순)
+# 소리 기반 구간이 STT 간투사와 겹치거나, 절반 이상이 인식된 단어로 덮여 있으면 제외
+def merge_filler_detections(lexical, acoustic, timeline=None):
+    merged = list(lexical)
+    lexical_starts = np.array([start for _, start, _ in lexical], dtype=float)
+    lexical_ends = np.array([end for _, _, end in lexical], dtype=float)
+    word_starts = timeline.starts if timeline is not None and len(timeline) > 0 else np.zeros(0)
+    word_ends = timeline.ends if timeline is not None and len(timeline) > 0 else np.zeros(0)
+
+    for label, start, end in acoustic:
+        if np.any((lexical_starts < end) & (start < lexical_ends)):
+            continue
+        covered = np.clip(np.minimum(word_ends, end) - np.maximum(word_starts, start), 0, None).sum()
+        if covered > 0.5 * (end - start):
+            continue
+        merged.append((label, start, end))
+
+    merged.sort(key=lambda occurrence: occurrence[1])
+    return merged
@@ -0,0 +1,38 @@
+import numpy as np
+from faster_whisper import decode_audio
+from core.pcm_store import get_default_store
+
+# Whisper / librosa 분석 공통 샘플링 레이트
+SAMPLE_RATE = 16000
+
+class AudioClip:
+    """한 번만 디코딩한 16kHz mono float32 음성 버퍼
+
+    STT(WhisperModel.transcribe), librosa 특징 추출, 무음 구간 계산이
+    모두 같은 samples 배열을 공유하므로 파일을 다시 디코딩하지 않는다.
+    """
+
+    # pcm_path: samples가 PcmStore의 .npy memmap이면 그 경로 (다른 프로세스가 복사 없이 열 수 있음)
+    def __init__(self, samples, sr=SAMPLE_RATE, path=None, pcm_path=None):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sr = sr
+        self.path = path
+        self.pcm_path = pcm_path
+
+    # PyAV(ffmpeg 라이브러리)로 프로세스 내에서 디코딩 + 16kHz mono 리샘플링
+    # PCM 저장소가 설정되어 있으면 이전에 디코딩한 결과를 memmap으로 바로 엶
+    @classmethod
+    def from_file(cls, audio_path, sr=SAMPLE_RATE, content_hash=None):
+        store = get_default_store()
+        if store is not None:
+            samples, pcm_path = store.load(audio_path, sr, content_hash)
+            return cls(samples, sr, audio_path, pcm_path)
+        samples = decode_audio(audio_path, sampling_rate=sr)
+        return cls(samples, sr, audio_path)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sr
+
+    def __len__(self):
+        return len(self.samples)
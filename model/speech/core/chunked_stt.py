@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import librosa
+import numpy as np
+from core.stt_tiers import get_tier, transcribe_options
+from core.word_timeline import WordTimeline
+
+# 이 길이(초) 이상인 녹음만 청크 병렬 전사를 사용
+LONG_AUDIO_MIN_SEC = 600
+
+# faster_whisper Segment / Word와 같은 속성 이름을 갖는 가벼운 결과 타입 (프로세스 간 전달용)
+Word = namedtuple("Word", ["word", "start", "end", "probability"])
+Segment = namedtuple("Segment", ["start", "end", "text", "words"])
+
+# 무음 구간(librosa.effects.split 기준) 가운데에서 자른 청크 경계 [(start, end), ...] (sample 단위)
+def plan_chunks(samples, sr, chunk_sec=60, max_chunk_sec=120, top_db=30):
+    total = len(samples)
+    target_len = int(chunk_sec * sr)
+    max_len = int(max_chunk_sec * sr)
+
+    intervals = librosa.effects.split(samples, top_db=top_db)
+    cuts = [0]
+    for (_, end), (next_start, _) in zip(intervals[:-1], intervals[1:]):
+        # 무음 없이 너무 길어지면 강제로 자름 (경계 단어는 겹침 제거 단계에서 정리)
+        while end - cuts[-1] > max_len:
+            cuts.append(cuts[-1] + max_len)
+        if end - cuts[-1] >= target_len:
+            cuts.append((end + next_start) // 2)
+    while total - cuts[-1] > max_len:
+        cuts.append(cuts[-1] + max_len)
+    cuts.append(total)
+
+    return [(start, end) for start, end in zip(cuts[:-1], cuts[1:]) if end > start]
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스 (프로세스마다 WhisperModel 한 번 로드)
+# ---------------------------------------------------------------------------
+
+_worker_model = None
+
+# 풀을 만든 프로세스가 비정상 종료(OOM, terminate)되면 워커도 함께 종료 (고아 프로세스가 모델을 붙잡고 남지 않도록)
+def _exit_with_parent(parent_pid):
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+    os._exit(0)
+
+def _init_worker(model_size, compute_type, cpu_threads, parent_pid):
+    global _worker_model
+    from core.stt_pronunciation import load_whisper_model
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    _worker_model = load_whisper_model(model_size, compute_type=compute_type, cpu_threads=cpu_threads)
+
+# 청크 하나를 전사하고 전역 시간축으로 옮긴 뒤, 자기 구간(own_start~own_end)에 속한 단어만 남김
+# source: 샘플 배열 또는 (PCM .npy 경로, start, end) — 경로면 워커가 memmap으로 직접 열어 복사 없이 사용
+def _transcribe_chunk(source, offset_sec, own_start_sec, own_end_sec, options):
+    if isinstance(source, tuple):
+        pcm_path, start, end = source
+        samples = np.load(pcm_path, mmap_mode="r")[start:end]
+    else:
+        samples = source
+    segments, _ = _worker_model.transcribe(samples, **options)
+
+    results = []
+    for segment in segments:
+        words = [
+            Word(w.word, w.start + offset_sec, w.end + offset_sec, w.probability)
+            for w in segment.words or []
+        ]
+        kept = [w for w in words if own_start_sec <= (w.start + w.end) / 2 < own_end_sec]
+        if not kept:
+            continue
+        text = segment.text if len(kept) == len(words) else "".join(w.word for w in kept)
+        results.append(Segment(kept[0].start, kept[-1].end, text, kept))
+    return results
+
+_pools = {}
+
+# (모델, 워커 수)별로 프로세스 풀을 재사용해 청크 전사마다 모델을 다시 로드하지 않음
+# cpu_threads: 워커 하나의 CTranslate2 스레드 수 (생략하면 CPU 코어를 워커 수로 나눔)
+def _get_pool(model_size, compute_type, workers, cpu_threads=None):
+    key = (model_size, compute_type, workers, cpu_threads)
+    if key not in _pools:
+        threads = cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+        _pools[key] = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(model_size, compute_type, threads, os.getpid()),
+        )
+    return _pools[key]
+
+# 워커는 정리할 상태가 없으므로 종료 신호를 기다리지 않고 바로 종료
+# (종료 중인 작업 워커 프로세스 안에서는 정상 종료 신호가 워커까지 전달되지 않아 멈출 수 있음)
+def _close_pool(pool):
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+# 만들어 둔 프로세스 풀을 모두 종료 (서버 종료 / 작업 워커 종료 시 호출)
+def shutdown_pools():
+    while _pools:
+        _, pool = _pools.popitem()
+        _close_pool(pool)
+
+# 긴 녹음을 무음 경계에서 나눠 여러 프로세스에서 동시에 전사하고 하나의 타임라인으로 합침
+# model_size / compute_type을 생략하면 tier(품질 단계)의 설정을 사용
+# cpu_threads: 워커별 스레드 수 (여러 프로세스가 각자 풀을 가질 때 코어를 나눠 쓰도록 지정)
+def transcribe_long_audio(clip, model_size=None, compute_type=None, workers=None,
+                          chunk_sec=60, overlap_sec=1.0, tier=None, cpu_threads=None):
+    config = get_tier(tier)
+    model_size = model_size or config["model_size"]
+    compute_type = compute_type or config["compute_type"]
+    options = transcribe_options(tier)
+    workers = workers or os.cpu_count() or 1
+    sr = clip.sr
+    samples = clip.samples
+    overlap = int(overlap_sec * sr)
+    chunks = plan_chunks(samples, sr, chunk_sec)
+
+    key = (model_size, compute_type, workers, cpu_threads)
+    pool = _get_pool(*key)
+    futures = []
+    for start, end in chunks:
+        # 앞뒤로 overlap만큼 더 잘라 경계 단어의 문맥을 보존 (중복 단어는 워커에서 제거)
+        padded_start = max(0, start - overlap)
+        padded_end = min(len(samples), end + overlap)
+        if clip.pcm_path is not None:
+            source = (clip.pcm_path, padded_start, padded_end)
+        else:
+            source = samples[padded_start:padded_end]
+        futures.append(pool.submit(
+            _transcribe_chunk,
+            source,
+            padded_start / sr,
+            start / sr,
+            end / sr,
+            options,
+        ))
+
+    try:
+        segments = [segment for future in futures for segment in future.result()]
+    except BrokenProcessPool:
+        # 워커가 비정상 종료되면 풀을 버려 다음 전사에서 새로 만들도록 함
+        if _pools.get(key) is pool:
+            del _pools[key]
+        _close_pool(pool)
+        raise
+    timeline = WordTimeline.from_segments(segments)
+    return timeline.text, timeline
@@ -0,0 +1,185 @@
+import librosa
+import numpy as np
+import scipy.fftpack
+
+# librosa 기본값과 같은 프레임 설정 (이전 mfcc / piptrack / effects.split 결과와 호환)
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MFCC = 13
+N_MELS = 128
+
+# piptrack 기본 탐색 범위 / 임계값
+PITCH_FMIN = 150.0
+PITCH_FMAX = 4000.0
+PITCH_THRESHOLD = 0.1
+
+# 청크 모드에서 한 번에 STFT하는 길이 (초) — 메모리 사용량은 녹음 길이가 아니라 이 값에 비례
+BLOCK_SEC = 60
+
+class SpeechFeatures:
+    """한 번의 STFT에서 얻은 프레임 단위 음성 특징
+
+    - mfcc: (n_mfcc, frames)
+    - rms: 프레임별 RMS 음량 (STFT 크기 스펙트럼 기준)
+    - voiced: 시간 영역 프레임 RMS가 최대 대비 -top_db 초과인 프레임
+      (librosa.effects.split과 같은 프레임 길이 / hop / 0 패딩 center 기준이라 발화 구간이 split 결과와 같음)
+    - pitch: 프레임별 가장 강한 piptrack 피크 주파수 (없으면 0)
+    - flux: 이전 프레임 대비 log-mel 스펙트럼 평균 변화량 (dB, 첫 프레임은 0)
+    - pitch_mean / pitch_std: 기존 piptrack 방식(전체 magnitude 중앙값 초과 피크)의 평균/표준편차
+    """
+
+    def __init__(self, sr, hop_length, n_samples, mfcc, rms, voiced, pitch, flux, pitch_mean, pitch_std):
+        self.sr = sr
+        self.hop_length = hop_length
+        self.n_samples = n_samples
+        self.mfcc = mfcc
+        self.rms = rms
+        self.voiced = voiced
+        self.pitch = pitch
+        self.flux = flux
+        self.pitch_mean = pitch_mean
+        self.pitch_std = pitch_std
+
+    def __len__(self):
+        return len(self.rms)
+
+    @property
+    def times(self):
+        return librosa.frames_to_time(np.arange(len(self.rms)), sr=self.sr, hop_length=self.hop_length)
+
+    def mfcc_stats(self):
+        return np.mean(self.mfcc, axis=1), np.std(self.mfcc, axis=1)
+
+    # 발화 구간 [(start, end), ...] (sample 단위, librosa.effects.split과 같은 형식)
+    def nonsilent_intervals(self):
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], self.voiced, [False])).astype(np.int8)))
+        intervals = (edges * self.hop_length).reshape(-1, 2)
+        return np.minimum(intervals, self.n_samples)
+
+    def active_speech_sec(self):
+        intervals = self.nonsilent_intervals()
+        return float((intervals[:, 1] - intervals[:, 0]).sum()) / self.sr
+
+# magnitude 행렬(값 대부분이 0)의 중앙값을 0이 아닌 값들과 0의 개수만으로 계산
+def _median_with_zeros(values, n_zeros):
+    n = len(values) + n_zeros
+    if n == 0:
+        return 0.0
+    ordered = np.sort(values)
+    negatives = int(np.searchsorted(ordered, 0.0))
+
+    def kth(k):
+        if k < negatives:
+            return ordered[k]
+        if k < negatives + n_zeros:
+            return 0.0
+        return ordered[k - n_zeros]
+
+    return float((kth((n - 1) // 2) + kth(n // 2)) / 2)
+
+# piptrack과 같은 피크 검출을 탐색 대역 안에서만 수행해 (frame, freq, mag) 희소 배열로 반환
+# (freq × frames 크기의 pitches / magnitudes 행렬을 만들지 않음)
+def _pitch_peaks(S, sr, n_fft, fmin, fmax, threshold, frame_offset):
+    fft_freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+    band = np.flatnonzero((fmin <= fft_freqs) & (fft_freqs < fmax))
+    lo, hi = max(int(band[0]), 1), min(int(band[-1]) + 1, S.shape[0] - 1)
+
+    center = S[lo:hi]
+    below = S[lo - 1:hi - 1]
+    above = S[lo + 1:hi + 1]
+    ref = threshold * S.max(axis=0)
+
+    # piptrack의 localmax(S * (S > ref))와 같은 조건
+    is_peak = (
+        (center > ref)
+        & (center > np.where(below > ref, below, 0))
+        & (center >= np.where(above > ref, above, 0))
+    )
+    bins, frames = np.nonzero(is_peak)
+    s = center[bins, frames]
+    b = (above[bins, frames] - below[bins, frames]) / 2
+    a = above[bins, frames] + below[bins, frames] - 2 * s
+
+    # 포물선 보간 (한 bin 이상 움직이면 보간하지 않음)
+    shift = np.zeros_like(s)
+    valid = np.abs(b) < np.abs(a)
+    shift[valid] = -b[valid] / a[valid]
+
+    freqs = ((bins + lo) + shift) * float(sr) / n_fft
+    mags = s + 0.5 * b * shift
+    return (frames + frame_offset).astype(np.int32), freqs.astype(np.float32), mags.astype(np.float32)
+
+# 프레임 [f0, f1)에 해당하는 (center=True 기준) 샘플 구간을 0으로 패딩해 잘라냄
+def _block_samples(samples, f0, f1, n_fft, hop_length):
+    start = f0 * hop_length - n_fft // 2
+    end = (f1 - 1) * hop_length + n_fft - n_fft // 2
+    block = np.zeros(end - start, dtype=np.float32)
+    src_start, src_end = max(start, 0), min(end, len(samples))
+    if src_end > src_start:
+        block[src_start - start:src_end - start] = samples[src_start:src_end]
+    return block
+
+# 클립 전체에서 STFT를 한 번만 계산하고 MFCC, RMS 음량, 발화 여부, pitch를 함께 추출
+# block_sec: 이 길이 단위로 STFT를 나눠 계산 (None이면 한 번에 계산)
+def extract_features(samples, sr, n_fft=N_FFT, hop_length=HOP_LENGTH, n_mfcc=N_MFCC, top_db=30,
+                     block_sec=BLOCK_SEC, fmin=PITCH_FMIN, fmax=PITCH_FMAX, threshold=PITCH_THRESHOLD):
+    n_frames = 1 + len(samples) // hop_length
+    block_frames = n_frames if block_sec is None else max(1, int(block_sec * sr) // hop_length)
+    fmax = min(fmax, sr / 2)
+    mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=N_MELS)
+
+    log_mel = np.empty((N_MELS, n_frames), dtype=np.float32)
+    rms = np.empty(n_frames, dtype=np.float32)
+    signal_rms = np.empty(n_frames, dtype=np.float32)
+    peak_frames, peak_freqs, peak_mags = [], [], []
+
+    for f0 in range(0, n_frames, block_frames):
+        f1 = min(f0 + block_frames, n_frames)
+        block = _block_samples(samples, f0, f1, n_fft, hop_length)
+        S = np.abs(librosa.stft(block, n_fft=n_fft, hop_length=hop_length, center=False))
+
+        # log-mel은 전체 최댓값 기준 top_db(80) 클리핑이 필요하므로 클리핑 전 값을 모아둠
+        power = S ** 2
+        log_mel[:, f0:f1] = 10.0 * np.log10(np.maximum(1e-10, mel_basis @ power))
+        rms[f0:f1] = librosa.feature.rms(S=S, frame_length=n_fft)[0]
+        signal_rms[f0:f1] = librosa.feature.rms(y=block, frame_length=n_fft, hop_length=hop_length, center=False)[0]
+        del power
+
+        frames, freqs, mags = _pitch_peaks(S, sr, n_fft, fmin, fmax, threshold, f0)
+        peak_frames.append(frames)
+        peak_freqs.append(freqs)
+        peak_mags.append(mags)
+
+    # MFCC: librosa.power_to_db(top_db=80) + DCT-II (ortho)
+    np.maximum(log_mel, log_mel.max() - 80.0, out=log_mel)
+    mfcc = scipy.fftpack.dct(log_mel, axis=0, type=2, norm="ortho")[:n_mfcc]
+    flux = np.zeros(n_frames, dtype=np.float32)
+    if n_frames > 1:
+        flux[1:] = np.mean(np.abs(np.diff(log_mel, axis=1)), axis=0)
+
+    # 발화 여부: librosa.effects.split처럼 창 함수 없는 프레임 RMS 기준 (STFT RMS는 Hann 창 때문에 값이 다름)
+    energy_db = librosa.amplitude_to_db(signal_rms, ref=np.max, top_db=None)
+    voiced = energy_db > -top_db
+
+    # pitch: 기존 extract_pitch처럼 전체 (freq × frames) magnitude의 중앙값보다 큰 피크만 사용
+    frames = np.concatenate(peak_frames)
+    freqs = np.concatenate(peak_freqs)
+    mags = np.concatenate(peak_mags)
+    median = _median_with_zeros(mags, (n_fft // 2 + 1) * n_frames - len(mags))
+    keep = mags > median
+    frames, freqs, mags = frames[keep], freqs[keep], mags[keep]
+
+    if len(freqs) > 0:
+        pitch_mean, pitch_std = float(np.mean(freqs)), float(np.std(freqs))
+    else:
+        pitch_mean, pitch_std = 0.0, 0.0
+
+    # 프레임마다 magnitude가 가장 큰 피크 주파수
+    pitch = np.zeros(n_frames, dtype=np.float32)
+    if len(frames) > 0:
+        order = np.lexsort((mags, frames))
+        frames, freqs = frames[order], freqs[order]
+        last = np.append(frames[1:] != frames[:-1], True)
+        pitch[frames[last]] = freqs[last]
+
+    return SpeechFeatures(sr, hop_length, len(samples), mfcc, rms, voiced, pitch, flux, pitch_mean, pitch_std)
@@ -1,55 +1,171 @@
 import re
+from collections import Counter
+
+# 기본 간투사 목록 (머뭇거림 소리)
+FILLER_WORDS = ["음", "어", "그", "저", "이", "아", "흠", "으음", "어어"]
+
+# 담화 표지 (일반 문장에서도 자주 쓰이므로 기본 목록에는 넣지 않음)
+# 세고 싶을 때만 get_lexicon(FILLER_WORDS + DISCOURSE_MARKERS)처럼 함께 넘김
+# 띄어쓰기로 구분된 항목은 여러 단어로 이루어진 간투사
+DISCOURSE_MARKERS = ["그니까", "그러니까", "뭐랄까", "뭐라고 할까", "이제", "약간", "뭐지", "그러면"]
+
+# 이 글자 수 이하의 한 단어 간투사("그", "이", "저" 등)는 일반 단어와 겹치므로 길게 발음된 경우만 인정
+SHORT_FILLER_LEN = 2
+
+TOKEN_PATTERN = re.compile(r"[\w가-힣]+")
 
 def preprocess_word_for_comparison(word):
     word = word.lower()
     return re.sub(r'[^\w가-힣]', '', word).strip()
 
-def is_filler_word(word_info, fillers, min_duration=0.3, max_word_len=2):
-    norm_word = preprocess_word_for_comparison(word_info.word)
-    duration = word_info.end - word_info.start
-
-    return (
-        norm_word in fillers and
-        len(norm_word) <= max_word_len and
-        duration >= min_duration
-    )
-
-# segment.words 기반 감지
-def detect_filler_words(segments, fillers, min_duration=1):
-    count = 0
-    occurrences = []
-
-    for segment in segments:
-        for word_info in getattr(segment, "words", []):
-            if is_filler_word(word_info, fillers, min_duration):
-                norm_word = preprocess_word_for_comparison(word_info.word)
-                occurrences.append((norm_word, word_info.start, word_info.end))
-                count += 1
-    return count, occurrences
-
-def detect_fillers_from_text(text, fillers):
-    count = 0
-    occurrences = []
-
-    # word boundary를 고려한 정규식
-    pattern = r'\b(' + '|'.join([re.escape(f) for f in fillers]) + r')\b'
-    matches = re.finditer(pattern, text)
-
-    for match in matches:
-        word = match.group()
-        occurrences.append((word, match.start(), match.end()))
-        count += 1
-
-    return count, occurrences
-
-# 완성형: segment.words 실패 시 text fallback
-def detect_filler_words_safe(segments, stt_text, fillers=None, min_duration=0.3):
-    if fillers is None:
-        fillers = ["음", "어", "그", "저", "이", "아", "흠", "으음", "어어"]
-
-    count, occurrences = detect_filler_words(segments, fillers, min_duration)
-    if count > 0:
-        return count, occurrences
+class FillerLexicon:
+    """간투사 목록을 단어(token) 단위 Aho-Corasick 오토마톤으로 컴파일한 것
+
+    단어열을 한 번 순회하면서 한 단어/여러 단어 간투사를 모두 찾으므로
+    목록 크기와 관계없이 단어 수에 비례하는 시간이 든다.
+    겹치는 후보는 먼저 시작하는 것, 같으면 더 긴 것을 택한다.
+    """
+
+    def __init__(self, fillers):
+        self.phrases = []
+        self.lengths = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._phrase = [-1]  # 노드에서 정확히 끝나는 간투사 번호
+        self._output = [0]  # fail 링크를 따라 처음 만나는 간투사 노드 (더 짧은 간투사, 없으면 루트)
+
+        for filler in fillers:
+            tokens = [preprocess_word_for_comparison(t) for t in filler.split()]
+            tokens = [t for t in tokens if t]
+            if not tokens:
+                continue
+            node = 0
+            for token in tokens:
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][token] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._phrase.append(-1)
+                    self._output.append(0)
+                node = child
+            if self._phrase[node] == -1:
+                self._phrase[node] = len(self.phrases)
+                self.phrases.append(" ".join(tokens))
+                self.lengths.append(len(tokens))
+        self.max_length = max(self.lengths, default=0)
+
+        # BFS로 fail 링크 구성 (루트 바로 아래 노드의 fail은 루트)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for token, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                target = self._fail[child]
+                self._output[child] = target if self._phrase[target] != -1 else self._output[target]
+                queue.append(child)
+
+    def _step(self, node, token):
+        while node and token not in self._goto[node]:
+            node = self._fail[node]
+        return self._goto[node].get(token, 0)
+
+    # 정제된 단어열에서 간투사 구간 [(start, end, phrase 번호), ...] (end는 포함하지 않음)
+    # accept(start, end, phrase): 후보를 인정할지 판단 (길이 조건 등)
+    def match(self, tokens, accept=None):
+        # 시작 위치별로 인정된 가장 긴 후보 (end, phrase)
+        longest = [None] * len(tokens)
+        node = 0
+        for i, token in enumerate(tokens):
+            node = self._step(node, token)
+            # 여기서 끝나는 간투사를 긴 것부터 모두 확인
+            out = node if self._phrase[node] != -1 else self._output[node]
+            while out:
+                phrase = self._phrase[out]
+                out = self._output[out]
+                start = i + 1 - self.lengths[phrase]
+                if accept is None or accept(start, i + 1, phrase):
+                    # 같은 시작 위치면 나중에 끝나는(더 긴) 후보가 덮어씀
+                    longest[start] = (i + 1, phrase)
+
+        # 앞에서부터 겹치지 않게 선택
+        matches = []
+        end = 0
+        for start, candidate in enumerate(longest):
+            if candidate is not None and start >= end:
+                end, phrase = candidate
+                matches.append((start, end, phrase))
+        return matches
+
+    # WordTimeline에서 간투사 감지: [(간투사, start, end), ...] (초)
+    # 짧은 한 단어 간투사는 min_duration초 이상 발음된 경우만 인정
+    def detect(self, timeline, min_duration=0.3):
+        if len(timeline) == 0:
+            return []
+        tokens = [timeline.vocab[i] for i in timeline.token_ids]
+        return self.detect_tokens(tokens, timeline.starts, timeline.ends, min_duration)
+
+    # 정제된 단어열 + 단어별 시작/끝 시각으로 감지 (WordTimeline 없이 단어 일부만 볼 때)
+    # skip: 앞쪽 skip개 단어는 문맥으로만 쓰고, 그 안에서 끝나는 간투사는 결과에서 제외
+    def detect_tokens(self, tokens, starts, ends, min_duration=0.3, skip=0):
+        def accept(start, end, phrase):
+            if self.lengths[phrase] == 1 and len(self.phrases[phrase]) <= SHORT_FILLER_LEN:
+                return ends[start] - starts[start] >= min_duration
+            return True
+
+        return [
+            (self.phrases[phrase], float(starts[start]), float(ends[end - 1]))
+            for start, end, phrase in self.match(tokens, accept)
+            if end > skip
+        ]
+
+    # 텍스트에서 간투사 감지: [(간투사, 글자 시작 위치, 글자 끝 위치), ...]
+    def detect_text(self, text):
+        spans = [(m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+        tokens = [preprocess_word_for_comparison(text[s:e]) for s, e in spans]
+        return [
+            (self.phrases[phrase], spans[start][0], spans[end - 1][1])
+            for start, end, phrase in self.match(tokens)
+        ]
+
+_lexicons = {}
+
+# 간투사 목록별로 한 번만 컴파일 (같은 목록이면 캐시된 오토마톤 재사용)
+def get_lexicon(fillers=None):
+    key = tuple(FILLER_WORDS if fillers is None else fillers)
+    lexicon = _lexicons.get(key)
+    if lexicon is None:
+        lexicon = _lexicons[key] = FillerLexicon(key)
+    return lexicon
+
+# WordTimeline 기반 감지
+def detect_filler_words(timeline, fillers=None, min_duration=0.3):
+    occurrences = get_lexicon(fillers).detect(timeline, min_duration)
+    return len(occurrences), occurrences
+
+def detect_fillers_from_text(text, fillers=None):
+    occurrences = get_lexicon(fillers).detect_text(text)
+    return len(occurrences), occurrences
+
+# 간투사별 / 전체 분당 횟수
+def filler_rates(occurrences, duration_sec):
+    minutes = duration_sec / 60
+    if minutes <= 0:
+        return {"total": 0.0, "by_word": {}}
+    counts = Counter(word for word, _, _ in occurrences)
+    return {
+        "total": len(occurrences) / minutes,
+        "by_word": {word: count / minutes for word, count in counts.most_common()},
+    }
+
+# 완성형: 단어 타임스탬프가 없을 때(STT 단어 정보 없음)만 text fallback
+# (타임라인에서 길이 조건으로 걸러진 짧은 단어를 텍스트 감지로 다시 세지 않도록 함)
+def detect_filler_words_safe(timeline, stt_text, fillers=None, min_duration=0.3):
+    if len(timeline) > 0:
+        return detect_filler_words(timeline, fillers, min_duration)
 
     print("⚠️ 단어 기반 간투사 감지 실패 → 텍스트 기반 보완 감지 실행")
     return detect_fillers_from_text(stt_text, fillers)
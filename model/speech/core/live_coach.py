@@ -0,0 +1,234 @@
+import threading
+from collections import Counter, deque
+
+import numpy as np
+from core.audio_clip import SAMPLE_RATE
+from core.filler_words import get_lexicon
+from core.stt_tiers import transcribe_options
+from core.word_timeline import WordTimeline
+
+# 실시간 코칭 지표를 보내는 간격 (초)
+METRIC_INTERVAL_SEC = 1.0
+# 새로 들어온 음성이 이 길이 이상 쌓이면 다시 전사
+STT_INTERVAL_SEC = 2.0
+# 아직 확정되지 않은 음성의 최대 길이 (초) — 넘으면 오래된 음성부터 버림 (전사 지연/비용 상한)
+MAX_PENDING_SEC = 20.0
+# 버퍼 끝에서 이 시간 안에 끝나는 단어는 잘렸을 수 있으므로 다음 전사에서 다시 인식
+COMMIT_MARGIN_SEC = 1.0
+# 최근 WPM을 계산하는 구간 (초)
+RATE_WINDOW_SEC = 30.0
+# pitch를 계산하는 최근 구간 (초)
+PITCH_WINDOW_SEC = 1.0
+# 화면에 보여줄 최근 전사 단어 수 / 다음 전사의 문맥(initial_prompt)으로 넘기는 단어 수
+TRANSCRIPT_WORDS = 30
+PROMPT_WORDS = 10
+
+# 실시간 전사에 쓰는 STT 품질 단계 (core.stt_tiers)
+LIVE_STT_TIER = "fast"
+
+# 무음 판단 (pause_ratio_calculator.detect_silence와 같은 기준: 1ms씩 밀리는 MIN_SILENCE_MS 창의 16bit RMS)
+SILENCE_THRESH = -40
+MIN_SILENCE_MS = 300
+
+class LiveCoach:
+    """스트리밍으로 들어오는 16kHz mono PCM을 받아 실시간 발표 지표를 누적 계산
+
+    - 음성은 고정 크기 버퍼(MAX_PENDING_SEC)에만 보관하고, 지표는 누적 카운터로 유지하므로
+      발표 길이와 관계없이 메모리 사용량이 일정하다.
+    - 전사는 아직 확정되지 않은 구간만 다시 수행하고, 버퍼 끝(COMMIT_MARGIN_SEC)에서 먼 단어만 확정한다.
+    - 무음 비율은 detect_silence처럼 1ms씩 밀리는 300ms 창의 16bit RMS가 -40dBFS 이하인 창들의 합집합으로 누적하므로
+      스트림이 끝났을 때 analyze_pauses의 pause_ratio와 같다. (끝에 남은 1ms 미만 조각만 제외)
+
+    feed()는 이벤트 루프에서, transcribe_pending()은 별도 스레드에서 호출할 수 있다.
+    """
+
+    def __init__(self, sr=SAMPLE_RATE, fillers=None, min_filler_duration=0.3, tier=LIVE_STT_TIER):
+        self.sr = sr
+        self.tier = tier
+        self.lexicon = get_lexicon(fillers)
+        self.min_filler_duration = min_filler_duration
+        self._lock = threading.Lock()
+
+        # 최근 음성 버퍼: 절대 위치 [received - size, received) 구간
+        self._buffer = np.zeros(int(MAX_PENDING_SEC * sr), dtype=np.float32)
+        self._size = 0
+        self.received = 0
+        # committed 이전 음성은 전사가 확정됨, last_stt_end: 마지막 전사에 포함된 끝 위치
+        self.committed = 0
+        self._last_stt_end = 0
+        self.dropped = 0
+
+        # 무음 누적 (1ms 단위 에너지, 창 계산용으로 직전 MIN_SILENCE_MS - 1 ms만 보관)
+        self._ms = sr // 1000
+        self._ms_rest = np.zeros(0, dtype=np.float32)
+        self._energy_tail = np.zeros(0, dtype=np.int64)
+        self._threshold = 10 ** (SILENCE_THRESH / 20) * 32768
+        self._total_ms = 0
+        self._silence_ms = 0
+        self._silence_end = 0  # 지금까지 무음 구간 합집합의 끝 (ms)
+        self._last_voice_end = 0  # 마지막으로 무음이 아닌 창의 끝 (sample)
+
+        # 전사 결과 누적
+        self.word_count = 0
+        self._recent_starts = deque()
+        self._transcript = deque(maxlen=TRANSCRIPT_WORDS)
+        self._context_tokens = deque(maxlen=max(self.lexicon.max_length - 1, 0))
+        self._context_times = deque(maxlen=max(self.lexicon.max_length - 1, 0))
+        self.filler_counts = Counter()
+        self.filler_count = 0
+
+    # 16bit little-endian PCM 바이트 추가
+    def feed_pcm16(self, data):
+        self.feed(np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0)
+
+    # float32 PCM 추가 (범위 -1 ~ 1)
+    def feed(self, samples):
+        samples = np.asarray(samples, dtype=np.float32)
+        with self._lock:
+            self._append(samples)
+            self._update_silence(samples)
+
+    def _append(self, samples):
+        capacity = len(self._buffer)
+        n = len(samples)
+        if n >= capacity:
+            self._buffer[:] = samples[-capacity:]
+            self._size = capacity
+        else:
+            overflow = self._size + n - capacity
+            if overflow > 0:
+                self._buffer[:self._size - overflow] = self._buffer[overflow:self._size]
+                self._size -= overflow
+            self._buffer[self._size:self._size + n] = samples
+            self._size += n
+        self.received += n
+
+    # 새로 끝난 MIN_SILENCE_MS 창들 중 무음인 창의 구간을 합집합으로 누적
+    def _update_silence(self, samples):
+        data = np.concatenate((self._ms_rest, samples))
+        n_ms = len(data) // self._ms
+        self._ms_rest = data[n_ms * self._ms:]
+        if n_ms == 0:
+            return
+
+        pcm = (np.clip(data[:n_ms * self._ms], -1.0, 1.0) * 32767).astype(np.int16).astype(np.int64)
+        energy = np.concatenate((self._energy_tail, (pcm * pcm).reshape(n_ms, self._ms).sum(axis=1)))
+        self._total_ms += n_ms
+        self._energy_tail = energy[max(len(energy) - (MIN_SILENCE_MS - 1), 0):]
+        if len(energy) < MIN_SILENCE_MS:
+            return
+
+        # 창 k는 energy[k:k + MIN_SILENCE_MS], ends는 각 창의 끝 (ms, 포함하지 않음)
+        cumulative = np.concatenate(([0], np.cumsum(energy)))
+        window_energy = cumulative[MIN_SILENCE_MS:] - cumulative[:-MIN_SILENCE_MS]
+        ends = self._total_ms - len(energy) + MIN_SILENCE_MS + np.arange(len(window_energy))
+        silent = np.floor(np.sqrt(window_energy / (MIN_SILENCE_MS * self._ms))) <= self._threshold
+
+        silent_ends = ends[silent]
+        if len(silent_ends) > 0:
+            # 창 길이가 같으므로 직전 무음 창의 끝 이후 부분만 새로 덮음
+            previous = np.concatenate(([self._silence_end], silent_ends[:-1]))
+            self._silence_ms += int(np.minimum(silent_ends - previous, MIN_SILENCE_MS).sum())
+            self._silence_end = int(silent_ends[-1])
+        if not silent.all():
+            self._last_voice_end = int(ends[~silent][-1]) * self._ms
+
+    # 마지막 전사 이후 새 음성이 STT_INTERVAL_SEC 이상 쌓였는지
+    def stt_due(self):
+        with self._lock:
+            return self.received - self._last_stt_end >= STT_INTERVAL_SEC * self.sr
+
+    # 확정되지 않은 구간 전사 (final=True면 버퍼 끝까지 모두 확정)
+    def transcribe_pending(self, model, final=False):
+        with self._lock:
+            start = max(self.committed, self.received - self._size)
+            end = self.received
+            if start > self.committed:
+                self.dropped += start - self.committed
+                self.committed = start
+            audio = self._buffer[self._size - (end - start):self._size].copy()
+            self._last_stt_end = end
+            has_voice = self._last_voice_end > start
+            prompt = " ".join(list(self._transcript)[-PROMPT_WORDS:]) or None
+
+        margin = 0 if final else int(COMMIT_MARGIN_SEC * self.sr)
+        if not has_voice or len(audio) == 0:
+            # 말소리가 없으면 전사하지 않고 확정만 진행
+            with self._lock:
+                self.committed = max(self.committed, end - margin)
+            return
+
+        # 직전에 확정된 단어들을 문맥으로 넘기고, 이전 창의 출력에는 조건을 걸지 않음
+        options = transcribe_options(self.tier)
+        options.update(condition_on_previous_text=False, initial_prompt=prompt)
+        segments, _ = model.transcribe(audio, **options)
+        timeline = WordTimeline.from_segments(segments)
+        cutoff = (len(audio) - margin) / self.sr
+        n = int(np.searchsorted(np.maximum.accumulate(timeline.ends), cutoff, side="right")) if len(timeline) else 0
+
+        with self._lock:
+            if len(timeline) == 0:
+                self.committed = max(self.committed, end - margin)
+            elif n > 0:
+                offset = start / self.sr
+                tokens = [timeline.vocab[i] for i in timeline.token_ids[:n]]
+                self._commit(timeline.words[:n], tokens, timeline.starts[:n] + offset, timeline.ends[:n] + offset)
+                self.committed = max(self.committed, start + int(timeline.ends[n - 1] * self.sr))
+
+    # 확정된 단어 누적 (여러 단어 간투사가 확정 경계에 걸치도록 직전 단어 몇 개를 문맥으로 붙임)
+    def _commit(self, words, tokens, starts, ends):
+        self.word_count += len(words)
+        self._recent_starts.extend(starts.tolist())
+        self._transcript.extend(words)
+
+        skip = len(self._context_tokens)
+        context_starts = [s for s, _ in self._context_times]
+        context_ends = [e for _, e in self._context_times]
+        occurrences = self.lexicon.detect_tokens(
+            list(self._context_tokens) + tokens,
+            np.concatenate((context_starts, starts)), np.concatenate((context_ends, ends)),
+            self.min_filler_duration, skip=skip,
+        )
+        for word, _, _ in occurrences:
+            self.filler_counts[word] += 1
+        self.filler_count += len(occurrences)
+        self._context_tokens.extend(tokens)
+        self._context_times.extend(zip(starts.tolist(), ends.tolist()))
+
+    # 최근 PITCH_WINDOW_SEC 동안의 pitch 중앙값 (말소리가 없으면 None)
+    def _recent_pitch(self):
+        from core.feature_engine import extract_features
+
+        with self._lock:
+            n = min(self._size, int(PITCH_WINDOW_SEC * self.sr))
+            if n == 0 or self._last_voice_end <= self.received - n:
+                return None
+            tail = self._buffer[self._size - n:self._size].copy()
+        features = extract_features(tail, self.sr, block_sec=None)
+        pitch = features.pitch[features.voiced & (features.pitch > 0)]
+        return float(np.median(pitch)) if len(pitch) > 0 else None
+
+    # 현재까지의 실시간 지표
+    def snapshot(self):
+        pitch = self._recent_pitch()
+        with self._lock:
+            time_sec = self.received / self.sr
+            stt_sec = self.committed / self.sr
+            while self._recent_starts and self._recent_starts[0] < stt_sec - RATE_WINDOW_SEC:
+                self._recent_starts.popleft()
+            window = min(RATE_WINDOW_SEC, stt_sec)
+            active_sec = (self._total_ms - self._silence_ms) / 1000
+
+            return {
+                "time": time_sec,
+                "stt_time": stt_sec,
+                "wpm": len(self._recent_starts) / window * 60 if window >= 1 else 0.0,
+                "avg_wpm": self.word_count / active_sec * 60 if active_sec > 0 else 0.0,
+                "word_count": self.word_count,
+                "filler_count": self.filler_count,
+                "fillers": dict(self.filler_counts.most_common()),
+                "pause_ratio": self._silence_ms / self._total_ms if self._total_ms else 0.0,
+                "pitch": pitch,
+                "transcript": " ".join(self._transcript),
+                "dropped_sec": self.dropped / self.sr,
+            }
@@ -1,17 +1,83 @@
-from pydub import AudioSegment, silence
+import numpy as np
 
-def calculate_pause_ratio(audio_path, silence_thresh=-40, min_silence_len=300):
+# 멈춤 길이 구간 (초) — 음성 분석 화면의 pauseData 막대 그래프 항목
+PAUSE_BINS = [
+    ("1초 미만", 0.0, 1.0),
+    ("1~2초", 1.0, 2.0),
+    ("2초 이상", 2.0, float("inf")),
+]
+
+# 한 번에 16bit 변환/제곱합을 계산하는 샘플 수 (긴 녹음에서도 임시 배열 크기를 제한)
+_BLOCK_SAMPLES = 1 << 20
+
+# 1ms 단위 16bit PCM 제곱합 (pydub가 ms 단위로 자르는 것과 같은 경계)
+def _ms_energy(samples, sr):
+    n = len(samples)
+    n_ms = int(round(n / sr * 1000))
+    bounds = np.minimum((np.arange(n_ms + 1) * sr) // 1000, n)
+
+    block_ms = max(1, _BLOCK_SAMPLES * 1000 // sr)
+    energy = np.zeros(n_ms, dtype=np.int64)
+    for start in range(0, n_ms, block_ms):
+        end = min(start + block_ms, n_ms)
+        pcm = (np.clip(samples[bounds[start]:bounds[end]], -1.0, 1.0) * 32767).astype(np.int16).astype(np.int64)
+        squares = np.concatenate(([0], np.cumsum(pcm * pcm)))
+        local = bounds[start:end + 1] - bounds[start]
+        energy[start:end] = squares[local[1:]] - squares[local[:-1]]
+    return energy, bounds
+
+# pydub.silence.detect_silence와 같은 무음 구간 [(start_ms, end_ms), ...]
+# (min_silence_len ms 창의 16bit RMS가 silence_thresh dBFS 이하인 창들을 이어 붙임)
+def detect_silence(clip, silence_thresh=-40, min_silence_len=300):
+    energy, bounds = _ms_energy(clip.samples, clip.sr)
+    n_ms = len(energy)
+    if n_ms < min_silence_len:
+        return []
+
+    cumulative = np.concatenate(([0], np.cumsum(energy)))
+    window_energy = cumulative[min_silence_len:] - cumulative[:-min_silence_len]
+    window_samples = bounds[min_silence_len:] - bounds[:-min_silence_len]
+
+    # audioop.rms와 같이 정수로 내림한 RMS를 full scale(32768) 기준 임계값과 비교
+    rms = np.floor(np.sqrt(window_energy / np.maximum(window_samples, 1)))
+    threshold = 10 ** (silence_thresh / 20) * 32768
+    silence_starts = np.flatnonzero(rms <= threshold)
+    if len(silence_starts) == 0:
+        return []
+
+    # 겹치거나 이어진 창은 하나의 무음 구간으로 합침
+    breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    range_starts = silence_starts[np.concatenate(([0], breaks + 1))]
+    range_ends = silence_starts[np.concatenate((breaks, [len(silence_starts) - 1]))] + min_silence_len
+    return list(zip(range_starts.tolist(), range_ends.tolist()))
+
+# 멈춤 길이(초) 목록을 PAUSE_BINS 구간별 개수로 변환 [{"length": ..., "freq": ...}]
+def pause_histogram(durations, bins=PAUSE_BINS):
+    durations = np.asarray(durations, dtype=float)
+    return [
+        {"length": label, "freq": int(np.count_nonzero((durations >= low) & (durations < high)))}
+        for label, low, high in bins
+    ]
+
+# 무음 비율 + 멈춤 구간 목록 + 길이별 히스토그램
+def analyze_pauses(clip, silence_thresh=-40, min_silence_len=300):
+    total_duration_ms = int(round(clip.duration * 1000))
+    silent_ranges = detect_silence(clip, silence_thresh, min_silence_len)
+
+    pauses = [
+        {"start": start / 1000, "end": end / 1000, "duration": (end - start) / 1000}
+        for start, end in silent_ranges
+    ]
+    total_silence_ms = sum(end - start for start, end in silent_ranges)
+    return {
+        "pause_ratio": total_silence_ms / total_duration_ms if total_duration_ms else 0.0,
+        "pauses": pauses,
+        "histogram": pause_histogram([pause["duration"] for pause in pauses]),
+    }
+
+def calculate_pause_ratio(clip, silence_thresh=-40, min_silence_len=300):
     try:
-        # 1. 전체 길이 계산
-        audio = AudioSegment.from_file(audio_path)
-        total_duration_ms = len(audio) # in milliseconds
-        # 2. 무음 구간 탐지
-        silent_ranges = silence.detect_silence(audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
-        # 3. 무음 구간 길이 합산
-        total_silence_ms = sum(end - start for start, end in silent_ranges)
-        # 4. 무음 비율 계산
-        pause_ratio = total_silence_ms / total_duration_ms
-        return pause_ratio
+        return analyze_pauses(clip, silence_thresh, min_silence_len)["pause_ratio"]
     except Exception as e:
         print(f"❌ 무음 구간 계산 중 오류 발생: {e}")
-        return 0.0
\ No newline at end of file
+        return 0.0
@@ -0,0 +1,81 @@
+import glob
+import hashlib
+import os
+import numpy as np
+from faster_whisper import decode_audio
+
+# 설정하면 AudioClip.from_file이 디코딩 결과를 이 디렉토리에 저장/재사용
+PCM_CACHE_DIR_ENV = "PITCHPAL_PCM_CACHE_DIR"
+
+def file_sha256(path, block_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+class PcmStore:
+    """디코딩된 16kHz float32 PCM을 원본 내용 해시 이름의 .npy로 보관하는 저장소
+
+    다시 열 때는 읽기 전용 memmap으로 열기 때문에 30분 녹음도 복사 없이 바로 사용할 수 있고,
+    같은 파일을 여는 여러 워커 프로세스가 OS 페이지 캐시를 공유한다.
+    max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제한다.
+    """
+
+    def __init__(self, root, max_bytes=4 * 1024 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, content_hash, sr):
+        return os.path.join(self.root, f"{content_hash}_{sr}.npy")
+
+    # (samples memmap, .npy 경로) 반환, 없으면 디코딩 후 저장
+    def load(self, audio_path, sr, content_hash=None):
+        content_hash = content_hash or file_sha256(audio_path)
+        path = self.path_for(content_hash, sr)
+
+        if not os.path.exists(path):
+            samples = decode_audio(audio_path, sampling_rate=sr).astype(np.float32, copy=False)
+            # 임시 파일에 쓴 뒤 교체 (동시에 같은 파일을 디코딩하는 워커가 있어도 안전)
+            tmp_path = path[:-len(".npy")] + f".{os.getpid()}.tmp.npy"
+            np.save(tmp_path, samples)
+            os.replace(tmp_path, path)
+            self._evict(keep=path)
+        else:
+            os.utime(path)  # LRU 순서 갱신
+
+        return np.load(path, mmap_mode="r"), path
+
+    def _evict(self, keep=None):
+        entries = []
+        for path in glob.glob(os.path.join(self.root, "*.npy")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)  # 이미 열린 memmap은 그대로 유효
+            except OSError:
+                pass
+            total -= size
+
+_default_store = None
+
+# PITCHPAL_PCM_CACHE_DIR 환경변수로 설정된 프로세스 기본 저장소
+def get_default_store():
+    global _default_store
+    root = os.getenv(PCM_CACHE_DIR_ENV)
+    if not root:
+        return None
+    if _default_store is None or _default_store.root != root:
+        _default_store = PcmStore(root)
+    return _default_store
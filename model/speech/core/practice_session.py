@@ -0,0 +1,153 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from utils.alignment import align_words
+from utils.text_utils import tokenize, preprocess_word_for_comparison
+
+# 문장 끝 판단: 단어가 문장부호(뒤에 따옴표/괄호 허용)로 끝나면 문장 종료
+SENTENCE_END = re.compile(r"[.!?…。][\"'”’)\]]*$")
+# 빈 줄로 구분된 문단을 하나의 섹션으로 취급
+SECTION_BREAK = re.compile(r"\n\s*\n")
+
+# 같은 대본을 다시 컴파일하지 않도록 내용 해시별로 보관하는 개수
+SCRIPT_CACHE_SIZE = 32
+
+class ReferenceScript:
+    """한 번 컴파일한 발표 대본
+
+    - words / cleaned: 원래 단어와 비교용으로 정제한 단어 (tokenize와 같은 분할)
+    - char_offsets: 정제된 글자 기준 단어 시작 위치 (마지막 원소는 전체 글자 수)
+    - word_sentence: 단어별 문장 번호, sentences: 문장 텍스트
+    - sentence_section: 문장별 섹션(문단) 번호
+    """
+
+    def __init__(self, text, content_hash, words, cleaned, word_sentence, sentences, sentence_section):
+        self.text = text
+        self.content_hash = content_hash
+        self.words = words
+        self.cleaned = cleaned
+        self.word_lengths = np.array([len(w) for w in cleaned], dtype=np.int32)
+        self.char_offsets = np.concatenate(([0], np.cumsum(self.word_lengths)))
+        self.word_sentence = np.asarray(word_sentence, dtype=np.int32)
+        self.sentences = sentences
+        self.sentence_section = np.asarray(sentence_section, dtype=np.int32)
+
+    @classmethod
+    def compile(cls, text, content_hash=None):
+        content_hash = content_hash or hashlib.sha256(text.encode("utf-8")).hexdigest()
+        words, word_sentence, sentences, sentence_section = [], [], [], []
+
+        for section, paragraph in enumerate(SECTION_BREAK.split(text)):
+            sentence_words = []
+            for word in paragraph.split():
+                words.append(word)
+                word_sentence.append(len(sentences))
+                sentence_words.append(word)
+                if SENTENCE_END.search(word):
+                    sentences.append(" ".join(sentence_words))
+                    sentence_section.append(section)
+                    sentence_words = []
+            if sentence_words:
+                sentences.append(" ".join(sentence_words))
+                sentence_section.append(section)
+
+        cleaned = [preprocess_word_for_comparison(w) for w in words]
+        return cls(text, content_hash, words, cleaned, word_sentence, sentences, sentence_section)
+
+    def __len__(self):
+        return len(self.words)
+
+    # 컴파일된 단어 목록에 STT 결과를 정렬 (대본은 다시 분할/정제하지 않음)
+    def align(self, stt_text, timeline=None):
+        if timeline is not None and len(timeline) > 0:
+            stt_words = list(timeline.words)
+            stt_cleaned = [preprocess_word_for_comparison(w) for w in stt_words]
+            return align_words(self.words, self.cleaned, stt_words, stt_cleaned, timeline.starts)
+        stt_words, stt_cleaned = tokenize(stt_text)
+        return align_words(self.words, self.cleaned, stt_words, stt_cleaned)
+
+    # 문장별 정확도 = 문장에서 STT와 일치한 대본 글자 비율 (글자가 없는 문장은 1.0)
+    def sentence_accuracy(self, alignment):
+        n = len(self.sentences)
+        matched = np.bincount(self.word_sentence, weights=alignment.ref_matched, minlength=n)
+        total = np.bincount(self.word_sentence, weights=self.word_lengths, minlength=n)
+        return np.divide(matched, total, out=np.ones(n), where=total > 0)
+
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+# 대본 텍스트를 컴파일 (같은 내용이면 캐시된 결과 재사용)
+def compile_script(text):
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _compiled_lock:
+        script = _compiled.get(content_hash)
+        if script is not None:
+            _compiled.move_to_end(content_hash)
+            return script
+
+    script = ReferenceScript.compile(text, content_hash)
+    with _compiled_lock:
+        _compiled[content_hash] = script
+        while len(_compiled) > SCRIPT_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return script
+
+class PracticeSession:
+    """같은 대본으로 여러 번 연습한 결과(take)를 모아 이전 take와 비교
+
+    각 take는 컴파일된 대본과의 정렬만 수행하고,
+    전체 정확도와 문장별 정확도의 변화(delta)를 함께 반환한다.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.takes = []
+        self._lock = threading.Lock()
+
+    # STT 결과로 새 take 채점
+    def add_take(self, stt_text, timeline=None):
+        alignment = self.script.align(stt_text, timeline)
+        return self.record_take(alignment.ratio, self.script.sentence_accuracy(alignment))
+
+    # 이미 채점된 take(워커에서 계산한 정확도) 기록
+    def record_take(self, accuracy, sentence_accuracy):
+        sentence_accuracy = np.asarray(sentence_accuracy, dtype=float)
+        with self._lock:
+            previous = self.takes[-1] if self.takes else None
+            self.takes.append({"accuracy": float(accuracy), "sentence_accuracy": sentence_accuracy})
+            take = len(self.takes)
+
+        if previous is not None:
+            sentence_delta = sentence_accuracy - previous["sentence_accuracy"]
+            accuracy_delta = float(accuracy) - previous["accuracy"]
+        else:
+            sentence_delta = np.zeros(len(sentence_accuracy))
+            accuracy_delta = None
+
+        return {
+            "take": take,
+            "accuracy": float(accuracy),
+            "accuracy_delta": accuracy_delta,
+            "sentences": [
+                {
+                    "index": i,
+                    "section": int(self.script.sentence_section[i]),
+                    "text": self.script.sentences[i],
+                    "accuracy": float(sentence_accuracy[i]),
+                    "delta": float(sentence_delta[i]) if previous is not None else None,
+                }
+                for i in range(len(sentence_accuracy))
+            ],
+            "improved": int(np.count_nonzero(sentence_delta > 0)),
+            "regressed": int(np.count_nonzero(sentence_delta < 0)),
+        }
+
+    def history(self):
+        with self._lock:
+            return [
+                {"take": i + 1, "accuracy": take["accuracy"]}
+                for i, take in enumerate(self.takes)
+            ]
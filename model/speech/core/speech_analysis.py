@@ -1,77 +1,147 @@
-import librosa
-import numpy as np
+from core.audio_clip import AudioClip
+from core.acoustic_fillers import detect_acoustic_fillers, merge_filler_detections
+from core.chunked_stt import LONG_AUDIO_MIN_SEC, transcribe_long_audio
+from core.feature_engine import extract_features
 from core.stt_pronunciation import transcribe_audio, export_differences_to_html
-from utils.text_utils import evaluate_pronunciation
-from core.filler_words import detect_filler_words_safe  # 변경된 통합 함수
-from core.pause_ratio_calculator import calculate_pause_ratio
+from core.practice_session import compile_script
+from core.stage_graph import StageGraph
+from core.filler_words import detect_filler_words_safe, filler_rates
+from core.pause_ratio_calculator import analyze_pauses
+from core.time_series import speed_series, pitch_volume_series, filler_events, pause_events
 
-# 음성 불러오기
+# 음성 불러오기 (16kHz mono로 한 번만 디코딩해서 모든 단계가 공유)
 def load_audio(audio_path):
     try:
-        return librosa.load(audio_path, sr=16000)
+        return AudioClip.from_file(audio_path)
     except Exception as e:
         print(f"❌ 음성 파일 로딩 실패: {e}")
-        return None, None
-
-# mfcc 추출
-def extract_mfcc(audio, sr):
-    mfccs = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=13)
-    mfccs_mean = np.mean(mfccs.T, axis=0)
-    mfccs_std = np.std(mfccs.T, axis=0)
-    return mfccs_mean, mfccs_std
-
-# pitch 추출
-def extract_pitch(audio, sr):
-    pitches, magnitudes = librosa.piptrack(y=audio, sr=sr)
-    pitch_values = pitches[magnitudes > np.median(magnitudes)]
-    if len(pitch_values) == 0:
-        return 0.0, 0.0
-    pitch_mean = np.mean(pitch_values)
-    pitch_std = np.std(pitch_values)
-    return pitch_mean, pitch_std
-
-# 침묵 제거 후 실제 발화 시간 기반 WPM 계산
-def estimate_wpm_precise(audio, sr, text):
-    non_silent_intervals = librosa.effects.split(audio, top_db=30)
-    active_speech_duration_sec = sum((end - start) for start, end in non_silent_intervals) / sr
+        return None
+
+# 침묵 제거 후 실제 발화 시간 기반 WPM 계산 (단어 수는 WordTimeline 기준)
+def estimate_wpm_precise(features, word_count):
+    active_speech_duration_sec = features.active_speech_sec()
     if active_speech_duration_sec == 0:
         return 0.0
-    word_count = len(text.split())
     wpm = (word_count / active_speech_duration_sec) * 60
     return wpm
 
-# 음성 전체 분석 및 STT 변환 실행
-def analyze_speech(audio_path, reference_text_path, model, target_wpm=140):
-    try:
-        with open(reference_text_path, 'r', encoding='utf-8') as f:
-            reference_text = f.read()
-    except Exception as e:
-        print(f"❌ 대본 로딩 실패: {e}")
+# STT 없이 신호만으로 계산하는 분석 (특징, 무음 구간, 소리 기반 간투사)
+def analyze_signal(clip):
+    features = extract_features(clip.samples, clip.sr)
+    return {
+        "features": features,
+        "pauses": analyze_pauses(clip),
+        "acoustic_fillers": detect_acoustic_fillers(features),
+    }
+
+# STT를 건너뛰는 빠른 미리보기: 무음 / 소리 기반 간투사 / pitch·음량만 계산
+def preview_speech(audio_path):
+    clip = load_audio(audio_path)
+    if clip is None:
         return
+    signal = analyze_signal(clip)
+    features, pauses, fillers = signal["features"], signal["pauses"], signal["acoustic_fillers"]
+    return {
+        "duration": clip.duration,
+        "pitch_mean": float(features.pitch_mean),
+        "pitch_std": float(features.pitch_std),
+        "pause_ratio": float(pauses["pause_ratio"]),
+        "pauses": pauses["pauses"],
+        "pause_histogram": pauses["histogram"],
+        "filler_count": len(fillers),
+        "filler_occurrences": fillers,
+        "filler_rate": filler_rates(fillers, clip.duration)["total"],
+        "series": {
+            "pitch_volume": pitch_volume_series(features),
+            "fillers": filler_events(fillers),
+            "pauses": pause_events(pauses["pauses"]),
+        },
+    }
 
-    # STT 수행
-    stt_text, segments = transcribe_audio(audio_path, model)
+# 음성 전체 분석 및 STT 변환 실행 (대본이 없으면 발음 평가는 건너뜀)
+# long_audio_options: LONG_AUDIO_MIN_SEC 이상 녹음에 쓸 청크 병렬 전사 설정
+#   예) {"model_size": "small", "compute_type": "int8", "workers": 8, "tier": "balanced"}
+# script: 미리 컴파일한 대본(core.practice_session.ReferenceScript), 넘기면 reference_text_path는 무시
+# tier: STT 디코딩 설정을 가져올 품질 단계 (core.stt_tiers, model도 같은 단계로 로드한 것을 넘김)
+def analyze_speech(audio_path, reference_text_path, model, target_wpm=140,
+                   output_html_path="model/speech/results/stt_results.html",
+                   long_audio_options=None, script=None, tier=None):
+    if script is None and reference_text_path is not None:
+        try:
+            with open(reference_text_path, 'r', encoding='utf-8') as f:
+                script = compile_script(f.read())
+        except Exception as e:
+            print(f"❌ 대본 로딩 실패: {e}")
+            return
 
-    audio, sr = load_audio(audio_path)
-    if audio is None:
+    clip = load_audio(audio_path)
+    if clip is None:
         return
 
-    # 음성 분석 수행
-    mfcc_mean, mfcc_std = extract_mfcc(audio, sr)
-    pitch_mean, pitch_std = extract_pitch(audio, sr)
-    precise_wpm = estimate_wpm_precise(audio, sr, stt_text)
+    # STT 수행 (디코딩된 배열을 그대로 전달, 긴 녹음은 무음 경계로 나눠 병렬 전사)
+    def transcribe():
+        if long_audio_options and clip.duration >= LONG_AUDIO_MIN_SEC:
+            return transcribe_long_audio(clip, **long_audio_options)
+        return transcribe_audio(clip.samples, model, tier)
+
+    # 단계 그래프: STT와 신호 처리(STFT 한 번으로 MFCC, pitch, 발화 구간 / 무음 구간)가 같은 버퍼로 동시에 실행되고,
+    # 전사 결과가 필요한 단계(간투사, 속도 시계열, 대본 정렬)는 STT가 끝나는 즉시 시작
+    graph = StageGraph()
+    graph.add("stt", transcribe)
+    graph.add("features", lambda: extract_features(clip.samples, clip.sr))
+    graph.add("pauses", lambda: analyze_pauses(clip))
+    graph.add("acoustic_fillers", detect_acoustic_fillers, "features")
+    graph.add("pitch_volume", pitch_volume_series, "features")
+    graph.add("lexical_fillers", lambda stt: detect_filler_words_safe(stt[1], stt[0])[1], "stt")
+    graph.add("speed", lambda stt: speed_series(stt[1], clip.duration), "stt")
+    if script is not None:
+        graph.add("alignment", lambda stt: script.align(*stt), "stt")
+    stages = graph.run()
 
-    # ✅ 간투사 감지 (보완 포함)
-    filler_count, filler_occurrences = detect_filler_words_safe(segments, stt_text)
+    stt_text, timeline = stages["stt"]
+    features, pauses = stages["features"], stages["pauses"]
+    mfcc_mean, mfcc_std = features.mfcc_stats()
+    pitch_mean, pitch_std = features.pitch_mean, features.pitch_std
+    word_count = len(timeline) if len(timeline) > 0 else len(stt_text.split())
+    precise_wpm = estimate_wpm_precise(features, word_count)
 
-    # 무음 비율 계산
-    pause_ratio = calculate_pause_ratio(audio_path)
+    # ✅ 간투사 감지 (보완 포함) + STT가 빠뜨린 소리 기반 간투사 합치기
+    # filler_occurrences는 항상 (간투사, 시작 초, 끝 초)
+    # 타임라인이 없으면 텍스트 기반 감지 결과는 글자 위치이므로 text_filler_occurrences에 따로 둠
+    lexical_fillers, acoustic_fillers = stages["lexical_fillers"], stages["acoustic_fillers"]
+    if len(timeline) > 0:
+        filler_occurrences = merge_filler_detections(lexical_fillers, acoustic_fillers, timeline)
+        text_filler_occurrences = []
+    else:
+        filler_occurrences = acoustic_fillers
+        text_filler_occurrences = lexical_fillers
+    filler_count = len(filler_occurrences) + len(text_filler_occurrences)
 
-    # 발음 유사도
-    pronunciation_accuracy = evaluate_pronunciation(reference_text, stt_text)
+    # 무음 비율 + 단어 사이 평균 공백(0.3초 이상)
+    pause_ratio = pauses["pause_ratio"]
+    word_gaps = timeline.gaps(min_gap=0.3)
+    pause_avg = float(word_gaps.mean()) if len(word_gaps) > 0 else 0.0
+
+    # 대시보드용 시계열 (서버에서 LTTB로 점 개수를 줄여 전송)
+    series = {
+        "speed": stages["speed"],
+        "pitch_volume": stages["pitch_volume"],
+        "fillers": filler_events(filler_occurrences),
+        "pauses": pause_events(pauses["pauses"]),
+    }
+
+    # 발음 유사도 (대본-STT 정렬은 한 번만 수행하고 점수와 HTML 비교에 함께 사용)
+    pronunciation_accuracy = None
+    sentence_accuracy = None
+    alignment = None
+    if script is not None:
+        alignment = stages["alignment"]
+        pronunciation_accuracy = alignment.ratio
+        sentence_accuracy = script.sentence_accuracy(alignment).tolist()
 
     # 분석 결과 출력
-    print(f"\n✅ 발음 유사도 점수: {pronunciation_accuracy * 100:.2f}%")
+    if pronunciation_accuracy is not None:
+        print(f"\n✅ 발음 유사도 점수: {pronunciation_accuracy * 100:.2f}%")
     print(f"✅ MFCC 평균: {mfcc_mean}")
     print(f"✅ MFCC 표준편차: {mfcc_std}")
     print(f"✅ Pitch 평균: {pitch_mean:.2f} Hz")
@@ -79,18 +149,48 @@ def analyze_speech(audio_path, reference_text_path, model, target_wpm=140):
     print(f"✅ Words Per Minute(WPM): {precise_wpm:.2f}")
     print(f"✅ 무음 구간 비율: {pause_ratio:.2f}")
     print(f"✅ 간투사 수: {filler_count}회")
-    if filler_count > 0:
+    if filler_occurrences:
         print(f"✅ 감지된 간투사: {filler_occurrences}")
+    if text_filler_occurrences:
+        print(f"✅ 텍스트에서 감지된 간투사 (글자 위치): {text_filler_occurrences}")
+    stage_timings = graph.timing_report()
+    print("⏱ 단계별 시간: " + ", ".join(f"{t['stage']} {t['start']:.2f}~{t['end']:.2f}초" for t in stage_timings))
+    print("⏱ critical path: " + " → ".join(graph.critical_path()))
 
     # STT 비교 결과 저장
-    output_html_path = "model/speech/results/stt_results.html"
-    export_differences_to_html(reference_text, stt_text, output_html_path)
+    if script is not None and output_html_path:
+        export_differences_to_html(script.text, stt_text, output_html_path, timeline, alignment)
 
     # 평가 출력
-    print("\n[발표 평가]")
-    if pronunciation_accuracy > 0.8 and pitch_mean > 70 and precise_wpm > 100 and filler_count < 5:
-        print("✅ 발음, 억양, 속도 모두 잘 조화되어 있습니다! 발표가 자연스럽습니다.")
-    elif pronunciation_accuracy > 0.6:
-        print("🔶 발음은 괜찮습니다. 억양 또는 추임새, 속도에 조금 더 주의해주세요.")
+    accuracy = pronunciation_accuracy if pronunciation_accuracy is not None else 0.0
+    if accuracy > 0.8 and pitch_mean > 70 and precise_wpm > 100 and filler_count < 5:
+        feedback = "✅ 발음, 억양, 속도 모두 잘 조화되어 있습니다! 발표가 자연스럽습니다."
+    elif accuracy > 0.6:
+        feedback = "🔶 발음은 괜찮습니다. 억양 또는 추임새, 속도에 조금 더 주의해주세요."
     else:
-        print("❌ 발음과 억양, 속도 전반에 개선이 필요합니다. 꾸준한 연습이 도움이 됩니다.")
+        feedback = "❌ 발음과 억양, 속도 전반에 개선이 필요합니다. 꾸준한 연습이 도움이 됩니다."
+    print("\n[발표 평가]")
+    print(feedback)
+
+    # API(backend)에서 사용할 분석 결과 반환
+    return {
+        "stt_text": stt_text,
+        "pronunciation_accuracy": pronunciation_accuracy,
+        "sentence_accuracy": sentence_accuracy,
+        "mfcc_mean": mfcc_mean.tolist(),
+        "mfcc_std": mfcc_std.tolist(),
+        "pitch_mean": float(pitch_mean),
+        "pitch_std": float(pitch_std),
+        "precise_wpm": float(precise_wpm),
+        "pause_ratio": float(pause_ratio),
+        "pause_avg": pause_avg,
+        "pauses": pauses["pauses"],
+        "pause_histogram": pauses["histogram"],
+        "series": series,
+        "filler_count": filler_count,
+        "filler_occurrences": filler_occurrences,
+        "text_filler_occurrences": text_filler_occurrences,
+        "filler_rate": filler_rates(filler_occurrences + text_filler_occurrences, clip.duration)["total"],
+        "feedback": feedback,
+        "stage_timings": stage_timings,
+    }
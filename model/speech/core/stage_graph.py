@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+class StageGraph:
+    """분석 작업 하나를 이루는 단계(stage)들의 의존 그래프를 스레드 풀에서 실행
+
+    - add(name, fn, *deps): fn은 의존 단계들의 결과를 순서대로 인자로 받음
+    - 의존 단계가 모두 끝난 단계는 바로 실행되므로 STT와 신호 처리(STFT 등)가 동시에 진행되고,
+      전사 결과가 필요한 단계는 STT가 끝나는 즉시 시작된다.
+      (CTranslate2 / numpy 연산은 GIL을 놓으므로 스레드로도 병렬 실행됨)
+    - timings: 단계별 (시작, 종료) 시각 (run 시작 기준 초), critical_path()로 가장 긴 의존 경로 확인
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.timings = {}
+
+    def add(self, name, fn, *deps):
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"{name} 단계보다 먼저 추가해야 하는 단계: {', '.join(missing)}")
+        self.stages[name] = (fn, deps)
+
+    def _timed(self, name, fn, args, origin):
+        start = time.perf_counter() - origin
+        try:
+            return fn(*args)
+        finally:
+            self.timings[name] = (start, time.perf_counter() - origin)
+
+    # 모든 단계를 실행하고 {단계 이름: 결과} 반환 (한 단계라도 실패하면 남은 단계는 취소하고 예외 전달)
+    def run(self, max_workers=3):
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+        origin = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for name, (fn, deps) in list(pending.items()):
+                    if all(dep in results for dep in deps):
+                        args = [results[dep] for dep in deps]
+                        running[executor.submit(self._timed, name, fn, args, origin)] = name
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+        return results
+
+    # 종료 시각이 가장 늦은 단계에서 거꾸로, 가장 늦게 끝난 의존 단계를 따라간 경로
+    def critical_path(self):
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda stage: self.timings[stage][1])
+        path = [name]
+        while True:
+            deps = [dep for dep in self.stages[name][1] if dep in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda stage: self.timings[stage][1])
+            path.append(name)
+        return path[::-1]
+
+    # [{"stage", "start", "end"}, ...] (시작 순)
+    def timing_report(self):
+        return [
+            {"stage": name, "start": round(start, 3), "end": round(end, 3)}
+            for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0])
+        ]
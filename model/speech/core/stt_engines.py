@@ -0,0 +1,105 @@
+import time
+from abc import ABC, abstractmethod
+
+from core.chunked_stt import Segment, Word
+
+class SttEngine(ABC):
+    """STT 엔진 공통 인터페이스
+
+    transcribe(audio, **options)는 faster_whisper WhisperModel.transcribe와 같은 형태
+    (segments, info)를 반환한다. segment.text / segment.words(word, start, end, probability)가
+    같으므로 어느 엔진이든 transcribe_audio / analyze_speech에 모델 대신 넘기면 같은 WordTimeline을 얻는다.
+
+    - size / compute_type: 모델 크기와 연산 정밀도 (엔진마다 지원하는 값은 compute_types)
+    - load_time: 모델 로드에 걸린 시간 (초)
+    - 하위 클래스는 _load(모델 로드)와 transcribe를 구현해야 함
+    """
+
+    name = None
+    compute_types = ()
+
+    def __init__(self, size, compute_type=None, device="cpu", cpu_threads=0):
+        self.size = size
+        self.compute_type = compute_type or self.compute_types[0]
+        if self.compute_type not in self.compute_types:
+            raise ValueError(f"{self.name}는 {self.compute_type} 연산을 지원하지 않습니다 "
+                             f"(사용 가능: {', '.join(self.compute_types)})")
+        self.device = device
+        self.cpu_threads = cpu_threads
+
+        start = time.time()
+        self.model = self._load()
+        self.load_time = time.time() - start
+
+    @abstractmethod
+    def _load(self):
+        ...
+
+    @abstractmethod
+    def transcribe(self, audio, **options):
+        ...
+
+    # (STT 텍스트, WordTimeline) — tier: 디코딩 설정을 가져올 품질 단계 (core.stt_tiers)
+    def transcribe_timeline(self, audio, tier=None):
+        from core.stt_pronunciation import transcribe_audio
+        return transcribe_audio(audio, self, tier)
+
+class FasterWhisperEngine(SttEngine):
+    """faster-whisper (CTranslate2), 결과를 그대로 반환"""
+
+    name = "faster-whisper"
+    compute_types = ("int8", "int8_float32", "float32", "float16")
+
+    def _load(self):
+        from core.stt_pronunciation import load_whisper_model
+        return load_whisper_model(self.size, device=self.device, compute_type=self.compute_type,
+                                  cpu_threads=self.cpu_threads)
+
+    def transcribe(self, audio, **options):
+        return self.model.transcribe(audio, **options)
+
+class OpenAIWhisperEngine(SttEngine):
+    """openai-whisper (PyTorch), 결과 dict를 faster-whisper와 같은 Segment / Word로 변환
+
+    vad_filter는 지원하지 않으므로 무시하고, float16은 GPU에서만 사용한다.
+    """
+
+    name = "openai-whisper"
+    compute_types = ("float32", "float16")
+
+    def _load(self):
+        import torch
+        import whisper
+        if self.cpu_threads:
+            torch.set_num_threads(self.cpu_threads)
+        return whisper.load_model(self.size, device=self.device)
+
+    def transcribe(self, audio, language=None, beam_size=None, word_timestamps=True, vad_filter=False,
+                   condition_on_previous_text=True, initial_prompt=None):
+        if isinstance(audio, str):
+            from core.audio_clip import AudioClip
+            audio = AudioClip.from_file(audio).samples
+
+        # openai-whisper는 beam_size를 넘기면 빔 서치, 넘기지 않으면 greedy 디코딩
+        decode_options = {"beam_size": beam_size} if beam_size and beam_size > 1 else {}
+        result = self.model.transcribe(
+            audio, language=language, word_timestamps=word_timestamps,
+            condition_on_previous_text=condition_on_previous_text, initial_prompt=initial_prompt,
+            fp16=self.compute_type == "float16", **decode_options,
+        )
+        segments = [
+            Segment(segment["start"], segment["end"], segment["text"], [
+                Word(word["word"], word["start"], word["end"], word["probability"])
+                for word in segment.get("words", [])
+            ])
+            for segment in result["segments"]
+        ]
+        return iter(segments), None
+
+STT_ENGINES = {engine.name: engine for engine in (FasterWhisperEngine, OpenAIWhisperEngine)}
+
+# 이름으로 엔진 생성 (모델 로드 포함)
+def create_engine(name, size, compute_type=None, device="cpu", cpu_threads=0):
+    if name not in STT_ENGINES:
+        raise ValueError(f"알 수 없는 STT 엔진입니다: {name} (사용 가능: {', '.join(STT_ENGINES)})")
+    return STT_ENGINES[name](size, compute_type, device, cpu_threads)
@@ -1,9 +1,17 @@
+import math
 from faster_whisper import WhisperModel
-from utils.text_utils import tokenize, get_diff_indices
+from core.stt_tiers import get_tier, transcribe_options
+from core.word_timeline import WordTimeline
+from utils.alignment import align_texts
 
-# whisper 모델 로드
-def load_whisper_model(size="medium", device="cpu", compute_type="int8"):
-    return WhisperModel(size, device=device, compute_type=compute_type)
+# whisper 모델 로드 (cpu_threads=0이면 CTranslate2 기본값 사용)
+# size / compute_type을 생략하면 tier 품질 단계(core.stt_tiers, None이면 기본 단계)의 값을 사용
+def load_whisper_model(size=None, device="cpu", compute_type=None, cpu_threads=0, tier=None):
+    if size is None or compute_type is None:
+        config = get_tier(tier)
+        size = size or config["model_size"]
+        compute_type = compute_type or config["compute_type"]
+    return WhisperModel(size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
 
 """# Word-level 정보 출력 함수(확인용)
 def print_word_level_output(audio_path, model):
@@ -19,37 +27,38 @@ def print_word_level_output(audio_path, model):
             print(f"  - {word_info.word.strip()} ({word_info.start:.2f}s ~ {word_info.end:.2f}s)")
         print()"""
 
-# STT 변환 수행 후 간투사 감지 함수 호출
-def transcribe_audio(audio_path, model):
+# STT 변환 수행 후 단어 타임라인 생성 (segment generator는 여기서 한 번만 소비)
+# audio: 파일 경로 또는 16kHz mono float32 배열(AudioClip.samples)
+# tier: 디코딩 설정(빔 크기, VAD, 언어 고정)을 가져올 품질 단계 (None이면 기본 단계)
+def transcribe_audio(audio, model, tier=None):
     try:
-        segments, _ = model.transcribe(audio_path, word_timestamps=True)
-        stt_text = " ".join([seg.text.strip() for seg in segments])
-        return stt_text, segments
+        segments, _ = model.transcribe(audio, **transcribe_options(tier))
+        timeline = WordTimeline.from_segments(segments)
+        return timeline.text, timeline
     except Exception as e:
         print(f"❌ STT 변환 실패: {e}")
-        return "", []
+        return "", WordTimeline.empty()
 
 # HTML로 차이 강조 결과 저장
-def export_differences_to_html(reference_text, stt_text, output_path):
-    ref_words, ref_cleaned = tokenize(reference_text)
-    stt_words, stt_cleaned = tokenize(stt_text)
-    ref_diff_indices, stt_diff_indices = get_diff_indices(reference_text, stt_text)
+# alignment(utils.alignment.Alignment)를 넘기면 다시 정렬하지 않고 그 결과로 그림
+# 틀린 단어에는 발화 시각(title)을 표시 (대본 단어는 대응하는 STT 단어 시각)
+def export_differences_to_html(reference_text, stt_text, output_path, timeline=None, alignment=None):
+    if alignment is None:
+        alignment = align_texts(reference_text, stt_text, timeline)
 
-    def mark_diffs_html(words, cleaned_words, diff_indices):
+    def mark_diffs_html(words, mismatch, starts=None):
         result = []
-        idx_counter = 0
-        for word, cleaned in zip(words, cleaned_words):
-            word_len = len(cleaned)
-            word_indices = set(range(idx_counter, idx_counter + word_len))
-            if word_indices & diff_indices:
-                result.append(f'<span style="color:red; font-weight:bold;">{word}</span>')
+        for i, word in enumerate(words):
+            if mismatch[i]:
+                title = f' title="{starts[i]:.2f}s"' if starts is not None and not math.isnan(starts[i]) else ""
+                result.append(f'<span style="color:red; font-weight:bold;"{title}>{word}</span>')
             else:
                 result.append(word)
-            idx_counter += word_len
         return result
 
-    ref_highlighted = mark_diffs_html(ref_words, ref_cleaned, ref_diff_indices)
-    stt_highlighted = mark_diffs_html(stt_words, stt_cleaned, stt_diff_indices)
+    ref_starts = alignment.ref_starts if alignment.stt_starts is not None else None
+    ref_highlighted = mark_diffs_html(alignment.ref_words, alignment.ref_mismatch, ref_starts)
+    stt_highlighted = mark_diffs_html(alignment.stt_words, alignment.stt_mismatch, alignment.stt_starts)
 
     html_content = f"""
     <html>
@@ -0,0 +1,50 @@
+# STT 품질 단계: Whisper 모델 크기 / 연산 정밀도 / 디코딩 설정 묶음
+# - fast: 대화형 사용 (실시간 코칭 등), 작은 모델 + greedy 디코딩 + VAD로 무음 구간 건너뜀, 언어 "ko" 고정
+# - balanced: 기본값, 기존 서버 기본 경로와 같은 설정
+#   (small/int8, faster-whisper 기본 디코딩: 빔 서치 5, VAD 없음, 언어 자동 감지)
+# - accurate: 야간 일괄 분석, 큰 모델 + float32 + 빔 서치 5, 짧은 간투사를 놓치지 않도록 VAD 없이 전체 구간 디코딩
+# fast / accurate는 요청에서 tier를 지정할 때만 사용
+# 단계별 실시간 배율(RTF)과 글자 오류율(CER)은 `python model/speech/bench_stt_tiers.py`로 data/ 녹음에서 측정
+# (측정 표가 기본값 변경을 뒷받침하기 전까지 기본 단계의 디코딩 설정은 바꾸지 않음)
+STT_TIERS = {
+    "fast": {
+        "model_size": "base",
+        "compute_type": "int8",
+        "beam_size": 1,
+        "vad_filter": True,
+        "language": "ko",
+        "word_timestamps": True,
+    },
+    "balanced": {
+        "model_size": "small",
+        "compute_type": "int8",
+        "beam_size": 5,
+        "vad_filter": False,
+        "language": None,
+        "word_timestamps": True,
+    },
+    "accurate": {
+        "model_size": "medium",
+        "compute_type": "float32",
+        "beam_size": 5,
+        "vad_filter": False,
+        "language": "ko",
+        "word_timestamps": True,
+    },
+}
+
+DEFAULT_STT_TIER = "balanced"
+
+# WhisperModel.transcribe에 넘기는 디코딩 설정 키
+_TRANSCRIBE_KEYS = ("beam_size", "vad_filter", "language", "word_timestamps")
+
+def get_tier(tier=None):
+    tier = tier or DEFAULT_STT_TIER
+    if tier not in STT_TIERS:
+        raise ValueError(f"알 수 없는 STT 품질 단계입니다: {tier} (사용 가능: {', '.join(STT_TIERS)})")
+    return STT_TIERS[tier]
+
+# model.transcribe(audio, **transcribe_options(tier)) 형태로 사용
+def transcribe_options(tier=None):
+    config = get_tier(tier)
+    return {key: config[key] for key in _TRANSCRIBE_KEYS}
@@ -0,0 +1,74 @@
+import numpy as np
+
+# 그래프 하나당 프론트엔드로 보내는 최대 점 개수
+SERIES_POINTS = 200
+
+# Largest-Triangle-Three-Buckets: 모양(극값)을 보존하면서 n_out개 점의 인덱스를 고름
+def lttb(x, y, n_out=SERIES_POINTS):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        # 이전 선택점 a, 다음 버킷 평균점과 만드는 삼각형 넓이가 가장 큰 점 선택
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+# 단어 시작 시각으로 계산한 구간 이동 WPM [(time, wpm), ...] (window_sec 창을 step_sec 간격으로 이동)
+def sliding_wpm(timeline, duration, window_sec=10.0, step_sec=1.0):
+    if duration <= 0:
+        return np.zeros(0), np.zeros(0)
+    window_sec = min(window_sec, duration)
+    times = np.arange(window_sec, duration + step_sec / 2, step_sec)
+    starts = np.sort(timeline.starts)
+    counts = np.searchsorted(starts, times, side="right") - np.searchsorted(starts, times - window_sec, side="right")
+    return times, counts * (60.0 / window_sec)
+
+def speed_series(timeline, duration, n_out=SERIES_POINTS):
+    times, wpm = sliding_wpm(timeline, duration)
+    idx = lttb(times, wpm, n_out)
+    return [{"time": round(float(times[i]), 1), "speed": round(float(wpm[i]), 1)} for i in idx]
+
+# 프레임 단위 pitch / 음량(dB, 최대 음량 기준) 곡선
+# 음량과 (발화 프레임의) pitch를 각각 LTTB로 줄인 뒤 선택된 프레임을 합쳐 같은 x축에 표시
+def pitch_volume_series(features, n_out=SERIES_POINTS):
+    if len(features) == 0:
+        return []
+    times = features.times
+    volume = 20 * np.log10(np.maximum(features.rms, 1e-10) / max(float(features.rms.max()), 1e-10))
+    voiced = np.flatnonzero(features.voiced & (features.pitch > 0))
+
+    volume_idx = lttb(times, volume, n_out // 2)
+    pitch_idx = voiced[lttb(times[voiced], features.pitch[voiced], n_out // 2)] if len(voiced) else voiced
+    idx = np.union1d(volume_idx, pitch_idx)
+
+    has_pitch = np.zeros(len(times), dtype=bool)
+    has_pitch[voiced] = True
+    return [
+        {
+            "x": round(float(times[i]), 1),
+            "pitch": round(float(features.pitch[i]), 1) if has_pitch[i] else None,
+            "volume": round(float(volume[i]), 1),
+        }
+        for i in idx
+    ]
+
+def filler_events(filler_occurrences):
+    return [{"time": round(start, 2), "word": word} for word, start, _ in filler_occurrences]
+
+def pause_events(pauses):
+    return [{"time": round(p["start"], 2), "duration": round(p["duration"], 2)} for p in pauses]
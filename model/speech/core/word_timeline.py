@@ -0,0 +1,81 @@
+import sys
+import numpy as np
+from core.filler_words import preprocess_word_for_comparison
+
+class WordTimeline:
+    """Whisper 단어 타임스탬프를 struct-of-arrays 형태로 보관
+
+    - words: 화면 표시용 원래 단어 (공백 제거)
+    - vocab / token_ids: 정제된 단어를 한 번만 저장(intern)하고 단어마다 id만 보관
+    - starts / ends / probabilities: float32 배열
+
+    간투사 감지, WPM, 공백(pause) 분석, HTML 비교가 모두 이 배열을
+    벡터 마스크와 이진 탐색(searchsorted)으로 조회한다.
+    """
+
+    def __init__(self, words, token_ids, vocab, starts, ends, probabilities, text=""):
+        self.words = words
+        self.token_ids = np.asarray(token_ids, dtype=np.int32)
+        self.vocab = vocab
+        self.starts = np.asarray(starts, dtype=np.float32)
+        self.ends = np.asarray(ends, dtype=np.float32)
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+        self.text = text
+        self._vocab_index = {token: i for i, token in enumerate(vocab)}
+
+    # faster_whisper segment generator를 한 번만 순회하며 텍스트와 단어 배열을 함께 생성
+    @classmethod
+    def from_segments(cls, segments):
+        words, token_ids, vocab, vocab_index = [], [], [], {}
+        starts, ends, probabilities = [], [], []
+        texts = []
+
+        for segment in segments:
+            texts.append(segment.text.strip())
+            for word_info in segment.words or []:
+                token = sys.intern(preprocess_word_for_comparison(word_info.word))
+                token_id = vocab_index.get(token)
+                if token_id is None:
+                    token_id = vocab_index[token] = len(vocab)
+                    vocab.append(token)
+                words.append(word_info.word.strip())
+                token_ids.append(token_id)
+                starts.append(word_info.start)
+                ends.append(word_info.end)
+                probabilities.append(word_info.probability)
+
+        return cls(words, token_ids, vocab, starts, ends, probabilities, " ".join(texts))
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], [], [], "")
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def durations(self):
+        return self.ends - self.starts
+
+    # 정제된 단어 목록(tokens)에 해당하는 단어 위치 마스크
+    def token_mask(self, tokens):
+        ids = [self._vocab_index[t] for t in tokens if t in self._vocab_index]
+        if not ids:
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.token_ids, ids)
+
+    # 단어별 정제된 글자 수
+    def token_lengths(self):
+        vocab_lengths = np.array([len(t) for t in self.vocab], dtype=np.int32)
+        return vocab_lengths[self.token_ids] if len(self) else np.zeros(0, dtype=np.int32)
+
+    # 단어 사이 공백(초) 중 min_gap 이상인 것들
+    def gaps(self, min_gap=0.0):
+        if len(self) < 2:
+            return np.zeros(0, dtype=np.float32)
+        gaps = self.starts[1:] - self.ends[:-1]
+        return gaps[gaps >= min_gap]
+
+    # 시각 t(초)에 말하고 있던(또는 직전) 단어의 index
+    def index_at(self, t):
+        return int(np.searchsorted(self.starts, t, side="right")) - 1
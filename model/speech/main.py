@@ -9,9 +9,10 @@ if __name__ == "__main__":
     audio_path = "data/test1.m4a"
     script_path = "data/test1.txt"
 
-    model = load_whisper_model("small") 
+    tier = "balanced"
+    model = load_whisper_model(tier=tier)
 
-    analyze_speech(audio_path, script_path, model)
+    analyze_speech(audio_path, script_path, model, tier=tier)
 
     total_end = time.time()  # ⏱ 전체 종료 시간 기록
     print(f"\n⏱ 총 실행 시간        : {total_end - total_start:.2f}초")
\ No newline at end of file
@@ -1,8 +1,10 @@
+import sys
 from total_temp import SpeechAnalyzer
 
+# 실행: python main_temp.py [지표 ...]  (예: wpm fillers → STT만 하고 신호 처리는 건너뜀)
 if __name__ == "__main__":
-    analyzer = SpeechAnalyzer("data/test1.m4a", "data/test1.txt", model_size="medium")
-    results = analyzer.summarize()
+    analyzer = SpeechAnalyzer("data/test1.m4a", "data/test1.txt", tier="accurate")
+    results = analyzer.summarize(sys.argv[1:] or None)
 
     for k, v in results.items():
         print(f"{k}: {v}")
@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+# core.* / utils.* 를 model/speech 기준으로 import (스크립트 실행 방식과 같게)
+SPEECH_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(SPEECH_DIR)), "data")
+if SPEECH_DIR not in sys.path:
+    sys.path.insert(0, SPEECH_DIR)
+
+# data/ 아래 녹음 경로 (파일이 없으면 테스트 건너뜀)
+@pytest.fixture
+def data_file():
+    def resolve(name):
+        path = os.path.join(DATA_DIR, name)
+        if not os.path.exists(path):
+            pytest.skip(f"녹음 파일 없음: {path}")
+        return path
+    return resolve
@@ -0,0 +1,57 @@
+import random
+import pytest
+from utils.alignment import diff_runs
+
+# 동적 계획법으로 구한 최장 공통 부분열 길이
+def lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+def assert_valid_runs(a, b, runs):
+    end_a = end_b = 0
+    for i, j, length in runs:
+        assert length > 0
+        # 순서대로, 서로 겹치지 않음
+        assert i >= end_a and j >= end_b
+        assert a[i:i + length] == b[j:j + length]
+        end_a, end_b = i + length, j + length
+    assert end_a <= len(a) and end_b <= len(b)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_diff_runs_is_a_longest_common_subsequence(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        alphabet = "abcd"[:rng.randint(1, 4)]
+        a = [rng.choice(alphabet) for _ in range(rng.randint(0, 12))]
+        b = [rng.choice(alphabet) for _ in range(rng.randint(0, 12))]
+
+        runs = diff_runs(a, b)
+
+        assert_valid_runs(a, b, runs)
+        assert sum(length for _, _, length in runs) == lcs_length(a, b)
+
+# 대본 / STT처럼 대부분 같고 일부만 다른 긴 단어열
+def test_diff_runs_on_mostly_equal_sequences():
+    rng = random.Random(0)
+    words = [f"w{k}" for k in range(30)]
+    for _ in range(50):
+        a = [rng.choice(words) for _ in range(rng.randint(50, 300))]
+        b = [w for w in a if rng.random() > 0.05]
+        for _ in range(rng.randint(0, 10)):
+            b.insert(rng.randint(0, len(b)), rng.choice(words))
+
+        runs = diff_runs(a, b)
+
+        assert_valid_runs(a, b, runs)
+        assert sum(length for _, _, length in runs) == lcs_length(a, b)
+
+def test_diff_runs_edge_cases():
+    assert diff_runs([], []) == []
+    assert diff_runs(["a"], []) == []
+    assert diff_runs(list("abc"), list("abc")) == [(0, 0, 3)]
+    assert diff_runs(list("abc"), list("xyz")) == []
@@ -0,0 +1,26 @@
+import librosa
+import numpy as np
+import pytest
+from core.audio_clip import AudioClip
+from core.feature_engine import extract_features
+
+# 발화 구간은 실제 녹음에서 librosa.effects.split(top_db=30)과 같아야 함 (WPM 계산에 사용)
+@pytest.mark.parametrize("name", ["test1.m4a", "pitch1.m4a"])
+def test_nonsilent_intervals_match_effects_split(data_file, name):
+    clip = AudioClip.from_file(data_file(name))
+
+    features = extract_features(clip.samples, clip.sr, top_db=30)
+    expected = librosa.effects.split(clip.samples, top_db=30)
+
+    np.testing.assert_array_equal(features.nonsilent_intervals(), expected)
+    assert features.active_speech_sec() == pytest.approx((expected[:, 1] - expected[:, 0]).sum() / clip.sr)
+
+# 청크 단위 STFT여도 한 번에 계산한 결과와 같음
+def test_block_mode_matches_single_block(data_file):
+    clip = AudioClip.from_file(data_file("test1.m4a"))
+
+    blocked = extract_features(clip.samples, clip.sr, block_sec=7)
+    whole = extract_features(clip.samples, clip.sr, block_sec=None)
+
+    np.testing.assert_array_equal(blocked.voiced, whole.voiced)
+    np.testing.assert_allclose(blocked.rms, whole.rms, rtol=1e-5, atol=1e-7)
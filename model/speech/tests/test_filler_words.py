@@ -0,0 +1,64 @@
+import random
+import pytest
+from core.filler_words import DISCOURSE_MARKERS, FILLER_WORDS, FillerLexicon
+
+# 비교 기준: 앞에서부터 각 위치에서 인정되는 가장 긴 간투사를 고르고 그 뒤로 건너뜀
+def brute_force_match(lexicon, tokens, accept=None):
+    phrases = [phrase.split() for phrase in lexicon.phrases]
+    matches = []
+    start = 0
+    while start < len(tokens):
+        best = None
+        for index, phrase in enumerate(phrases):
+            end = start + len(phrase)
+            if tokens[start:end] != phrase:
+                continue
+            if accept is not None and not accept(start, end, index):
+                continue
+            if best is None or end > best[1]:
+                best = (start, end, index)
+        if best is None:
+            start += 1
+        else:
+            matches.append(best)
+            start = best[1]
+    return matches
+
+# 긴 간투사가 앞서 찾은 여러 후보를 덮으면 모두 대체 (중복 집계 없음)
+def test_longer_phrase_replaces_every_covered_match():
+    lexicon = FillerLexicon(["음", "어", "아 음 어 그"])
+
+    assert lexicon.match(["아", "음", "어", "그"]) == [(0, 4, 2)]
+    assert [word for word, _, _ in lexicon.detect_text("아 음 어 그")] == ["아 음 어 그"]
+
+# 앞 후보와 겹치는 긴 간투사 대신 겹치지 않는 짧은 간투사를 찾음
+def test_overlapping_longer_phrase_keeps_shorter_one():
+    lexicon = FillerLexicon(["a b", "c", "b c d", "d"])
+
+    assert lexicon.match("a b c d".split()) == brute_force_match(lexicon, "a b c d".split())
+    assert lexicon.match("a b c d".split()) == [(0, 2, 0), (2, 3, 1), (3, 4, 3)]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_match_equals_brute_force_leftmost_longest(seed):
+    rng = random.Random(seed)
+    alphabet = ["음", "어", "그", "아", "저"]
+    for _ in range(400):
+        fillers = [" ".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        lexicon = FillerLexicon(fillers)
+        tokens = rng.choices(alphabet, k=rng.randint(0, 20))
+        rejected = {i for i in range(len(tokens)) if rng.random() < 0.2}
+
+        # 길이 조건처럼 일부 후보를 거르는 경우도 확인
+        def accept(start, end, phrase):
+            return not (lexicon.lengths[phrase] == 1 and start in rejected)
+
+        assert lexicon.match(tokens) == brute_force_match(lexicon, tokens)
+        assert lexicon.match(tokens, accept) == brute_force_match(lexicon, tokens, accept)
+
+def test_shipped_lists_match_brute_force():
+    lexicon = FillerLexicon(FILLER_WORDS + DISCOURSE_MARKERS)
+    words = FILLER_WORDS + [token for marker in DISCOURSE_MARKERS for token in marker.split()] + ["발표", "합니다"]
+    rng = random.Random(0)
+    for _ in range(500):
+        tokens = rng.choices(words, k=rng.randint(0, 30))
+        assert lexicon.match(tokens) == brute_force_match(lexicon, tokens)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from core.audio_clip import AudioClip
+from core.pause_ratio_calculator import detect_silence
+
+pydub = pytest.importorskip("pydub")
+from pydub import silence  # noqa: E402
+
+# 이전 구현과 같은 변환: AudioClip → 16bit PCM AudioSegment
+def to_audio_segment(clip):
+    pcm = (np.clip(clip.samples, -1.0, 1.0) * 32767).astype(np.int16)
+    return pydub.AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=clip.sr, channels=1)
+
+# 발화(큰 잡음) / 무음(작은 잡음) / 임계값 근처 구간을 무작위 길이로 이어 붙인 신호
+def synthetic_clip(rng, sr):
+    parts = []
+    duration = 0.0
+    while duration < 4.0:
+        length = rng.uniform(0.05, 1.2)
+        amplitude = rng.choice([0.3, 0.0005, 0.01, rng.uniform(0.005, 0.02)])
+        parts.append(rng.normal(0, amplitude, int(length * sr)))
+        duration += length
+    return AudioClip(np.concatenate(parts).astype(np.float32), sr)
+
+# 1ms 경계가 샘플 경계와 맞지 않는 샘플링 레이트(22050, 44100)도 확인
+@pytest.mark.parametrize("sr", [16000, 22050, 44100])
+def test_detect_silence_matches_pydub(sr):
+    rng = np.random.default_rng(sr)
+    for _ in range(8):
+        clip = synthetic_clip(rng, sr)
+        audio = to_audio_segment(clip)
+        for silence_thresh, min_silence_len in [(-40, 300), (-35, 100), (-50, 500)]:
+            expected = silence.detect_silence(audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
+            assert detect_silence(clip, silence_thresh, min_silence_len) == [tuple(r) for r in expected]
+
+def test_short_clip_has_no_silence():
+    clip = AudioClip(np.zeros(16000 * 2 // 10, dtype=np.float32))
+
+    assert detect_silence(clip, min_silence_len=300) == []
+    assert silence.detect_silence(to_audio_segment(clip), min_silence_len=300) == []
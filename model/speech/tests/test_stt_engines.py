@@ -0,0 +1,46 @@
+import os
+import pytest
+from core.audio_clip import AudioClip
+from core.stt_engines import STT_ENGINES, SttEngine, create_engine
+
+# 스모크 테스트에 쓸 faster-whisper 모델 (크기 이름 또는 변환된 모델 디렉터리)
+TEST_WHISPER_MODEL = os.getenv("PITCHPAL_TEST_WHISPER_MODEL", "tiny")
+
+# 로컬에 받아 둔 가중치 경로 (없으면 테스트 건너뜀, 네트워크로 받지 않음)
+def local_whisper_model():
+    pytest.importorskip("faster_whisper")
+    from faster_whisper.utils import download_model
+
+    if os.path.isdir(TEST_WHISPER_MODEL):
+        return TEST_WHISPER_MODEL
+    try:
+        return download_model(TEST_WHISPER_MODEL, local_files_only=True)
+    except Exception:
+        pytest.skip(f"Whisper 가중치 없음: {TEST_WHISPER_MODEL} (PITCHPAL_TEST_WHISPER_MODEL로 지정)")
+
+def test_engine_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SttEngine("tiny")
+
+    class MissingTranscribe(SttEngine):
+        name = "missing"
+        compute_types = ("float32",)
+
+        def _load(self):
+            return None
+
+    with pytest.raises(TypeError):
+        MissingTranscribe("tiny")
+    assert all(not engine.__abstractmethods__ for engine in STT_ENGINES.values())
+
+# 실제 모델로 전사해 WordTimeline이 만들어지는지 확인
+def test_faster_whisper_engine_smoke(data_file):
+    engine = create_engine("faster-whisper", local_whisper_model(), "int8")
+    clip = AudioClip.from_file(data_file("test1.m4a"))
+
+    text, timeline = engine.transcribe_timeline(clip.samples[:clip.sr * 10], tier="fast")
+
+    assert text.strip()
+    assert len(timeline) > 0
+    assert (timeline.ends >= timeline.starts).all()
+    assert timeline.ends.max() <= 10.5
@@ -1,85 +1,172 @@
-import librosa
-import numpy as np
-from faster_whisper import WhisperModel
-from utils.text_utils import evaluate_pronunciation, normalize_word
+from core.audio_clip import AudioClip
+from core.feature_engine import extract_features
+from core.filler_words import detect_filler_words
+from core.pause_ratio_calculator import analyze_pauses
+from core.speech_analysis import estimate_wpm_precise
+from core.stt_pronunciation import load_whisper_model
+from core.stt_tiers import transcribe_options
+from core.word_timeline import WordTimeline
+from utils.text_utils import evaluate_pronunciation
+
+# 특징 이름: 의존 특징 (계산 메서드는 _compute_<이름>, 의존 특징 값을 순서대로 인자로 받음)
+FEATURE_GRAPH = {
+    "audio": (),
+    "timeline": ("audio",),
+    "transcript": ("timeline",),
+    "spectrogram": ("audio",),
+    "mfcc": ("spectrogram",),
+    "pitch": ("spectrogram",),
+    "pauses": ("audio",),
+    "wpm": ("timeline", "spectrogram"),
+    "fillers": ("timeline",),
+    "pronunciation": ("transcript",),
+}
+
+# summarize(metrics=[...])에서 고를 수 있는 지표
+METRICS = ("mfcc", "pitch", "wpm", "pauses", "fillers", "pronunciation", "transcript")
+
+# "fillers" 특징의 짧은 간투사 최소 발음 길이(초), detect_filler_words도 이 값으로 호출하면 캐시된 결과를 사용
+FILLER_MIN_DURATION = 0.4
 
 class SpeechAnalyzer:
-    def __init__(self, audio_path, reference_text_path, model_size="small"):
+    """음성 특징을 처음 필요할 때 한 번만 계산하는 지연(lazy) 특징 그래프
+
+    - audio → timeline(STT) → transcript / fillers / pronunciation
+    - audio → spectrogram(STFT 한 번) → mfcc / pitch
+    - timeline + spectrogram → wpm (analyze_speech와 같은 발화 시간 기준)
+    - audio → pauses (analyze_pauses와 같은 무음 구간 기준)
+    - 생성자에서는 아무것도 계산하지 않고, Whisper 모델도 전사가 필요할 때 로드한다.
+    - summarize(metrics=[...])는 고른 지표가 (간접적으로) 필요로 하는 특징만 계산하므로
+      metrics=["fillers", "transcript"]는 STFT 등 신호 처리를, metrics=["pauses"]는 STT를 하지 않는다.
+    """
+
+    # model: 이미 로드된 WhisperModel을 넘기면 인스턴스마다 새로 로드하지 않고 공유
+    # tier: STT 품질 단계 (core.stt_tiers), model_size를 넘기면 모델 크기만 바꿈
+    def __init__(self, audio_path, reference_text_path=None, model_size=None, model=None, tier=None):
         self.audio_path = audio_path
-        self.reference_text = self._load_text(reference_text_path)
+        self.reference_text_path = reference_text_path
+        self.model_size = model_size
+        self.model = model
+        self.tier = tier
+        self._values = {}
+        self.computed = []  # 계산한 특징 순서 (확인용)
+
+    # 특징 값 (의존 특징부터 계산, 결과는 캐시)
+    def get(self, name):
+        if name not in self._values:
+            inputs = [self.get(dependency) for dependency in FEATURE_GRAPH[name]]
+            self._values[name] = getattr(self, "_compute_" + name)(*inputs)
+            self.computed.append(name)
+        return self._values[name]
+
+    # ------------------------------------------------------------------
+    # 특징 계산
+    # ------------------------------------------------------------------
+
+    # 한 번만 디코딩한 배열을 STT와 librosa 분석이 함께 사용
+    def _compute_audio(self):
+        return AudioClip.from_file(self.audio_path)
+
+    # segment generator를 한 번만 소비해 텍스트와 단어 타임라인을 함께 생성
+    def _compute_timeline(self, clip):
+        if self.model is None:
+            self.model = load_whisper_model(self.model_size, tier=self.tier)
+        segments, self.transcription_info = self.model.transcribe(clip.samples, **transcribe_options(self.tier))
+        return WordTimeline.from_segments(segments)
+
+    def _compute_transcript(self, timeline):
+        return timeline.text
+
+    # STFT 한 번으로 MFCC, pitch, 발화 구간을 함께 계산
+    def _compute_spectrogram(self, clip):
+        return extract_features(clip.samples, clip.sr)
+
+    def _compute_mfcc(self, features):
+        return features.mfcc_stats()
+
+    def _compute_pitch(self, features):
+        return features.pitch_mean, features.pitch_std
+
+    def _compute_pauses(self, clip):
+        return analyze_pauses(clip)["pause_ratio"]
+
+    # analyze_speech와 같은 정의: 단어 수 / 침묵을 뺀 발화 시간
+    def _compute_wpm(self, timeline, features):
+        word_count = len(timeline) if len(timeline) > 0 else len(timeline.text.split())
+        return estimate_wpm_precise(features, word_count)
+
+    def _compute_fillers(self, timeline):
+        return detect_filler_words(timeline, None, FILLER_MIN_DURATION)
+
+    def _compute_pronunciation(self, transcript):
+        if self.reference_text_path is None:
+            return None
+        return evaluate_pronunciation(self._load_text(self.reference_text_path), transcript)
 
-        self.model = WhisperModel(model_size, device="cpu", compute_type="int8")
-        self.segments, self.transcription_info = self.model.transcribe(audio_path, word_timestamps=True)
+    def _load_text(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
 
-        self.audio, self.sr = librosa.load(audio_path, sr=16000)
+    # ------------------------------------------------------------------
+    # 기존 메서드 / 속성 (필요한 특징만 계산)
+    # ------------------------------------------------------------------
 
-        self.word_infos = [w for seg in self.segments for w in seg.words]
-        self.transcribed_text = " ".join([seg.text.strip() for seg in self.segments])
+    @property
+    def clip(self):
+        return self.get("audio")
 
-        self.non_silent_intervals = librosa.effects.split(self.audio, top_db=30)
-        self.total_duration_sec = len(self.audio) / self.sr
-        self.active_speech_duration_sec = sum((end - start) for start, end in self.non_silent_intervals) / self.sr
+    @property
+    def timeline(self):
+        return self.get("timeline")
 
-    def _load_text(self, path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+    @property
+    def transcribed_text(self):
+        return self.get("transcript")
+
+    @property
+    def features(self):
+        return self.get("spectrogram")
 
     def extract_mfcc(self):
-        mfccs = librosa.feature.mfcc(y=self.audio, sr=self.sr, n_mfcc=13)
-        return np.mean(mfccs.T, axis=0), np.std(mfccs.T, axis=0)
+        return self.get("mfcc")
 
     def extract_pitch(self):
-        pitches, magnitudes = librosa.piptrack(y=self.audio, sr=self.sr)
-        pitch_values = pitches[magnitudes > np.median(magnitudes)]
-        return (np.mean(pitch_values), np.std(pitch_values)) if len(pitch_values) > 0 else (0, 0)
+        return self.get("pitch")
 
     def estimate_wpm(self):
-        if self.active_speech_duration_sec == 0:
-            return 0.0
-        word_count = len(self.transcribed_text.split())
-        return (word_count / self.active_speech_duration_sec) * 60
+        return self.get("wpm")
 
     def calculate_pause_ratio(self):
-        return 1 - (self.active_speech_duration_sec / self.total_duration_sec)
-
-    def detect_filler_words(self, fillers=None, min_duration=0.4):
-        if fillers is None:
-            fillers = ["음", "어", "그", "저", "이", "아", "흠", "으음", "어어"]
-
-        filler_count = 0
-        filler_occurrences = []
-
-        for word in self.word_infos:
-            raw = word.word.lower()
-            norm_word = normalize_word(raw)
-            duration = word.end - word.start
-
-            if norm_word in fillers and duration >= min_duration:
-                filler_count += 1
-                filler_occurrences.append((norm_word, word.start, word.end))
+        return self.get("pauses")
 
-        return filler_count, filler_occurrences
+    def detect_filler_words(self, fillers=None, min_duration=FILLER_MIN_DURATION):
+        if fillers is None and min_duration == FILLER_MIN_DURATION:
+            return self.get("fillers")
+        return detect_filler_words(self.timeline, fillers, min_duration)
 
     def evaluate_pronunciation_accuracy(self):
-        return evaluate_pronunciation(self.reference_text, self.transcribed_text)
-
-    def summarize(self):
-        mfcc_mean, mfcc_std = self.extract_mfcc()
-        pitch_mean, pitch_std = self.extract_pitch()
-        wpm = self.estimate_wpm()
-        pause_ratio = self.calculate_pause_ratio()
-        filler_count, filler_occurrences = self.detect_filler_words()
-        pronunciation_accuracy = self.evaluate_pronunciation_accuracy()
-
-        return {
-            "MFCC Mean": mfcc_mean,
-            "MFCC Std": mfcc_std,
-            "Pitch Mean": pitch_mean,
-            "Pitch Std": pitch_std,
-            "WPM": wpm,
-            "Pause Ratio": pause_ratio,
-            "Filler Count": filler_count,
-            "Filler Words": filler_occurrences,
-            "Pronunciation Accuracy": pronunciation_accuracy,
-            "Transcribed Text": self.transcribed_text,
-        }
+        return self.get("pronunciation")
+
+    # metrics: 계산할 지표 목록 (METRICS 중에서, None이면 전체)
+    def summarize(self, metrics=None):
+        metrics = METRICS if metrics is None else metrics
+        unknown = [metric for metric in metrics if metric not in METRICS]
+        if unknown:
+            raise ValueError(f"알 수 없는 지표입니다: {', '.join(unknown)} (사용 가능: {', '.join(METRICS)})")
+
+        summary = {}
+        if "mfcc" in metrics:
+            summary["MFCC Mean"], summary["MFCC Std"] = self.extract_mfcc()
+        if "pitch" in metrics:
+            summary["Pitch Mean"], summary["Pitch Std"] = self.extract_pitch()
+        if "wpm" in metrics:
+            summary["WPM"] = self.estimate_wpm()
+        if "pauses" in metrics:
+            summary["Pause Ratio"] = self.calculate_pause_ratio()
+        if "fillers" in metrics:
+            summary["Filler Count"], summary["Filler Words"] = self.detect_filler_words()
+        if "pronunciation" in metrics:
+            summary["Pronunciation Accuracy"] = self.evaluate_pronunciation_accuracy()
+        if "transcript" in metrics:
+            summary["Transcribed Text"] = self.transcribed_text
+        return summary
@@ -0,0 +1,205 @@
+import numpy as np
+from utils.text_utils import tokenize, preprocess_word_for_comparison
+
+# ---------------------------------------------------------------------------
+# Myers O(ND) diff (선형 공간, middle snake 분할)
+# ---------------------------------------------------------------------------
+
+# a[a_lo:a_hi]와 b[b_lo:b_hi]의 최단 편집 경로 가운데 snake (x0, y0, x1, y1) 반환 (구간 기준 좌표)
+# forward / backward: 대각선별 최대 x (diff_runs에서 한 번 할당해 재사용, offset이 대각선 0)
+def _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, forward, backward, offset):
+    n, m = a_hi - a_lo, b_hi - b_lo
+    delta = n - m
+    odd = delta % 2 != 0
+    forward[offset + 1] = 0
+    backward[offset + 1] = 0
+
+    for d in range((n + m + 1) // 2 + 1):
+        # 정방향 탐색
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[offset + delta - k] >= n:
+                return x0, y0, x, y
+
+        # 역방향 탐색 (끝에서부터, 뒤집은 좌표)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return n - x, m - y, n - x0, m - y0
+
+    raise AssertionError("middle snake not found")
+
+# 두 시퀀스의 일치 구간 [(i, j, length), ...] (순서대로, 최장 공통 부분열 기준)
+def diff_runs(a, b):
+    runs = []
+    offset = (len(a) + len(b) + 1) // 2 + 2
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+
+        # 공통 접두/접미 제거
+        prefix = 0
+        while a_lo + prefix < a_hi and b_lo + prefix < b_hi and a[a_lo + prefix] == b[b_lo + prefix]:
+            prefix += 1
+        if prefix:
+            runs.append((a_lo, b_lo, prefix))
+            a_lo += prefix
+            b_lo += prefix
+        suffix = 0
+        while a_lo < a_hi - suffix and b_lo < b_hi - suffix and a[a_hi - 1 - suffix] == b[b_hi - 1 - suffix]:
+            suffix += 1
+        if suffix:
+            runs.append((a_hi - suffix, b_hi - suffix, suffix))
+            a_hi -= suffix
+            b_hi -= suffix
+
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        x0, y0, x1, y1 = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, forward, backward, offset)
+        if x1 > x0:
+            runs.append((a_lo + x0, b_lo + y0, x1 - x0))
+        stack.append((a_lo, a_lo + x0, b_lo, b_lo + y0))
+        stack.append((a_lo + x1, a_hi, b_lo + y1, b_hi))
+
+    runs.sort()
+    return runs
+
+# ---------------------------------------------------------------------------
+# 대본 - STT 정렬
+# ---------------------------------------------------------------------------
+
+class Alignment:
+    """대본과 STT 결과를 한 번 정렬한 결과
+
+    - ratio: 정제된 글자 기준 유사도 (2 * 일치 글자 수 / 전체 글자 수)
+    - ref_mismatch / stt_mismatch: 단어별 불일치 여부 (일치하지 않는 글자가 하나라도 있으면 True)
+    - ref_matched: 대본 단어별 STT와 일치한 글자 수
+    - ref_to_stt: 대본 단어마다 대응하는 STT 단어 번호 (없으면 -1)
+    - ref_starts: 대본 단어마다 대응하는 STT 단어의 발화 시각 (없으면 nan)
+    """
+
+    def __init__(self, ratio, ref_words, stt_words, ref_mismatch, stt_mismatch, ref_matched,
+                 ref_to_stt, ref_starts, stt_starts):
+        self.ratio = ratio
+        self.ref_words = ref_words
+        self.stt_words = stt_words
+        self.ref_mismatch = ref_mismatch
+        self.stt_mismatch = stt_mismatch
+        self.ref_matched = ref_matched
+        self.ref_to_stt = ref_to_stt
+        self.ref_starts = ref_starts
+        self.stt_starts = stt_starts
+
+# 단어 단위 diff로 같은 단어 구간을 먼저 맞추고, 다른 구간에서만 글자 단위 diff 수행
+def align_words(ref_words, ref_cleaned, stt_words, stt_cleaned, stt_starts=None):
+    n_ref, n_stt = len(ref_words), len(stt_words)
+    ref_unmatched = np.array([len(w) for w in ref_cleaned], dtype=np.int32)
+    stt_unmatched = np.array([len(w) for w in stt_cleaned], dtype=np.int32)
+    ref_to_stt = np.full(n_ref, -1, dtype=np.int32)
+    matched_chars = 0
+
+    def align_region(i1, i2, j1, j2):
+        nonlocal matched_chars
+        if i1 == i2 or j1 == j2:
+            return
+        ref_chars = "".join(ref_cleaned[i1:i2])
+        stt_chars = "".join(stt_cleaned[j1:j2])
+        ref_owner = np.repeat(np.arange(i1, i2), [len(w) for w in ref_cleaned[i1:i2]])
+        stt_owner = np.repeat(np.arange(j1, j2), [len(w) for w in stt_cleaned[j1:j2]])
+        for i, j, length in diff_runs(ref_chars, stt_chars):
+            ref_idx = ref_owner[i:i + length]
+            stt_idx = stt_owner[j:j + length]
+            np.subtract.at(ref_unmatched, ref_idx, 1)
+            np.subtract.at(stt_unmatched, stt_idx, 1)
+            # 대본 단어는 처음 일치한 글자가 속한 STT 단어에 대응
+            first = ref_to_stt[ref_idx] < 0
+            ref_to_stt[ref_idx[first]] = stt_idx[first]
+            matched_chars += length
+
+    i_prev, j_prev = 0, 0
+    for i, j, length in diff_runs(ref_cleaned, stt_cleaned) + [(n_ref, n_stt, 0)]:
+        align_region(i_prev, i, j_prev, j)
+        if length:
+            ref_unmatched[i:i + length] = 0
+            stt_unmatched[j:j + length] = 0
+            ref_to_stt[i:i + length] = np.arange(j, j + length)
+            matched_chars += sum(len(w) for w in ref_cleaned[i:i + length])
+        i_prev, j_prev = i + length, j + length
+
+    total_chars = sum(len(w) for w in ref_cleaned) + sum(len(w) for w in stt_cleaned)
+    ratio = 2.0 * matched_chars / total_chars if total_chars else 1.0
+
+    stt_starts = None if stt_starts is None else np.asarray(stt_starts, dtype=np.float32)
+    ref_starts = np.full(n_ref, np.nan, dtype=np.float32)
+    if stt_starts is not None:
+        mapped = ref_to_stt >= 0
+        ref_starts[mapped] = stt_starts[ref_to_stt[mapped]]
+
+    ref_matched = np.array([len(w) for w in ref_cleaned], dtype=np.int32) - ref_unmatched
+    return Alignment(ratio, ref_words, stt_words, ref_unmatched > 0, stt_unmatched > 0, ref_matched,
+                     ref_to_stt, ref_starts, stt_starts)
+
+# 대본 텍스트와 STT 결과 정렬 (timeline을 넘기면 STT 단어와 발화 시각을 타임라인에서 사용)
+def align_texts(reference_text, stt_text, timeline=None):
+    ref_words, ref_cleaned = tokenize(reference_text)
+    if timeline is not None and len(timeline) > 0:
+        stt_words = list(timeline.words)
+        stt_cleaned = [preprocess_word_for_comparison(w) for w in stt_words]
+        return align_words(ref_words, ref_cleaned, stt_words, stt_cleaned, timeline.starts)
+    stt_words, stt_cleaned = tokenize(stt_text)
+    return align_words(ref_words, ref_cleaned, stt_words, stt_cleaned)
+
+# ---------------------------------------------------------------------------
+# 편집 거리 (WER / CER)
+# ---------------------------------------------------------------------------
+
+# Levenshtein 거리 (치환 포함), 한 행씩 numpy로 계산
+# 같은 행의 삽입 비용 d[j] = min(t[j], d[j-1] + 1)은 d[j] - j의 누적 최솟값으로 구함
+def edit_distance(a, b):
+    if not a or not b:
+        return max(len(a), len(b))
+    vocab = {}
+    a_ids = np.array([vocab.setdefault(x, len(vocab)) for x in a], dtype=np.int64)
+    b_ids = np.array([vocab.setdefault(x, len(vocab)) for x in b], dtype=np.int64)
+
+    positions = np.arange(len(b) + 1)
+    row = positions.copy()
+    for i, token in enumerate(a_ids, start=1):
+        best = np.empty(len(b) + 1, dtype=np.int64)
+        best[0] = i
+        best[1:] = np.minimum(row[1:] + 1, row[:-1] + (b_ids != token))
+        row = np.minimum.accumulate(best - positions) + positions
+    return int(row[-1])
+
+# 단어 오류율 / 글자 오류율 (정제된 단어 기준, CER은 띄어쓰기를 제외한 글자 기준)
+def error_rates(reference_text, stt_text):
+    _, ref_cleaned = tokenize(reference_text)
+    _, stt_cleaned = tokenize(stt_text)
+    ref_words = [w for w in ref_cleaned if w]
+    stt_words = [w for w in stt_cleaned if w]
+    ref_chars, stt_chars = "".join(ref_words), "".join(stt_words)
+    return {
+        "wer": edit_distance(ref_words, stt_words) / max(len(ref_words), 1),
+        "cer": edit_distance(ref_chars, stt_chars) / max(len(ref_chars), 1),
+    }
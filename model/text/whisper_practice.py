@@ -1,36 +1,38 @@
-import whisper
+import os
+import sys
 import time
 import librosa
 from collections import Counter
 import re
 
-# whisper 모델 생성
-model = whisper.load_model('base')
+# 음성 분석과 같은 간투사 목록(model/speech/core/filler_words.py) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "speech"))
+from core.filler_words import DISCOURSE_MARKERS, FILLER_WORDS, get_lexicon
+from core.stt_engines import create_engine
+
+# whisper 모델 생성 (음성 분석과 같은 STT 엔진 인터페이스, 결과도 같은 WordTimeline)
+engine = create_engine("openai-whisper", "base")
 
 # 음성 파일 경로 설정
 file_path = "data/SPK082SBSCU081M003.wav"
 
-# 불필요한 단어/추임새 리스트 작성
-filler_words = ["어", "음", "아", "흠", "그니까", "그러니까", "뭐랄까", "이제", "약간", "뭐지", "그러면"]
-
 # 실제 오디오 길이 계산 (librosa 사용)
 audio, sr = librosa.load(file_path)
 audio_duration = librosa.get_duration(y=audio, sr=sr)
 
 # STT 변환 시간 측정
 start_time = time.time()
-result = model.transcribe(file_path)
+text, timeline = engine.transcribe_timeline(file_path, tier="fast")
 end_time = time.time()
 
 # 텍스트 추출
-text = result["text"]
 print("📝 텍스트 변환 결과:\n", text)
 
 # 정규표현식으로 단어 추출 (한글+영어)
 words = re.findall(r'\b[\w가-힣]+\b', text)
 
-# 추임새 검출
-detected_fillers = [word for word in words if word in filler_words]
+# 추임새 검출 (담화 표지 / 여러 단어로 된 간투사 포함)
+detected_fillers = [word for word, _, _ in get_lexicon(FILLER_WORDS + DISCOURSE_MARKERS).detect_text(text)]
 filler_count = Counter(detected_fillers)
 print("\n🙊 검출된 불필요한 단어/추임새:", filler_count)
 
@@ -0,0 +1,186 @@
+import glob
+import sys
+import time
+from collections import namedtuple
+from eye_blink_counter import EAR_THRESHOLD
+from head_direction_detector import PITCH_DOWN_LIMIT, PITCH_UP_LIMIT, classify_pitch
+
+# 프레임 하나의 측정(또는 보간) 결과
+# face: 얼굴 감지 여부, ear: 양쪽 눈 평균 EAR, pitch: 고개 pitch(도), measured: FaceMesh로 실제 측정했으면 True
+Sample = namedtuple("Sample", ["video_time", "face", "ear", "pitch", "measured"])
+
+# 평소 FaceMesh를 실행하는 빈도 (고개 방향은 천천히 바뀌므로 10fps면 충분)
+BASE_FPS = 10
+# EAR이 EAR_THRESHOLD + EAR_MARGIN 아래로 내려오면 깜빡임이 시작될 수 있는 구간으로 보고 촘촘히 측정
+EAR_MARGIN = 0.04
+# pitch가 classify_pitch 경계(PITCH_UP_LIMIT / PITCH_DOWN_LIMIT)에서 PITCH_MARGIN도 이내면 건너뛴 프레임도 측정
+PITCH_MARGIN = 1.0
+# 깜빡임 이벤트가 생기면 이 시간(초) 동안 모든 프레임을 측정
+# 촘촘히 측정하는 동안에도 이벤트가 이어지면 계속 연장되므로, 눈을 다시 뜰 때까지 모든 프레임을 측정하게 됨
+DENSE_HOLD_SEC = 0.1
+
+class AdaptiveSampler:
+    """FaceMesh를 BASE_FPS로만 실행하고, 깜빡임 / 고개 방향 경계 근처에서만 모든 프레임을 측정하는 샘플러
+
+    - measure(video_time, frame) -> Sample: 실제 측정 함수 (FaceMesh + EAR / pitch 계산)
+    - feed(video_time, frame)는 결과가 확정된 프레임들의 Sample 목록을 시간 순서대로 반환
+      (건너뛴 프레임은 다음 측정까지 보류)
+    - 다음 측정이 이벤트면 보류한 프레임도 모두 측정(역방향 보정)하고, 아니면 앞뒤 측정값으로 EAR / pitch를 선형 보간
+      - 깜빡임 이벤트: EAR이 EAR_THRESHOLD + EAR_MARGIN 미만 → 이후 DENSE_HOLD_SEC 동안 모든 프레임 측정
+        (역방향 보정으로 측정한 프레임도 포함해 가장 늦은 깜빡임 이벤트 시각부터)
+      - 고개 방향 이벤트: 방향 변화, 경계에서 PITCH_MARGIN도 이내, 얼굴 감지 여부 변화
+        (고개는 천천히 움직이므로 건너뛴 구간만 측정해 바뀐 시점을 찾음)
+    - 보류한 프레임은 복사해 두므로 FrameSource 버퍼가 재사용되어도 안전
+    - measured / total: FaceMesh 실행 횟수 / 전체 프레임 수
+    """
+
+    def __init__(self, measure, base_fps=BASE_FPS, dense_hold_sec=DENSE_HOLD_SEC):
+        self.measure = measure
+        self.base_step = 1 / base_fps
+        self.dense_hold_sec = dense_hold_sec
+        self.last = None
+        self.pending = []
+        self.dense_until = -1.0
+        self.measured = 0
+        self.total = 0
+
+    # 눈이 감기고 있거나 감긴 상태
+    def is_blink_event(self, sample):
+        return sample.face and sample.ear is not None and sample.ear < EAR_THRESHOLD + EAR_MARGIN
+
+    # 직전 측정 → 이번 측정 사이에 고개 방향이나 얼굴 감지 여부가 바뀌었을 수 있으면 True
+    def is_pose_event(self, previous, sample):
+        if previous.face != sample.face or (previous.pitch is None) != (sample.pitch is None):
+            return True
+        if sample.pitch is not None:
+            if classify_pitch(previous.pitch) != classify_pitch(sample.pitch):
+                return True
+            if min(abs(sample.pitch - PITCH_UP_LIMIT), abs(sample.pitch - PITCH_DOWN_LIMIT)) < PITCH_MARGIN:
+                return True
+        return False
+
+    def _measure(self, video_time, frame):
+        self.measured += 1
+        return self.measure(video_time, frame)
+
+    def feed(self, video_time, frame):
+        self.total += 1
+        dense = video_time <= self.dense_until
+        due = self.last is None or video_time - self.last.video_time >= self.base_step - 1e-6
+        if not (dense or due):
+            self.pending.append((video_time, frame.copy()))
+            return []
+        return self._resolve(self._measure(video_time, frame))
+
+    # 영상 끝에서 보류 중인 프레임 처리 (마지막 프레임은 측정)
+    def flush(self):
+        if not self.pending:
+            return []
+        video_time, frame = self.pending.pop()
+        return self._resolve(self._measure(video_time, frame))
+
+    def _resolve(self, sample):
+        samples = []
+        blink_event = self.is_blink_event(sample)
+        if self.pending:
+            if blink_event or self.is_pose_event(self.last, sample):
+                samples.extend(self._measure(video_time, frame) for video_time, frame in self.pending)
+            else:
+                samples.extend(interpolate(self.last, sample, video_time) for video_time, _ in self.pending)
+            self.pending = []
+        samples.append(sample)
+
+        # 이번 측정이 이벤트가 아니어도 역방향 보정한 프레임에서 눈이 감기기 시작했으면 촘촘한 측정 유지
+        for measured in reversed(samples):
+            if measured.measured and self.is_blink_event(measured):
+                self.dense_until = max(self.dense_until, measured.video_time + self.dense_hold_sec)
+                break
+        self.last = sample
+        return samples
+
+# 두 측정 사이 시각의 EAR / pitch 선형 보간
+def interpolate(a, b, video_time):
+    span = b.video_time - a.video_time
+    weight = (video_time - a.video_time) / span if span > 0 else 0.0
+
+    def lerp(x, y):
+        if x is None or y is None:
+            return x if weight < 0.5 else y
+        return x + (y - x) * weight
+
+    return Sample(video_time, a.face and b.face, lerp(a.ear, b.ear), lerp(a.pitch, b.pitch), False)
+
+# 같은 영상을 모든 프레임 측정 / 적응형 샘플링으로 분석해 결과 차이와 FaceMesh 실행 횟수 비교
+# 비교 요약 {"video", "blink_delta", "pose_ratio_delta", "pose_agreement", "reduction"} 반환
+def compare_with_full_rate(video_path, base_fps=BASE_FPS, emotion_classifier=None):
+    from head_direction_detector import create_face_mesh
+    from video_pipeline import VideoPipeline, load_emotion_models
+
+    if emotion_classifier is None:
+        _, emotion_classifier = load_emotion_models()
+    reports = {}
+    for name, options in (("full", {}), ("adaptive", {"adaptive": True, "base_fps": base_fps})):
+        face_mesh = create_face_mesh()
+        start = time.perf_counter()
+        result = VideoPipeline(face_mesh, emotion_classifier, **options).run(video_path)
+        reports[name] = (result, time.perf_counter() - start)
+        face_mesh.close()
+
+    full, full_sec = reports["full"]
+    adaptive, adaptive_sec = reports["adaptive"]
+    print("| 방식 | FaceMesh 실행 | 처리 시간(초) | 깜빡임 | 위 | 정면 | 아래 |")
+    print("|---|---|---|---|---|---|---|")
+    for name, (result, sec) in reports.items():
+        ratios = result["head_pose"]["head_pose_ratios"] or {"looking up": 0, "looking front": 0, "looking down": 0}
+        print(f"| {name} | {result['inference_count']}/{result['frame_count']} | {sec:.1f} | "
+              f"{result['blinks']['summary']['눈 깜빡임 횟수']} | {ratios['looking up']:.1%} | "
+              f"{ratios['looking front']:.1%} | {ratios['looking down']:.1%} |")
+
+    # 프레임별 고개 방향 일치율, 깜빡임 시각 차이
+    full_poses = [frame["head_pose"] for frame in full["head_pose"]["frames"]]
+    adaptive_poses = [frame["head_pose"] for frame in adaptive["head_pose"]["frames"]]
+    agreement = sum(a == b for a, b in zip(full_poses, adaptive_poses)) / max(len(full_poses), 1)
+    print(f"\n프레임별 고개 방향 일치율: {agreement:.1%}")
+    print(f"깜빡임 시각 (전체): {[round(t, 2) for t in full['blinks']['blink_timestamps']]}")
+    print(f"깜빡임 시각 (적응형): {[round(t, 2) for t in adaptive['blinks']['blink_timestamps']]}")
+    reduction = full['inference_count'] / max(adaptive['inference_count'], 1)
+    print(f"FaceMesh 실행 {reduction:.1f}배 감소")
+
+    # 고개 방향 비율 차이는 세 방향 중 가장 큰 절댓값 (%p)
+    def pose_ratios(result):
+        return result["head_pose"]["head_pose_ratios"] or {"looking up": 0, "looking front": 0, "looking down": 0}
+
+    full_ratios, adaptive_ratios = pose_ratios(full), pose_ratios(adaptive)
+    return {
+        "video": video_path,
+        "blink_delta": adaptive["blinks"]["summary"]["눈 깜빡임 횟수"] - full["blinks"]["summary"]["눈 깜빡임 횟수"],
+        "pose_ratio_delta": max(abs(adaptive_ratios[key] - full_ratios[key]) for key in full_ratios),
+        "pose_agreement": agreement,
+        "reduction": reduction,
+    }
+
+if __name__ == "__main__":
+    # 실행: python model/video/adaptive_sampler.py [영상 경로 ...] [--base-fps=10]
+    #   영상을 생략하면 data/*.mp4 전체를 비교하고 영상별 차이를 markdown 표로 출력
+    base_fps = BASE_FPS
+    paths = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--base-fps="):
+            base_fps = float(arg.split("=", 1)[1])
+        else:
+            paths.append(arg)
+    paths = paths or sorted(glob.glob("data/*.mp4"))
+
+    from video_pipeline import load_emotion_models
+
+    _, emotion_classifier = load_emotion_models()
+    rows = []
+    for path in paths:
+        print(f"\n## {path}")
+        rows.append(compare_with_full_rate(path, base_fps, emotion_classifier))
+
+    print("\n| 영상 | 깜빡임 차이 | 고개 방향 비율 최대 차이 | 프레임별 고개 방향 일치율 | FaceMesh 감소 |")
+    print("|---|---|---|---|---|")
+    for row in rows:
+        print(f"| {row['video']} | {row['blink_delta']:+d} | {row['pose_ratio_delta'] * 100:.1f}%p | "
+              f"{row['pose_agreement']:.1%} | {row['reduction']:.1f}배 |")
@@ -1,13 +1,17 @@
-import cv2, csv
+import cv2, csv, sys
 import mediapipe as mp
 import math
+import numpy as np
 import pandas as pd
-import time
-from datetime import datetime
+from frame_source import FrameSource
 
 def euclidean_distance(p1, p2):
     return math.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)
 
+# 영상 시각(초) → "분:초" 문자열
+def format_video_time(seconds):
+    return f"{int(seconds // 60):02d}:{seconds % 60:05.2f}"
+
 # 눈 깜빡임 평가 함수
 def blink_frequency_grade(blinks_per_min):
     if 10 <= blinks_per_min <= 20:
@@ -48,155 +52,227 @@ RIGHT_EYE_IDX = [362, 385, 387, 263, 373, 380]
 EAR_THRESHOLD = 0.21
 CLOSED_FRAMES = 1
 
-# MediaPipe 초기화
+# 양쪽 눈 EAR 계산 점 (눈, 6개 점) — calculate_ear와 같은 순서
+EYE_IDX = np.array([LEFT_EYE_IDX, RIGHT_EYE_IDX])
+# 눈 12개 점만 EYE_IDX 순서로 담은 배열에서의 열 번호
+EYE_COLUMNS = np.arange(EYE_IDX.size).reshape(EYE_IDX.shape)
+
+# 랜드마크 배열 (N, 점 수, 2 이상, 0~1 정규화 좌표) → 프레임별 양쪽 눈 평균 EAR (N,)
+# eye_columns: 배열에서 EYE_IDX 점들이 있는 열 (478점 전체면 EYE_IDX 그대로, LandmarkTensor.columns(EYE_IDX))
+# 눈 점만 먼저 골라 픽셀 좌표로 바꾼 뒤(int(lm.x * w)처럼 버림) 모든 프레임을 한 번에 계산,
+# 계산할 수 없는 프레임(눈 가로 길이 0)은 NaN
+def batch_ear(landmarks, width, height, eye_columns=EYE_IDX):
+    eyes = np.trunc(landmarks[:, eye_columns, :2] * np.array([width, height], dtype=np.float64))
+    vertical = (np.linalg.norm(eyes[:, :, 1] - eyes[:, :, 5], axis=-1)
+                + np.linalg.norm(eyes[:, :, 2] - eyes[:, :, 4], axis=-1))
+    horizontal = np.linalg.norm(eyes[:, :, 0] - eyes[:, :, 3], axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ear = np.where(horizontal > 0, vertical / (2.0 * horizontal), np.nan)
+    return ear.mean(axis=1)
+
+# FaceMesh 랜드마크 한 프레임 → 양쪽 눈 평균 EAR (눈 12개 점만 읽어 계산, 계산할 수 없으면 NaN)
+def landmarks_ear(landmarks, width, height):
+    eyes = np.array([[(landmarks[i].x, landmarks[i].y) for i in EYE_IDX.ravel()]], dtype=np.float64)
+    return batch_ear(eyes, width, height, EYE_COLUMNS)[0]
+
+# 양쪽 눈 평균 EAR (한쪽이라도 계산할 수 없으면 None)
+def average_ear(points):
+    left_ear = calculate_ear(points, LEFT_EYE_IDX)
+    right_ear = calculate_ear(points, RIGHT_EYE_IDX)
+    if right_ear is None or left_ear is None:
+        return None
+    return (right_ear + left_ear) / 2
+
+# MediaPipe FaceMesh 생성
 mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(max_num_faces=1)
-blink_count = 0
-blink_timestamps = []
-frame_idx = 0
-frame_counter = 0  # 초기화 누락 방지
-start_time = time.time()
-
-# 분석 결과 저장용 리스트
-results = []
-
-# 영상 경로 설정
-video_path = r"C:\Users\lhy27\Desktop\졸프\20250522_154521.mp4"
-
-# 영상 열기
-cap = cv2.VideoCapture(video_path)
-if not cap.isOpened():
-    print("❌ 영상 파일을 열 수 없습니다. 경로 또는 파일명을 확인하세요.")
-    exit()
-
-fps = cap.get(cv2.CAP_PROP_FPS)
-if fps == 0:
-    print("❌ FPS 값이 0입니다. 영상이 손상되었거나 코덱 문제일 수 있습니다.")
-    exit()
-
-# 깜빡임 데이터 CSV 준비
-blink_csv_path = r"model\video\blink_data.csv"
-blink_csv = open(blink_csv_path, mode='w', newline='', encoding='utf-8-sig')
-csv_writer = csv.writer(blink_csv)
-csv_writer.writerow(['Blink Number', 'Timestamp (s)', 'Formatted Time'])
-
-# fps 계산 부분은 이미 있으니 그대로 쓰고
-wait_time = int(1000 / fps)  # 1000ms를 fps로 나누면 프레임당 대기 시간(ms)
-
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame_idx += 1
-    h, w = frame.shape[:2]
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = face_mesh.process(rgb_frame)
-
-    if result.multi_face_landmarks:
-        landmarks = result.multi_face_landmarks[0].landmark
-        points = [(int(lm.x * w), int(lm.y * h)) for lm in landmarks]
-
-        # 왼쪽 눈 시각화 (초록색)
-        for idx in LEFT_EYE_IDX:
-            cv2.circle(frame, points[idx], 2, (0, 255, 0), -1)
-        for i in range(len(LEFT_EYE_IDX)):
-            cv2.line(frame, points[LEFT_EYE_IDX[i]], points[LEFT_EYE_IDX[(i + 1) % len(LEFT_EYE_IDX)]], (0, 255, 0), 1)
-
-        # 오른쪽 눈 시각화 (빨간색)
-        for idx in RIGHT_EYE_IDX:
-            cv2.circle(frame, points[idx], 2, (0, 0, 255), -1)
-        for i in range(len(RIGHT_EYE_IDX)):
-            cv2.line(frame, points[RIGHT_EYE_IDX[i]], points[RIGHT_EYE_IDX[(i + 1) % len(RIGHT_EYE_IDX)]], (0, 0, 255), 1)
-
-        left_ear = calculate_ear(points, LEFT_EYE_IDX)
-        right_ear = calculate_ear(points, RIGHT_EYE_IDX)
-
-        blink = False
-
-        if right_ear is not None and left_ear is not None:
-            avg_ear = (right_ear + left_ear) / 2
-        
-        if avg_ear is not None and avg_ear < EAR_THRESHOLD:
-            frame_counter += 1
-        else:
-            if frame_counter >= CLOSED_FRAMES:
-                blink = True
-                blink_count += 1
-                timestamp = time.time() - start_time
-                blink_timestamps.append(timestamp)
-                csv_writer.writerow([
-                    blink_count,
-                    f"{timestamp:.2f}",
-                    datetime.now().strftime("%H:%M:%S")
-                ])
-            frame_counter = 0
-        
-        # 화면 출력
-        elapsed = time.time() - start_time
-        bps = blink_count / elapsed if elapsed > 0 else 0
-        bpm = bps * 60
-
-        if avg_ear is not None:
-            cv2.putText(frame, f"EAR: {avg_ear:.3f}", (30, 130),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 0), 2)
-            
-        cv2.putText(frame, f"Blinks: {blink_count}", (30, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 2)
-        cv2.putText(frame, f"BPM: {bpm:.2f}", (30, 90),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 200, 200), 2)
-
-        cv2.imshow("Blink Detection", frame)
-
-        if cv2.waitKey(wait_time) & 0xFF == ord('q'):
-            break
-
-        results.append({
-            "프레임": frame_idx,
-            "EAR": round(avg_ear, 4) if avg_ear is not None else None,
-            "눈 깜빡임": "O" if blink else "X"
-        })
-
-# 정리
-cap.release()
-blink_csv.close()
-cv2.destroyAllWindows()
-
-# --- 🔻 지속시간 및 깜빡임 빈도 계산 ---
-total_time_sec = frame_idx / fps
-total_time_min = total_time_sec / 60
-blinks_per_min = blink_count / total_time_min
-
-# 분:초 형식의 지속시간 추가
-duration_str = f"{int(total_time_sec // 60)}분 {int(total_time_sec % 60)}초"
-
-# DataFrame 생성 및 깜빡임 빈도 추가
-df = pd.DataFrame(results)
-df.loc[0, "눈 깜빡임 빈도(Hz)"] = round(blink_count / total_time_sec, 2)
-
-csv_path = r"model\video\blink_data.csv"
-df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-
-# --- 🔻 평가 및 요약 ---
-blink_grade, blink_interpretation = blink_frequency_grade(blinks_per_min)
-
-summary = {
-    "분석 영상 길이": duration_str,  # ✅ 지속시간 반영
-    "눈 깜빡임 횟수": blink_count,
-    "눈 깜빡임 빈도 (회/분)": round(blinks_per_min, 2),
-    "눈 깜빡임 평가 등급": blink_grade,
-    "눈 깜빡임 해석": blink_interpretation
-}
-
-# 콘솔 출력
-print("\n===== 발표 평가 요약 =====")
-for k, v in summary.items():
-    print(f"{k}: {v}")
-
-print(f"EAR: {avg_ear:.4f}")
-
-# CSV 저장
-summary_df = pd.DataFrame([summary])
-summary_path = r"model\video\eye_blink_analysis_summary.csv"
-summary_df.to_csv(summary_path, index=False, encoding="utf-8-sig")
-print(f"\n✅ 평가 요약 결과가 '{summary_path}' 에 저장되었습니다.")
+
+def create_face_mesh():
+    return mp_face_mesh.FaceMesh(max_num_faces=1)
+
+class BlinkDetector:
+    """얼굴이 감지된 프레임마다 EAR을 갱신하며 깜빡임을 세는 상태 기계
+
+    평균 EAR이 EAR_THRESHOLD 미만인 프레임이 CLOSED_FRAMES 이상 이어진 뒤
+    다시 올라오는 프레임에서 깜빡임 1회로 기록한다 (시각은 호출한 쪽의 영상 시각).
+    """
+
+    def __init__(self):
+        self.avg_ear = None
+        self.frame_counter = 0
+        self.blink_count = 0
+        self.blink_timestamps = []
+
+    # points: 픽셀 좌표 랜드마크, 이 프레임에서 깜빡임이 끝났으면 True
+    def update(self, points, video_time):
+        return self.update_ear(average_ear(points), video_time)
+
+    # 이미 계산한 평균 EAR로 갱신 (None / NaN이면 직전 EAR 유지)
+    def update_ear(self, avg_ear, video_time):
+        if avg_ear is not None and not math.isnan(avg_ear):
+            self.avg_ear = float(avg_ear)
+
+        if self.avg_ear is not None and self.avg_ear < EAR_THRESHOLD:
+            self.frame_counter += 1
+            return False
+
+        blink = self.frame_counter >= CLOSED_FRAMES
+        if blink:
+            self.blink_count += 1
+            self.blink_timestamps.append(video_time)
+        self.frame_counter = 0
+        return blink
+
+# 영상 길이와 깜빡임 횟수로 평가 요약 생성
+def summarize_blinks(blink_count, total_time_sec):
+    total_time_min = total_time_sec / 60
+    blinks_per_min = blink_count / total_time_min if total_time_min > 0 else 0.0
+    blink_grade, blink_interpretation = blink_frequency_grade(blinks_per_min)
+    return {
+        "분석 영상 길이": f"{int(total_time_sec // 60)}분 {int(total_time_sec % 60)}초",
+        "눈 깜빡임 횟수": blink_count,
+        "눈 깜빡임 빈도 (회/분)": round(blinks_per_min, 2),
+        "눈 깜빡임 평가 등급": blink_grade,
+        "눈 깜빡임 해석": blink_interpretation
+    }
+
+# 영상 전체의 눈 깜빡임 분석 (display=False이면 화면 출력 없이 분석만 수행)
+# 모든 시각은 영상 시각(프레임 표시 시각) 기준이므로 재생 속도를 맞추지 않고 CPU가 허용하는 만큼 빠르게 처리하며,
+# 처리 속도와 관계없이 같은 결과를 얻음
+# frame_options: FRAME_SOURCE_CONFIGS["blink"] 대신 쓸 해상도 / fps 설정 (예: {"width": None})
+def analyze_blinks(video_path,
+                   blink_csv_path=r"model\video\blink_data.csv",
+                   summary_path=r"model\video\eye_blink_analysis_summary.csv",
+                   display=True, face_mesh=None, frame_options=None):
+    detector = BlinkDetector()
+    frame_idx = 0
+
+    # 분석 결과 저장용 리스트
+    results = []
+
+    # 영상 열기 (축소 / fps 조절된 RGB 프레임)
+    try:
+        source = FrameSource.for_analyzer(video_path, "blink", **(frame_options or {}))
+    except (OSError, ValueError) as e:
+        print(f"❌ 영상 파일을 열 수 없습니다. 경로 또는 파일명을 확인하세요. ({e})")
+        return None
+    # 랜드마크 좌표는 원본 해상도 기준 (축소해도 EAR 반올림 오차가 커지지 않도록)
+    w, h = source.source_width, source.source_height
+
+    own_face_mesh = face_mesh is None
+    blink_csv = None
+    # 분석 중 예외가 나도 디코더 / FaceMesh / 파일을 닫음
+    try:
+        if own_face_mesh:
+            face_mesh = create_face_mesh()
+
+        # 깜빡임 데이터 CSV 준비
+        blink_csv = open(blink_csv_path, mode='w', newline='', encoding='utf-8-sig')
+        csv_writer = csv.writer(blink_csv)
+        csv_writer.writerow(['Blink Number', 'Timestamp (s)', 'Formatted Time'])
+
+        # video_time: 현재 프레임의 영상 시각 (첫 프레임이 0초)
+        for video_time, rgb_frame in source:
+            frame_idx += 1
+            result = face_mesh.process(rgb_frame)
+
+            if result.multi_face_landmarks:
+                landmarks = result.multi_face_landmarks[0].landmark
+                blink = detector.update_ear(landmarks_ear(landmarks, w, h), video_time)
+                avg_ear, blink_count = detector.avg_ear, detector.blink_count
+                if blink:
+                    csv_writer.writerow([
+                        blink_count,
+                        f"{video_time:.2f}",
+                        format_video_time(video_time)
+                    ])
+
+                if display:
+                    # 화면 출력용 프레임과 (축소된) 화면 좌표
+                    frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+                    frame_h, frame_w = frame.shape[:2]
+                    view_points = [(int(lm.x * frame_w), int(lm.y * frame_h)) for lm in landmarks]
+
+                    # 왼쪽 눈 시각화 (초록색)
+                    for idx in LEFT_EYE_IDX:
+                        cv2.circle(frame, view_points[idx], 2, (0, 255, 0), -1)
+                    for i in range(len(LEFT_EYE_IDX)):
+                        cv2.line(frame, view_points[LEFT_EYE_IDX[i]], view_points[LEFT_EYE_IDX[(i + 1) % len(LEFT_EYE_IDX)]], (0, 255, 0), 1)
+
+                    # 오른쪽 눈 시각화 (빨간색)
+                    for idx in RIGHT_EYE_IDX:
+                        cv2.circle(frame, view_points[idx], 2, (0, 0, 255), -1)
+                    for i in range(len(RIGHT_EYE_IDX)):
+                        cv2.line(frame, view_points[RIGHT_EYE_IDX[i]], view_points[RIGHT_EYE_IDX[(i + 1) % len(RIGHT_EYE_IDX)]], (0, 0, 255), 1)
+
+                    # 화면 출력 (영상 시각 기준 분당 깜빡임)
+                    elapsed = source.duration
+                    bps = blink_count / elapsed if elapsed > 0 else 0
+                    bpm = bps * 60
+
+                    if avg_ear is not None:
+                        cv2.putText(frame, f"EAR: {avg_ear:.3f}", (30, 130),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 0), 2)
+
+                    cv2.putText(frame, f"Blinks: {blink_count}", (30, 50),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 2)
+                    cv2.putText(frame, f"BPM: {bpm:.2f}", (30, 90),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 200, 200), 2)
+
+                    cv2.imshow("Blink Detection", frame)
+
+                    # 화면 갱신만 하고 재생 속도에 맞춰 기다리지 않음
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+
+                results.append({
+                    "프레임": frame_idx,
+                    "EAR": round(avg_ear, 4) if avg_ear is not None else None,
+                    "눈 깜빡임": "O" if blink else "X"
+                })
+    finally:
+        source.close()
+        if blink_csv is not None:
+            blink_csv.close()
+        if own_face_mesh and face_mesh is not None:
+            face_mesh.close()
+        if display:
+            cv2.destroyAllWindows()
+
+    # --- 🔻 지속시간 및 깜빡임 빈도 계산 ---
+    total_time_sec = source.duration
+    blink_count, avg_ear = detector.blink_count, detector.avg_ear
+
+    # DataFrame 생성 및 깜빡임 빈도 추가
+    df = pd.DataFrame(results)
+    if total_time_sec > 0:
+        df.loc[0, "눈 깜빡임 빈도(Hz)"] = round(blink_count / total_time_sec, 2)
+
+    df.to_csv(blink_csv_path, index=False, encoding='utf-8-sig')
+
+    # --- 🔻 평가 및 요약 ---
+    summary = summarize_blinks(blink_count, total_time_sec)
+
+    # 콘솔 출력
+    print("\n===== 발표 평가 요약 =====")
+    for k, v in summary.items():
+        print(f"{k}: {v}")
+
+    if avg_ear is not None:
+        print(f"EAR: {avg_ear:.4f}")
+
+    # CSV 저장
+    summary_df = pd.DataFrame([summary])
+    summary_df.to_csv(summary_path, index=False, encoding="utf-8-sig")
+    print(f"\n✅ 평가 요약 결과가 '{summary_path}' 에 저장되었습니다.")
+
+    return {
+        "summary": summary,
+        "blink_timestamps": detector.blink_timestamps,
+        "duration_sec": total_time_sec,
+    }
+
+if __name__ == "__main__":
+    # 영상 경로 설정
+    video_path = r"C:\Users\lhy27\Desktop\졸프\20250522_154521.mp4"
+    # --headless: 화면 출력 없이 분석만 수행
+    analyze_blinks(video_path, display="--headless" not in sys.argv)
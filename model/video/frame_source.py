@@ -0,0 +1,144 @@
+import itertools
+import numpy as np
+
+# 분석기별 프레임 설정
+# - width: 출력 가로 픽셀 (원본보다 작을 때만 축소, 세로는 비율 유지) / None이면 원본 해상도
+# - fps: 분석 프레임 레이트 상한 (원본보다 낮을 때만 프레임을 건너뜀) / None이면 원본 프레임 레이트
+# - pix_fmt: "rgb24"(FaceMesh 입력), "bgr24"(cv2 화면 출력), "gray"(Haar 얼굴 검출)
+# FaceMesh는 입력을 192~256px로 줄여 추론하고 Haar 검출도 minSize=(30, 30)이므로 640px이면 충분
+FRAME_SOURCE_CONFIGS = {
+    "blink": {"width": 640, "fps": 30, "pix_fmt": "rgb24"},         # 눈 깜빡임(100~300ms)은 30fps 유지
+    "head_pose": {"width": 640, "fps": 15, "pix_fmt": "rgb24"},     # 고개 방향은 천천히 바뀜
+    "emotion": {"width": 640, "fps": 10, "pix_fmt": "gray"},
+    "pipeline": {"width": 640, "fps": 30, "pix_fmt": "rgb24"},      # video_pipeline (깜빡임 기준)
+}
+
+PIX_FMT_CHANNELS = {"rgb24": 3, "bgr24": 3, "gray": 1}
+
+class FrameSource:
+    """PyAV(ffmpeg 라이브러리)로 영상을 디코딩하면서 축소 / 색 변환 / 프레임 건너뛰기를 함께 처리하는 프레임 반복자
+
+    - 축소는 디코더 출력 형식(YUV) 그대로 AREA 보간으로 먼저 하고 색 변환은 축소된 프레임에만 적용
+      (흑백은 Y 평면만 축소하면 되므로 한 번에), 건너뛰는 프레임은 변환하지 않음
+    - 결과는 미리 할당한 NumPy 버퍼(buffers개를 돌려 씀)에 복사하므로 프레임마다 배열을 새로 만들지 않음
+      → 반환된 배열은 다음 buffers - 1 프레임까지만 유효, 더 오래 쓰려면 복사해야 함
+    - 휴대폰 영상의 회전 정보(display matrix)를 반영해 세로 영상도 바로 선 방향으로 반환
+    - source_width / source_height: 회전 반영한 원본 해상도, 랜드마크 좌표를 원본 픽셀 기준으로 계산할 때 사용
+    - for video_time, frame in source: video_time = 프레임 표시 시각(pts, 첫 프레임 0초)이므로
+      가변 프레임 레이트(VFR) 휴대폰 영상에서도 실제 시각과 맞음
+    - duration: 지금까지 디코딩한 구간의 길이 (반복이 끝나면 영상 전체 길이)
+    """
+
+    def __init__(self, video_path, width=None, fps=None, pix_fmt="rgb24", buffers=2):
+        import av
+
+        if pix_fmt not in PIX_FMT_CHANNELS:
+            raise ValueError(f"지원하지 않는 픽셀 형식입니다: {pix_fmt} (사용 가능: {', '.join(PIX_FMT_CHANNELS)})")
+        self.pix_fmt = pix_fmt
+        self.channels = PIX_FMT_CHANNELS[pix_fmt]
+
+        self.container = av.open(video_path)
+        try:
+            if not self.container.streams.video:
+                raise ValueError(f"영상 스트림이 없습니다: {video_path}")
+            self.stream = self.container.streams.video[0]
+            self.stream.thread_type = "AUTO"
+
+            self.source_fps = float(self.stream.average_rate or 0)
+            if self.source_fps == 0:
+                raise ValueError("FPS 값이 0입니다. 영상이 손상되었거나 코덱 문제일 수 있습니다.")
+            self.fps = min(fps, self.source_fps) if fps else self.source_fps
+
+            # 회전 정보와 크기는 첫 프레임에서 확인
+            self._frames = self.container.decode(self.stream)
+            self._first = next(self._frames, None)
+            if self._first is None:
+                raise ValueError(f"디코딩할 프레임이 없습니다: {video_path}")
+        except Exception:
+            self.container.close()
+            raise
+
+        # np.rot90 횟수 (반시계 방향 90도 단위)
+        self.rotation = int(round((self._first.rotation or 0) / 90)) % 4
+        coded_w, coded_h = self._first.width, self._first.height
+        if self.rotation % 2:
+            self.source_width, self.source_height = coded_h, coded_w
+        else:
+            self.source_width, self.source_height = coded_w, coded_h
+
+        if width and width < self.source_width:
+            self.width = width
+            self.height = max(int(round(self.source_height * width / self.source_width / 2)) * 2, 2)
+        else:
+            self.width, self.height = self.source_width, self.source_height
+        # 디코더 기준(회전 전) 출력 크기
+        self._coded_size = (self.height, self.width) if self.rotation % 2 else (self.width, self.height)
+
+        shape = (self.height, self.width, self.channels) if self.channels > 1 else (self.height, self.width)
+        self._buffers = [np.empty(shape, dtype=np.uint8) for _ in range(max(buffers, 1))]
+        self.frame_count = 0
+        self.duration = 0.0
+
+    # 분석기 이름으로 FRAME_SOURCE_CONFIGS 설정을 적용해 열기 (overrides로 일부 값 변경)
+    @classmethod
+    def for_analyzer(cls, video_path, analyzer, **overrides):
+        return cls(video_path, **dict(FRAME_SOURCE_CONFIGS[analyzer], **overrides))
+
+    # 출력 프레임 수 추정 (컨테이너에 기록된 길이 기준, 알 수 없으면 None)
+    def estimated_frame_count(self):
+        if self.container.duration is None:
+            return None
+        return int(self.container.duration / 1000000 * self.fps) + 1
+
+    def _convert(self, frame, buffer):
+        coded_w, coded_h = self._coded_size
+        if (coded_w, coded_h) == (frame.width, frame.height):
+            frame = frame.reformat(format=self.pix_fmt)
+        elif self.pix_fmt == "gray":
+            frame = frame.reformat(width=coded_w, height=coded_h, format="gray", interpolation="AREA")
+        else:
+            frame = frame.reformat(width=coded_w, height=coded_h, interpolation="AREA").reformat(format=self.pix_fmt)
+        plane = frame.planes[0]
+        # 줄 끝 정렬용 여백(line_size)을 제외한 픽셀만 사용
+        view = np.frombuffer(plane, dtype=np.uint8).reshape(coded_h, plane.line_size)[:, :coded_w * self.channels]
+        view = view.reshape(coded_h, coded_w, self.channels) if self.channels > 1 else view
+        np.copyto(buffer, np.rot90(view, self.rotation) if self.rotation else view)
+        return buffer
+
+    def __iter__(self):
+        if self._first is None:
+            raise RuntimeError("FrameSource는 한 번만 반복할 수 있습니다.")
+        first, self._first = self._first, None
+
+        # fps를 낮추지 않으면 모든 프레임 사용
+        decimate = self.fps < self.source_fps
+        step = 1 / self.fps
+        # 원본 프레임 간격의 절반까지는 예정 시각보다 일찍 와도 사용
+        tolerance = 0.5 / self.source_fps
+        start_time = first.time or 0.0
+        next_time = 0.0
+        decoded = 0
+
+        for frame in itertools.chain([first], self._frames):
+            frame_time = frame.time - start_time if frame.time is not None else decoded / self.source_fps
+            decoded += 1
+            self.duration = max(self.duration, frame_time + 1 / self.source_fps)
+            if decimate:
+                if frame_time + tolerance < next_time:
+                    continue
+                while next_time <= frame_time + tolerance:
+                    next_time += step
+
+            buffer = self._buffers[self.frame_count % len(self._buffers)]
+            self.frame_count += 1
+            yield frame_time, self._convert(frame, buffer)
+
+    def close(self):
+        self.container.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
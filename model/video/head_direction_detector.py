@@ -1,17 +1,18 @@
+import sys
+from functools import lru_cache
 import cv2
 import mediapipe as mp
 import numpy as np
 import pandas as pd
+from frame_source import FrameSource
 
 VIDEO_PATH = r"C:\Users\lhy27\Desktop\20250524_172341.mp4"
 CSV_OUTPUT_PATH = r"model\video\head_pose_pitch_output.csv"
 
 mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1, refine_landmarks=True)
 
-cap = cv2.VideoCapture(VIDEO_PATH)
-fps = cap.get(cv2.CAP_PROP_FPS)
-total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+def create_face_mesh():
+    return mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1, refine_landmarks=True)
 
 model_points = np.array([
     (0.0, 0.0, 0.0),             # 코끝
@@ -35,126 +36,178 @@ def get_camera_matrix(frame_width, frame_height):
     )
     return camera_matrix
 
+# 해상도별 (camera_matrix, dist_coeffs), 같은 해상도면 프레임마다 다시 만들지 않음 (공유 배열이므로 수정 금지)
+@lru_cache(maxsize=8)
+def camera_intrinsics(frame_width, frame_height):
+    return get_camera_matrix(frame_width, frame_height), np.zeros((4,1))
+
+# 회전 벡터 (N, 3) → pitch (N,) 도
+# cv2.Rodrigues + Euler 분해를 모든 프레임에 한 번에 적용 (R = cosθ·I + sinθ·K + (1 - cosθ)·kkᵀ 중 필요한 원소만),
+# NaN 행(solvePnP 실패)은 NaN
+def rotation_pitch(rotation_vectors):
+    rvecs = np.asarray(rotation_vectors, dtype=np.float64).reshape(-1, 3)
+    theta = np.linalg.norm(rvecs, axis=1)
+    kx, ky, kz = (rvecs / np.where(theta > 0, theta, 1.0)[:, None]).T
+    sin, cos = np.sin(theta), np.cos(theta)
+    c = 1 - cos
+
+    r00 = cos + c * kx * kx
+    r10 = sin * kz + c * kx * ky
+    r11 = cos + c * ky * ky
+    r12 = -sin * kx + c * ky * kz
+    r21 = sin * kx + c * ky * kz
+    r22 = cos + c * kz * kz
+
+    sy = np.sqrt(r00 * r00 + r10 * r10)
+    x = np.where(sy < 1e-6, np.arctan2(-r12, r11), np.arctan2(r21, r22))
+    return np.degrees(x)
+
+# LANDMARK_IDS 순서의 2D 점 (6, 2)으로 solvePnP → 회전 벡터 (3,), 실패하면 None
+def solve_rotation(image_points, img_w, img_h):
+    camera_matrix, dist_coeffs = camera_intrinsics(img_w, img_h)
+    success_pnp, rotation_vector, translation_vector = cv2.solvePnP(
+        model_points, image_points, camera_matrix, dist_coeffs, flags=cv2.SOLVEPNP_ITERATIVE
+    )
+    return rotation_vector.ravel() if success_pnp else None
+
+# 고개 방향 경계 (도): PITCH_UP_LIMIT 미만이면 위, PITCH_DOWN_LIMIT 초과면 아래
+PITCH_UP_LIMIT = -8
+PITCH_DOWN_LIMIT = 9
+
 def classify_pitch(pitch_deg):
-    if pitch_deg < -8:
+    if pitch_deg < PITCH_UP_LIMIT:
         return "looking up"
-    elif pitch_deg > 9:
+    elif pitch_deg > PITCH_DOWN_LIMIT:
         return "looking down"
     else:
         return "looking front"
 
-results_data = []
-frame_count = 0
-head_pose_counts = {"looking up":0, "looking front":0, "looking down":0}
-warning_needed = False
-last_frame_with_warning = None
-
-while cap.isOpened():
-    success, frame = cap.read()
-    if not success:
-        break
-
-    img_h, img_w = frame.shape[:2]
-    camera_matrix = get_camera_matrix(img_w, img_h)
-    dist_coeffs = np.zeros((4,1))
-
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(rgb_frame)
-
-    head_pose_text = "No face detected"
-    pitch_deg = None
-
-    if results.multi_face_landmarks:
-        landmarks = results.multi_face_landmarks[0].landmark
-        image_points = []
-        for idx in LANDMARK_IDS:
-            lm = landmarks[idx]
-            x, y = int(lm.x * img_w), int(lm.y * img_h)
-            image_points.append((x, y))
-        image_points = np.array(image_points, dtype="double")
-
-        success_pnp, rotation_vector, translation_vector = cv2.solvePnP(
-            model_points, image_points, camera_matrix, dist_coeffs, flags=cv2.SOLVEPNP_ITERATIVE
-        )
-
-        if success_pnp:
-            rotation_matrix, _ = cv2.Rodrigues(rotation_vector)
-            sy = np.sqrt(rotation_matrix[0,0]*rotation_matrix[0,0] + rotation_matrix[1,0]*rotation_matrix[1,0])
-            singular = sy < 1e-6
-
-            if not singular:
-                x = np.arctan2(rotation_matrix[2,1], rotation_matrix[2,2])
-                y = np.arctan2(-rotation_matrix[2,0], sy)
-                z = np.arctan2(rotation_matrix[1,0], rotation_matrix[0,0])
-            else:
-                x = np.arctan2(-rotation_matrix[1,2], rotation_matrix[1,1])
-                y = np.arctan2(-rotation_matrix[2,0], sy)
-                z = 0
-
-            pitch_deg = np.degrees(x)
-            head_pose_text = classify_pitch(pitch_deg)
-
-            for p in image_points:
-                cv2.circle(frame, (int(p[0]), int(p[1])), 3, (0, 255, 0), -1)
-
-    pitch_text = f"Pitch: {pitch_deg:.2f} deg" if pitch_deg is not None else "Pitch: N/A"
-
-    cv2.putText(frame, head_pose_text, (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0,255,0), 3)
-    cv2.putText(frame, pitch_text, (30, 100), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0,255,255), 2)
-
-    timestamp = frame_count / fps
-    results_data.append({
-        "frame": frame_count,
-        "time_sec": timestamp,
-        "head_pose": head_pose_text,
-        "pitch_deg": pitch_deg if pitch_deg is not None else ""
-    })
-
-    if head_pose_text in head_pose_counts:
-        head_pose_counts[head_pose_text] += 1
-
-    frame_count += 1
-    cv2.imshow("Head Pose Detection", frame)
-
-    if cv2.waitKey(int(1000/fps)) & 0xFF == ord('q'):
-        break
-
-    if frame_count == total_frames:
-        total = sum(head_pose_counts.values())
-        if total > 0:
-            down_ratio = head_pose_counts["looking down"] / total
-            front_ratio = head_pose_counts["looking front"] / total
-            up_ratio = head_pose_counts["looking up"] / total
-            if down_ratio > front_ratio and down_ratio > up_ratio:
-                warning_needed = True
-                warning_msg = "You're looking down too much."
-                print(warning_msg)
-                cv2.putText(frame, warning_msg, (30, 150), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
-                last_frame_with_warning = frame.copy()
-
-        break
-
-cap.release()
-face_mesh.close()
-
-# 경고 문구 출력 시 3초간 영상 재생 화면 대기
-if warning_needed and last_frame_with_warning is not None:
-    cv2.imshow("Head Pose Detection", last_frame_with_warning)
-    cv2.waitKey(3000)
-
-cv2.destroyAllWindows()
-
-df = pd.DataFrame(results_data)
-df.to_csv(CSV_OUTPUT_PATH, index=False)
-print(f"CSV saved to: {CSV_OUTPUT_PATH}")
-
-# 결과 비율 출력
-total = sum(head_pose_counts.values())
-if total > 0:
-    ratio_looking_down = head_pose_counts["looking down"] / total
-    ratio_looking_front = head_pose_counts["looking front"] / total
-    ratio_looking_up = head_pose_counts["looking up"] / total
-
-    print(f"Looking down ratio: {ratio_looking_down:.2%}")
-    print(f"Looking front ratio: {ratio_looking_front:.2%}")
-    print(f"Looking up ratio: {ratio_looking_up:.2%}")
\ No newline at end of file
+# FaceMesh 랜드마크로 solvePnP → pitch(도), 실패하면 None / image_points: 사용한 2D 점
+def estimate_pitch(landmarks, img_w, img_h):
+    image_points = np.array([(landmarks[idx].x, landmarks[idx].y) for idx in LANDMARK_IDS])
+    image_points = np.trunc(image_points * np.array([img_w, img_h], dtype=np.float64))
+
+    rotation_vector = solve_rotation(image_points, img_w, img_h)
+    if rotation_vector is None:
+        return None, image_points
+    return rotation_pitch(rotation_vector)[0], image_points
+
+# 방향별 프레임 수 → (비율, 고개 숙임 경고 여부), 아래를 본 비율이 가장 높으면 경고
+def summarize_head_pose(head_pose_counts):
+    total = sum(head_pose_counts.values())
+    if total == 0:
+        return {}, False
+    ratios = {pose: count / total for pose, count in head_pose_counts.items()}
+    warning_needed = (ratios["looking down"] > ratios["looking front"]
+                      and ratios["looking down"] > ratios["looking up"])
+    return ratios, warning_needed
+
+# 영상 전체의 고개 방향 분석 (display=False이면 화면 출력 없이 분석만 수행)
+# 시각은 영상 시각(프레임 표시 시각) 기준, 재생 속도를 맞추지 않으므로 처리 속도와 관계없이 같은 결과
+# frame_options: FRAME_SOURCE_CONFIGS["head_pose"] 대신 쓸 해상도 / fps 설정
+def analyze_head_pose(video_path, csv_output_path=CSV_OUTPUT_PATH, display=True, face_mesh=None,
+                      frame_options=None):
+    try:
+        source = FrameSource.for_analyzer(video_path, "head_pose", **(frame_options or {}))
+    except (OSError, ValueError) as e:
+        print(f"❌ 영상 파일을 열 수 없습니다. ({e})")
+        return None
+
+    # solvePnP 좌표와 카메라 행렬은 원본 해상도 기준
+    img_w, img_h = source.source_width, source.source_height
+
+    results_data = []
+    frame_count = 0
+    head_pose_counts = {"looking up":0, "looking front":0, "looking down":0}
+    last_frame = None
+
+    own_face_mesh = face_mesh is None
+    # 분석 중 예외가 나도 디코더 / FaceMesh를 닫음
+    try:
+        if own_face_mesh:
+            face_mesh = create_face_mesh()
+
+        for timestamp, rgb_frame in source:
+            results = face_mesh.process(rgb_frame)
+            if display:
+                frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+
+            head_pose_text = "No face detected"
+            pitch_deg = None
+
+            if results.multi_face_landmarks:
+                landmarks = results.multi_face_landmarks[0].landmark
+                pitch_deg, image_points = estimate_pitch(landmarks, img_w, img_h)
+
+                if pitch_deg is not None:
+                    head_pose_text = classify_pitch(pitch_deg)
+
+                    if display:
+                        # 원본 좌표 → 화면(축소된 프레임) 좌표
+                        scale = source.width / img_w
+                        for p in image_points:
+                            cv2.circle(frame, (int(p[0] * scale), int(p[1] * scale)), 3, (0, 255, 0), -1)
+
+            results_data.append({
+                "frame": frame_count,
+                "time_sec": timestamp,
+                "head_pose": head_pose_text,
+                "pitch_deg": pitch_deg if pitch_deg is not None else ""
+            })
+
+            if head_pose_text in head_pose_counts:
+                head_pose_counts[head_pose_text] += 1
+
+            frame_count += 1
+
+            if display:
+                pitch_text = f"Pitch: {pitch_deg:.2f} deg" if pitch_deg is not None else "Pitch: N/A"
+
+                cv2.putText(frame, head_pose_text, (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0,255,0), 3)
+                cv2.putText(frame, pitch_text, (30, 100), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0,255,255), 2)
+                cv2.imshow("Head Pose Detection", frame)
+                last_frame = frame
+
+                # 화면 갱신만 하고 재생 속도에 맞춰 기다리지 않음
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+    finally:
+        source.close()
+        if own_face_mesh and face_mesh is not None:
+            face_mesh.close()
+
+    # 영상 끝까지 읽은 뒤 판단 (CAP_PROP_FRAME_COUNT는 추정값이라 실제 프레임 수와 다를 수 있음)
+    ratios, warning_needed = summarize_head_pose(head_pose_counts)
+    if warning_needed:
+        warning_msg = "You're looking down too much."
+        print(warning_msg)
+
+    if display:
+        # 경고 문구 출력 시 3초간 마지막 화면 대기
+        if warning_needed and last_frame is not None:
+            cv2.putText(last_frame, warning_msg, (30, 150), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
+            cv2.imshow("Head Pose Detection", last_frame)
+            cv2.waitKey(3000)
+
+        cv2.destroyAllWindows()
+
+    df = pd.DataFrame(results_data)
+    df.to_csv(csv_output_path, index=False)
+    print(f"CSV saved to: {csv_output_path}")
+
+    # 결과 비율 출력
+    if ratios:
+        print(f"Looking down ratio: {ratios['looking down']:.2%}")
+        print(f"Looking front ratio: {ratios['looking front']:.2%}")
+        print(f"Looking up ratio: {ratios['looking up']:.2%}")
+
+    return {
+        "head_pose_counts": head_pose_counts,
+        "head_pose_ratios": ratios,
+        "looking_down_warning": warning_needed,
+        "frames": results_data,
+    }
+
+if __name__ == "__main__":
+    # --headless: 화면 출력 없이 분석만 수행
+    analyze_head_pose(VIDEO_PATH, display="--headless" not in sys.argv)
@@ -0,0 +1,37 @@
+import numpy as np
+
+# refine_landmarks=True인 FaceMesh의 랜드마크 수 (468 + 홍채 10)
+NUM_LANDMARKS = 478
+
+class LandmarkTensor:
+    """프레임별 FaceMesh 랜드마크 중 분석에 쓰는 점들만 (프레임 수, 점 수, 2) float64 배열 하나에 모아 두는 버퍼
+
+    - ids: 저장할 랜드마크 번호 (None이면 478점 전체), 열 순서는 ids 순서
+    - add(landmarks): ids 점들의 정규화 좌표 (x, y)를 다음 행에 기록하고 행 번호 반환 (용량이 차면 두 배로 늘림)
+    - columns(ids): 랜드마크 번호 → 저장 열 번호 (모양 유지), data[:len(tensor)][:, columns]로 batch_ear 등에 넘김
+    - pixels(row, width, height): 한 프레임의 픽셀 좌표 (점 수, 2)
+    - FaceMesh 좌표(float32 값)를 float64로 그대로 보관하므로 소수점 아래 버림 결과가 int(lm.x * w)와 같음
+    """
+
+    def __init__(self, capacity=1024, ids=None):
+        self.ids = np.arange(NUM_LANDMARKS) if ids is None else np.asarray(ids).ravel()
+        self._column = {int(landmark_id): column for column, landmark_id in enumerate(self.ids)}
+        self.data = np.zeros((max(capacity, 1), len(self.ids), 2), dtype=np.float64)
+        self.count = 0
+
+    def columns(self, ids):
+        ids = np.asarray(ids)
+        return np.array([self._column[int(i)] for i in ids.ravel()]).reshape(ids.shape)
+
+    def add(self, landmarks):
+        if self.count == len(self.data):
+            self.data = np.concatenate([self.data, np.zeros_like(self.data)])
+        self.data[self.count] = [(landmarks[i].x, landmarks[i].y) for i in self.ids]
+        self.count += 1
+        return self.count - 1
+
+    def pixels(self, row, width, height):
+        return np.trunc(self.data[row] * np.array([width, height], dtype=np.float64))
+
+    def __len__(self):
+        return self.count
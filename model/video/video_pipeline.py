@@ -0,0 +1,275 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from adaptive_sampler import BASE_FPS, AdaptiveSampler, Sample
+from eye_blink_counter import EYE_IDX, BlinkDetector, batch_ear, summarize_blinks
+from frame_source import FRAME_SOURCE_CONFIGS, FrameSource
+from head_direction_detector import (LANDMARK_IDS, create_face_mesh, classify_pitch, rotation_pitch,
+                                     solve_rotation, summarize_head_pose)
+from landmark_tensor import LandmarkTensor
+
+# 감정 분석 모듈 (model/emotion) 경로 추가
+EMOTION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "emotion")
+if EMOTION_DIR not in sys.path:
+    sys.path.insert(0, EMOTION_DIR)
+
+from real_time_video import classify_rois, face_roi, load_emotion_models, summarize_emotions
+
+VIDEO_PATH = "data/test.mp4"
+
+# 감정 분류기에 한 번에 넘길 얼굴 영역 수
+EMOTION_BATCH = 32
+
+# 랜드마크 텐서에 보관하는 점: EAR용 눈 12개 + solvePnP용 6개 (나머지 점은 얼굴 영역을 자를 때만 바로 사용)
+TRACKED_LANDMARKS = np.concatenate([EYE_IDX.ravel(), LANDMARK_IDS])
+
+# NaN(계산 실패)은 None으로
+def _optional(value):
+    return None if np.isnan(value) else float(value)
+
+# 랜드마크 외곽 사각형을 정사각형으로 넓힌 얼굴 영역 (x, y, w, h), 프레임 밖은 잘라냄
+# points: 원본 해상도 픽셀 좌표 (랜드마크 수, 2), scale: 원본 → 프레임 배율
+def landmark_face_box(points, img_w, img_h, scale=1.0):
+    scaled = (points[:, :2] * scale).astype(int)
+    (min_x, min_y), (max_x, max_y) = scaled.min(axis=0).tolist(), scaled.max(axis=0).tolist()
+    size = max(max_x - min_x, max_y - min_y)
+    cx, cy = (max_x + min_x) // 2, (max_y + min_y) // 2
+    x0, y0 = max(cx - size // 2, 0), max(cy - size // 2, 0)
+    x1, y1 = min(cx + size // 2, img_w), min(cy + size // 2, img_h)
+    return x0, y0, x1 - x0, y1 - y0
+
+class VideoPipeline:
+    """영상을 한 번만 디코딩하고 프레임마다 FaceMesh를 한 번만 실행해
+    눈 깜빡임(EAR) / 고개 방향(solvePnP) / 표정(감정 분류)을 함께 분석
+
+    - 세 분석이 하나의 랜드마크 결과를 공유하므로 디코딩, 색 변환, FaceMesh 추론이 각각 프레임당 1회
+    - 프레임은 FrameSource(FRAME_SOURCE_CONFIGS["pipeline"])로 축소 / fps 조절된 RGB를 바로 받음
+    - 표정은 Haar 얼굴 검출 대신 랜드마크 외곽 사각형을 잘라 분류하고, EMOTION_BATCH개씩 모아 한 번에 predict
+      (emotion_fps: 표정 분류 빈도, 기본은 감정 분석기 설정과 같은 FRAME_SOURCE_CONFIGS["emotion"]["fps"])
+    - adaptive=True면 AdaptiveSampler로 FaceMesh를 base_fps로만 실행하고 깜빡임 / 고개 방향 경계 근처만 촘촘히 측정
+      (나머지 프레임의 EAR / pitch는 보간)
+    - 랜드마크는 TRACKED_LANDMARKS 18점만 LandmarkTensor (프레임 수, 18, 2)에 모아 두고, 모든 프레임을 측정하면
+      EAR / pitch를 영상 끝에서 배열 전체에 대해 한 번에 계산 (적응형 샘플링은 이벤트 판단에 필요하므로 측정할 때마다 계산)
+    - face_mesh는 refine_landmarks=True(478점)여야 함 (head_direction_detector.create_face_mesh)
+    - timings: 단계별 누적 시간 (초)
+    """
+
+    def __init__(self, face_mesh, emotion_classifier, frame_options=None, emotion_fps=None,
+                 adaptive=False, base_fps=None):
+        self.face_mesh = face_mesh
+        self.emotion_classifier = emotion_classifier
+        self.frame_options = frame_options or {}
+        self.emotion_fps = emotion_fps or FRAME_SOURCE_CONFIGS["emotion"]["fps"]
+        self.adaptive = adaptive
+        self.base_fps = base_fps or BASE_FPS
+        self.timings = {"decode": 0.0, "face_mesh": 0.0, "landmarks": 0.0, "blink": 0.0, "head_pose": 0.0,
+                        "emotion": 0.0}
+
+    def _timed(self, stage, start):
+        now = time.perf_counter()
+        self.timings[stage] += now - start
+        return now
+
+    # FaceMesh 한 번 → 랜드마크 텐서에 기록, solvePnP 회전 벡터, 표정 분류할 얼굴 영역 수집
+    # 랜드마크 행 번호 반환 (얼굴이 없으면 None)
+    def _observe(self, video_time, rgb_frame):
+        start = time.perf_counter()
+        results = self.face_mesh.process(rgb_frame)
+        start = self._timed("face_mesh", start)
+        if not results.multi_face_landmarks:
+            return None
+
+        landmarks = results.multi_face_landmarks[0].landmark
+        row = self.landmarks.add(landmarks)
+        start = self._timed("landmarks", start)
+
+        points = self.landmarks.pixels(row, self.img_w, self.img_h)
+        rotation = solve_rotation(points[self.pnp_columns], self.img_w, self.img_h)
+        self.rotations.append(rotation if rotation is not None else np.full(3, np.nan))
+        start = self._timed("head_pose", start)
+
+        # 얼굴 영역만 흑백으로 변환 (emotion_fps 간격)
+        if video_time >= self.next_emotion_time:
+            self.next_emotion_time = video_time + 1 / self.emotion_fps
+            frame_h, frame_w = rgb_frame.shape[:2]
+            face_points = np.trunc(np.array([(lm.x, lm.y) for lm in landmarks])
+                                   * np.array([self.img_w, self.img_h], dtype=np.float64))
+            x, y, w, h = landmark_face_box(face_points, frame_w, frame_h, self.scale)
+            if w > 0 and h > 0:
+                roi = face_roi(cv2.cvtColor(rgb_frame[y:y + h, x:x + w], cv2.COLOR_RGB2GRAY), (0, 0, w, h))
+                if roi is not None:
+                    self.pending_rois.append(roi)
+        if len(self.pending_rois) >= EMOTION_BATCH:
+            self.emotion_list.extend(classify_rois(self.emotion_classifier, self.pending_rois))
+            self.pending_rois = []
+        self._timed("emotion", start)
+        return row
+
+    # 프레임 하나를 측정해 EAR / pitch까지 바로 계산한 Sample 반환 (적응형 샘플링용)
+    def _measure(self, video_time, rgb_frame):
+        row = self._observe(video_time, rgb_frame)
+        if row is None:
+            return Sample(video_time, False, None, None, True)
+        return self._samples([(video_time, row)], row, row + 1)[0]
+
+    # (영상 시각, 랜드마크 행) 목록 → Sample 목록, 행 start~stop의 EAR / pitch를 한 번에 계산
+    def _samples(self, observed, start_row, stop_row):
+        start = time.perf_counter()
+        ears = batch_ear(self.landmarks.data[start_row:stop_row], self.img_w, self.img_h, self.eye_columns)
+        start = self._timed("blink", start)
+        pitches = rotation_pitch(np.array(self.rotations[start_row:stop_row]).reshape(-1, 3))
+        self._timed("head_pose", start)
+
+        return [
+            Sample(video_time, False, None, None, True) if row is None else
+            Sample(video_time, True, _optional(ears[row - start_row]), _optional(pitches[row - start_row]), True)
+            for video_time, row in observed
+        ]
+
+    # 측정 또는 보간한 Sample을 깜빡임 / 고개 방향 집계에 반영
+    def _consume(self, sample):
+        if sample.face:
+            self.blink_detector.update_ear(sample.ear, sample.video_time)
+
+        head_pose_text = "No face detected"
+        if sample.face and sample.pitch is not None:
+            head_pose_text = classify_pitch(sample.pitch)
+        self.head_pose_frames.append({
+            "frame": len(self.head_pose_frames),
+            "time_sec": sample.video_time,
+            "head_pose": head_pose_text,
+            "pitch_deg": sample.pitch if sample.face and sample.pitch is not None else ""
+        })
+        if head_pose_text in self.head_pose_counts:
+            self.head_pose_counts[head_pose_text] += 1
+
+    # 영상 전체 분석, 열 수 없으면 None
+    def run(self, video_path):
+        try:
+            source = FrameSource.for_analyzer(video_path, "pipeline", **self.frame_options)
+        except (OSError, ValueError) as e:
+            print(f"❌ 영상 파일을 열 수 없습니다. ({e})")
+            return None
+
+        # 랜드마크 기하 계산은 원본 해상도 기준, 얼굴 자르기는 프레임 기준
+        self.img_w, self.img_h = source.source_width, source.source_height
+        self.scale = source.width / self.img_w
+        self.landmarks = LandmarkTensor(source.estimated_frame_count() or 1024, TRACKED_LANDMARKS)
+        self.eye_columns = self.landmarks.columns(EYE_IDX)
+        self.pnp_columns = self.landmarks.columns(LANDMARK_IDS)
+        self.rotations = []
+
+        self.blink_detector = BlinkDetector()
+        self.head_pose_counts = {"looking up": 0, "looking front": 0, "looking down": 0}
+        self.head_pose_frames = []
+        self.emotion_list = []
+        self.pending_rois = []
+        self.next_emotion_time = 0.0
+        sampler = AdaptiveSampler(self._measure, self.base_fps) if self.adaptive else None
+        observed = []
+
+        # 분석 중 예외가 나도 디코더를 닫음 (FaceMesh는 만든 쪽에서 닫음)
+        try:
+            frames = iter(source)
+            while True:
+                start = time.perf_counter()
+                video_time, rgb_frame = next(frames, (None, None))
+                if rgb_frame is None:
+                    break
+                self._timed("decode", start)
+
+                if sampler is None:
+                    observed.append((video_time, self._observe(video_time, rgb_frame)))
+                else:
+                    for sample in sampler.feed(video_time, rgb_frame):
+                        self._consume(sample)
+
+            if sampler is None:
+                # 모든 프레임의 EAR / pitch를 랜드마크 텐서 전체에 대해 한 번에 계산
+                for sample in self._samples(observed, 0, len(self.landmarks)):
+                    self._consume(sample)
+                inference_count = len(observed)
+            else:
+                for sample in sampler.flush():
+                    self._consume(sample)
+                inference_count = sampler.measured
+        finally:
+            source.close()
+
+        start = time.perf_counter()
+        self.emotion_list.extend(classify_rois(self.emotion_classifier, self.pending_rois))
+        self._timed("emotion", start)
+
+        duration_sec = source.duration
+        ratios, warning_needed = summarize_head_pose(self.head_pose_counts)
+        return {
+            "frame_count": len(self.head_pose_frames),
+            "inference_count": inference_count,
+            "blinks": {
+                "summary": summarize_blinks(self.blink_detector.blink_count, duration_sec),
+                "blink_timestamps": self.blink_detector.blink_timestamps,
+                "duration_sec": duration_sec,
+            },
+            "head_pose": {
+                "head_pose_counts": self.head_pose_counts,
+                "head_pose_ratios": ratios,
+                "looking_down_warning": warning_needed,
+                "frames": self.head_pose_frames,
+            },
+            "emotion": summarize_emotions(self.emotion_list),
+            "timings": dict(self.timings),
+        }
+
+# 모델을 넘기지 않으면 직접 생성 (생성한 FaceMesh는 분석 후 닫음)
+# frame_options: FRAME_SOURCE_CONFIGS["pipeline"] 대신 쓸 해상도 / fps 설정
+# adaptive: 적응형 샘플링 사용 여부 (adaptive_sampler.AdaptiveSampler)
+def analyze_video(video_path, face_mesh=None, emotion_classifier=None, frame_options=None, adaptive=False):
+    own_face_mesh = face_mesh is None
+    if own_face_mesh:
+        face_mesh = create_face_mesh()
+    if emotion_classifier is None:
+        _, emotion_classifier = load_emotion_models()
+    try:
+        return VideoPipeline(face_mesh, emotion_classifier, frame_options, adaptive=adaptive).run(video_path)
+    finally:
+        if own_face_mesh:
+            face_mesh.close()
+
+# 기존 세 스크립트를 차례로 실행했을 때와 처리 시간 비교
+def compare_with_scripts(video_path):
+    from eye_blink_counter import analyze_blinks
+    from head_direction_detector import analyze_head_pose
+    from real_time_video import analyze_emotion
+
+    face_detection, emotion_classifier = load_emotion_models()
+
+    start = time.perf_counter()
+    analyze_blinks(video_path, os.devnull, os.devnull, display=False)
+    analyze_head_pose(video_path, os.devnull, display=False)
+    analyze_emotion(video_path, face_detection, emotion_classifier)
+    scripts_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = analyze_video(video_path, emotion_classifier=emotion_classifier)
+    pipeline_sec = time.perf_counter() - start
+
+    frames = max(result["frame_count"], 1)
+    print(f"스크립트 3개: {scripts_sec:.1f}초 ({scripts_sec / frames * 1000:.1f}ms/프레임)")
+    print(f"단일 파이프라인: {pipeline_sec:.1f}초 ({pipeline_sec / frames * 1000:.1f}ms/프레임)")
+    for stage, sec in result["timings"].items():
+        print(f"  {stage}: {sec / frames * 1000:.2f}ms/프레임")
+
+if __name__ == "__main__":
+    # 실행: python model/video/video_pipeline.py [영상 경로] [--compare]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    path = args[0] if args else VIDEO_PATH
+    if "--compare" in sys.argv:
+        compare_with_scripts(path)
+    else:
+        result = analyze_video(path)
+        if result is not None:
+            print(result["blinks"]["summary"])
+            print(result["head_pose"]["head_pose_ratios"])
+            print(result["timings"])